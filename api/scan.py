@@ -5,6 +5,9 @@ import os
 # Add the project root to Python path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
+# Vercel only allows writes under /tmp, which survives between warm invocations
+os.environ.setdefault("MARKET_DATA_CACHE_DIR", "/tmp/market_data")
+
 from main import TradingSignalSystem
 from datetime import datetime
 import json
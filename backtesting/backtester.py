@@ -1,43 +1,225 @@
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import List, Dict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from backtesting.metrics import summary
+from backtesting.monte_carlo import bootstrap, percentiles
+from config.settings import BacktestConfig
+from data.market_data import MarketDataFetcher
+
+# exit_reason codes in simulated trades
+EXIT_SIGNAL, EXIT_STOP_LOSS, EXIT_TAKE_PROFIT, EXIT_END = 0, 1, 2, 3
+EXIT_REASONS = np.array(['signal', 'stop_loss', 'take_profit', 'end'], dtype=object)
+
+def _next_true(mask: np.ndarray) -> np.ndarray:
+    """For every bar, the first bar at or after it where ``mask`` is set (len(mask) if none)"""
+    n = len(mask)
+    positions = np.where(mask, np.arange(n), n)
+    return np.minimum.accumulate(positions[::-1])[::-1]
+
+def _first(hits: np.ndarray) -> int:
+    return int(np.argmax(hits)) if hits.any() else len(hits)
+
+def fired(history, condition: str, min_confidence: float = 0) -> np.ndarray:
+    """Bars where ``condition`` (e.g. 'buy_cross') fired with at least
+    ``min_confidence``, as the live scan would send it. ``history`` is an
+    ``evaluate_history`` frame or the single-column panel dict behind it.
+    """
+    return np.ravel(history[condition]) & (np.ravel(history[f'{condition}_confidence']) >= min_confidence)
+
+def entry_exit_signals(history, min_confidence: float = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """Long entries (buy crosses, oversold bounces) and exits (sell crosses,
+    overbought profit taking) from an ``evaluate_history`` frame (or the
+    single-column panel dict behind it) - see ``fired``.
+    """
+    return (fired(history, 'buy_cross', min_confidence) | fired(history, 'bounce', min_confidence),
+            fired(history, 'sell_cross', min_confidence) | fired(history, 'overbought', min_confidence))
+
+def simulate_trades(open_: np.ndarray, high: np.ndarray, low: np.ndarray, close: np.ndarray,
+                    entries: np.ndarray, exits: np.ndarray, config: BacktestConfig) -> Dict[str, np.ndarray]:
+    """Long-only trades from per-bar entry/exit signals.
+    
+    A signal on bar i's close is filled at bar i+1's open. While a position
+    is open, the stop-loss and take-profit levels are checked against each
+    bar's low/high from the entry bar on (stop first if both are hit in one
+    bar, filled at the level or at a worse gap open). Whatever is still open
+    at the last bar is closed at its close. Slippage worsens every fill and
+    commission is charged on both sides.
+    
+    The loop runs once per trade, not per bar: the next entry and exit
+    signals are precomputed lookups, and stops are found with one array
+    comparison over the bars the trade is held.
+    """
+    n = len(close)
+    next_entry = _next_true(entries)
+    next_exit = _next_true(exits)
+    slippage = config.slippage_pct
+    
+    trades = []
+    bar = 0
+    while bar < n:
+        signal = next_entry[bar]
+        if signal >= n - 1:
+            break  # No bar left to fill the entry on
+        
+        entry = signal + 1
+        entry_price = open_[entry] * (1 + slippage)
+        exit_signal = next_exit[entry]
+        last = min(exit_signal, n - 1)  # Bars the position is exposed through
+        
+        stop_at = take_at = last - entry + 1
+        if config.stop_loss_pct > 0:
+            stop_level = entry_price * (1 - config.stop_loss_pct)
+            stop_at = _first(low[entry:last + 1] <= stop_level)
+        if config.take_profit_pct > 0:
+            take_level = entry_price * (1 + config.take_profit_pct)
+            take_at = _first(high[entry:last + 1] >= take_level)
+        
+        if min(stop_at, take_at) <= last - entry:
+            exit_bar = entry + min(stop_at, take_at)
+            if stop_at <= take_at:
+                reason, exit_price = EXIT_STOP_LOSS, min(open_[exit_bar], stop_level) if exit_bar > entry else stop_level
+            else:
+                reason, exit_price = EXIT_TAKE_PROFIT, max(open_[exit_bar], take_level) if exit_bar > entry else take_level
+        elif exit_signal < n - 1:
+            exit_bar, reason, exit_price = exit_signal + 1, EXIT_SIGNAL, open_[exit_signal + 1]
+        else:
+            exit_bar, reason, exit_price = n - 1, EXIT_END, close[n - 1]
+        
+        trades.append((entry, exit_bar, entry_price, exit_price * (1 - slippage), reason))
+        bar = exit_bar
+    
+    entry_bar, exit_bar, entry_price, exit_price, reason = (np.array(column) for column in zip(*trades)) if trades else (
+        np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0), np.zeros(0, dtype=np.int64)
+    )
+    commission = config.commission_pct
+    return {
+        'entry_bar': entry_bar,
+        'exit_bar': exit_bar,
+        'entry_price': entry_price,
+        'exit_price': exit_price,
+        'return': exit_price * (1 - commission) / (entry_price * (1 + commission)) - 1,
+        'exit_reason': reason
+    }
+
+def equity_curve(close: np.ndarray, trades: Dict[str, np.ndarray], initial_capital: float, commission_pct: float) -> np.ndarray:
+    """Account value at every bar's close, fully invested during each trade.
+    
+    Each bar is matched to the last trade entered at or before it with a
+    binary search: inside the trade it is marked to that bar's close,
+    otherwise it holds the cash left after the last exit.
+    """
+    if not len(trades['return']):
+        return np.full(len(close), float(initial_capital))
+    
+    cash_after = initial_capital * np.cumprod(1 + trades['return'])
+    cash_before = np.concatenate(([initial_capital], cash_after[:-1]))
+    shares = cash_before / (trades['entry_price'] * (1 + commission_pct))
+    
+    bars = np.arange(len(close))
+    trade = np.searchsorted(trades['entry_bar'], bars, side='right') - 1
+    entered = trade >= 0
+    trade = np.maximum(trade, 0)
+    holding = entered & (bars < trades['exit_bar'][trade])
+    return np.where(holding, shares[trade] * close, np.where(entered, cash_after[trade], initial_capital))
+
+def in_market(bars: int, trades: Dict[str, np.ndarray]) -> np.ndarray:
+    """Bars whose close is marked with a position open (entry bar up to the exit bar)"""
+    changes = np.zeros(bars + 1, dtype=np.int64)
+    np.add.at(changes, trades['entry_bar'], 1)
+    np.add.at(changes, trades['exit_bar'], -1)
+    return np.cumsum(changes[:bars]) > 0
 
 class StrategyBacktester:
-    def __init__(self, strategy, initial_capital: float = 10000):
+    """Backtests a strategy's per-bar signals over a date range.
+    
+    The strategy evaluates the whole history in one pass
+    (``evaluate_history``, so indicators are warmed up on the bars before
+    the range), then trades and the equity curve are simulated on arrays.
+    The trades are then bootstrapped (``monte_carlo``): percentiles of the
+    total return and max drawdown over ``monte_carlo_paths`` resampled
+    trade sequences, skipped when that is 0.
+    """
+    
+    def __init__(self, strategy, initial_capital: float = 10000, config: Optional[BacktestConfig] = None,
+                 data_fetcher=None):
         self.strategy = strategy
-        self.initial_capital = initial_capital
+        self.config = config or BacktestConfig(initial_capital=initial_capital)
+        self.initial_capital = self.config.initial_capital
+        self.data_fetcher = data_fetcher
+    
+    def backtest(self, start_date: str, end_date: str, data: Optional[Dict[str, pd.DataFrame]] = None) -> Dict:
+        """Run backtest for the given date range.
         
-    def backtest(self, start_date: str, end_date: str) -> Dict:
-        """Run backtest for the given date range"""
+        ``data`` maps symbols to daily bars (SPY, plus QQQ for the NASDAQ
+        checks); if omitted it is fetched, with enough history before
+        ``start_date`` to warm up the indicators.
+        """
         results = {
-            'trades': [],
-            'equity_curve': [],
-            'metrics': {}
+            'trades': pd.DataFrame(columns=['entry_time', 'exit_time', 'entry_price', 'exit_price', 'return', 'bars_held', 'exit_reason']),
+            'equity_curve': pd.Series(dtype=float),
+            'metrics': {},
+            'monte_carlo': pd.DataFrame()
         }
         
-        # This is a simplified backtesting framework
-        # In practice, you'd want more sophisticated position management
+        if not hasattr(self.strategy, 'evaluate_history'):
+            print(f"{self.strategy.name} can't be backtested: it has no evaluate_history")
+            return results
         
-        data_fetcher = MarketDataFetcher()
+        if data is None:
+            data = self._fetch_data(start_date)
         
-        # Get historical data (simplified - would need proper date range handling)
-        data = data_fetcher.get_data('SPY', '30m', 500)
+        spy_data = data.get('SPY')
+        if spy_data is None or spy_data.empty:
+            return results
         
-        if data.empty:
+        history = self.strategy.evaluate_history(spy_data, data.get('QQQ'))
+        entries, exits = entry_exit_signals(history, self.strategy.config.get('min_confidence', 0))
+        
+        window = slice(*spy_data.index.slice_locs(pd.Timestamp(start_date), pd.Timestamp(end_date)))
+        bars = spy_data.iloc[window]
+        if bars.empty:
+            print(f"No bars between {start_date} and {end_date}")
             return results
         
-        # Run strategy on historical data
-        signals = self.strategy.analyze(data)
+        close = bars['Close'].to_numpy(dtype=np.float64)
+        trades = simulate_trades(
+            bars['Open'].to_numpy(dtype=np.float64), bars['High'].to_numpy(dtype=np.float64),
+            bars['Low'].to_numpy(dtype=np.float64), close, entries[window], exits[window], self.config
+        )
+        equity = equity_curve(close, trades, self.initial_capital, self.config.commission_pct)
+        
+        results['trades'] = pd.DataFrame({
+            'entry_time': bars.index[trades['entry_bar']],
+            'exit_time': bars.index[trades['exit_bar']],
+            'entry_price': trades['entry_price'],
+            'exit_price': trades['exit_price'],
+            'return': trades['return'],
+            'bars_held': trades['exit_bar'] - trades['entry_bar'],
+            'exit_reason': EXIT_REASONS[trades['exit_reason']]
+        })
+        if 'fed_days' in history:
+            # Days from each entry to the nearest FOMC decision, to split results by Fed risk
+            results['trades']['fed_days'] = history['fed_days'].to_numpy()[window][trades['entry_bar']]
+        results['equity_curve'] = pd.Series(equity, index=bars.index, name='equity')
+        
+        metrics = summary(equity, trades['return'], in_market(len(close), trades))
+        results['metrics'] = {
+            'total_signals': int(entries[window].sum() + exits[window].sum()),
+            'total_trades': len(trades['return']),
+            **{name: value.item() for name, value in metrics.items()}
+        }
         
-        # Simple performance calculation (placeholder)
-        if signals:
-            results['trades'] = signals
-            results['metrics'] = {
-                'total_signals': len(signals),
-                'win_rate': 0.0,  # Would calculate from actual trades
-                'total_return': 0.0,  # Would calculate from positions
-                'max_drawdown': 0.0
-            }
+        if self.config.monte_carlo_paths > 0:
+            results['monte_carlo'] = percentiles(bootstrap(
+                trades['return'], self.config.monte_carlo_paths, self.config.monte_carlo_block_size, self.config.monte_carlo_seed
+            ))
+        return results
+    
+    def _fetch_data(self, start_date: str) -> Dict[str, pd.DataFrame]:
+        if self.data_fetcher is None:
+            self.data_fetcher = MarketDataFetcher()
         
-        return results
\ No newline at end of file
+        required = self.strategy.get_required_data()
+        periods = len(pd.bdate_range(start_date, datetime.now())) + required['periods']
+        return self.data_fetcher.get_data(['SPY', 'QQQ'], required['timeframe'], periods)
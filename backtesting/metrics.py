@@ -0,0 +1,205 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Dict, Optional
+
+# Daily bars
+PERIODS_PER_YEAR = 252
+
+# Rolling drawdowns materialize (rows x variants x window) blocks; rows are
+# processed in chunks so a block stays under this many elements
+MAX_WINDOW_ELEMENTS = 2 ** 24
+
+# Every function takes time along ``axis`` (0 by default), so a 1D equity
+# curve and a (time x variant) matrix of curves go through the same call and
+# a matrix gives one value per variant. Trade-level inputs (win rate, profit
+# factor) are NaN-padded: NaN means "no trade" and is ignored.
+
+def _divide(numerator, denominator):
+    """numerator / denominator, NaN where the denominator is 0 (scalars stay scalars)"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(denominator != 0, numerator / np.where(denominator != 0, denominator, 1), np.nan)[()]
+
+def period_returns(equity: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Simple return of every period (one shorter than ``equity``)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    return np.diff(equity, axis=axis) / np.delete(equity, -1, axis=axis)
+
+def total_return(equity: np.ndarray, axis: int = 0) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    return np.take(equity, -1, axis=axis) / np.take(equity, 0, axis=axis) - 1
+
+def annualized_return(equity: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR, axis: int = 0) -> np.ndarray:
+    """Compound annual growth rate"""
+    periods = np.shape(equity)[axis] - 1
+    if periods < 1:
+        return np.full(np.shape(total_return(equity, axis)), np.nan)
+    with np.errstate(invalid='ignore'):
+        return (1 + total_return(equity, axis)) ** (periods_per_year / periods) - 1
+
+def volatility(equity: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR, axis: int = 0) -> np.ndarray:
+    """Annualized standard deviation of period returns"""
+    returns = period_returns(equity, axis)
+    if returns.shape[axis] < 2:
+        return np.full(np.shape(total_return(equity, axis)), np.nan)
+    return returns.std(axis=axis, ddof=1) * np.sqrt(periods_per_year)
+
+def sharpe_ratio(equity: np.ndarray, risk_free_rate: float = 0.0, periods_per_year: int = PERIODS_PER_YEAR,
+                 axis: int = 0) -> np.ndarray:
+    excess = period_returns(equity, axis) - risk_free_rate / periods_per_year
+    if excess.shape[axis] < 2:
+        return np.full(np.shape(total_return(equity, axis)), np.nan)
+    return _divide(excess.mean(axis=axis), excess.std(axis=axis, ddof=1)) * np.sqrt(periods_per_year)
+
+def sortino_ratio(equity: np.ndarray, risk_free_rate: float = 0.0, periods_per_year: int = PERIODS_PER_YEAR,
+                  axis: int = 0) -> np.ndarray:
+    """Like Sharpe, but only returns below the risk-free rate count as risk"""
+    excess = period_returns(equity, axis) - risk_free_rate / periods_per_year
+    downside = np.sqrt((np.minimum(excess, 0) ** 2).mean(axis=axis))
+    return _divide(excess.mean(axis=axis), downside) * np.sqrt(periods_per_year)
+
+def drawdowns(equity: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Fall from the running peak at every point (0 at a new high, negative below it)"""
+    equity = np.asarray(equity, dtype=np.float64)
+    return equity / np.maximum.accumulate(equity, axis=axis) - 1
+
+def max_drawdown(equity: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Deepest drawdown as a negative fraction (-0.25 is 25% below the peak)"""
+    return drawdowns(equity, axis).min(axis=axis)
+
+def max_drawdown_duration(equity: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Longest stretch, in periods, spent below a previous peak"""
+    equity = np.moveaxis(np.asarray(equity, dtype=np.float64), axis, 0)
+    at_peak = equity >= np.maximum.accumulate(equity, axis=0)
+    steps = np.arange(len(equity)).reshape((-1,) + (1,) * (equity.ndim - 1))
+    last_peak = np.maximum.accumulate(np.where(at_peak, steps, 0), axis=0)
+    return (steps - last_peak).max(axis=0)
+
+def calmar_ratio(equity: np.ndarray, periods_per_year: int = PERIODS_PER_YEAR, axis: int = 0) -> np.ndarray:
+    """Annualized return over the depth of the worst drawdown"""
+    return _divide(annualized_return(equity, periods_per_year, axis), -max_drawdown(equity, axis))
+
+def win_rate(trade_returns: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Share of trades with a positive return"""
+    trade_returns = np.asarray(trade_returns, dtype=np.float64)
+    return _divide((trade_returns > 0).sum(axis=axis), (~np.isnan(trade_returns)).sum(axis=axis))
+
+def profit_factor(trade_returns: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Gross gains over gross losses (inf with no losing trades)"""
+    trade_returns = np.asarray(trade_returns, dtype=np.float64)
+    gains = np.where(trade_returns > 0, trade_returns, 0).sum(axis=axis)
+    losses = -np.where(trade_returns < 0, trade_returns, 0).sum(axis=axis)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(losses > 0, gains / np.where(losses > 0, losses, 1), np.where(gains > 0, np.inf, np.nan))[()]
+
+def exposure(in_market: np.ndarray, axis: int = 0) -> np.ndarray:
+    """Share of periods with a position open"""
+    return np.asarray(in_market, dtype=np.float64).mean(axis=axis)
+
+def summary(equity: np.ndarray, trade_returns: Optional[np.ndarray] = None, in_market: Optional[np.ndarray] = None,
+            risk_free_rate: float = 0.0, periods_per_year: int = PERIODS_PER_YEAR) -> Dict[str, np.ndarray]:
+    """Every metric for equity curves (time along axis 0), plus the trade
+    and exposure metrics when their inputs are given. Values are scalars
+    for a 1D curve and one per column for a matrix.
+    """
+    metrics = {
+        'total_return': total_return(equity),
+        'annualized_return': annualized_return(equity, periods_per_year),
+        'volatility': volatility(equity, periods_per_year),
+        'sharpe_ratio': sharpe_ratio(equity, risk_free_rate, periods_per_year),
+        'sortino_ratio': sortino_ratio(equity, risk_free_rate, periods_per_year),
+        'calmar_ratio': calmar_ratio(equity, periods_per_year),
+        'max_drawdown': max_drawdown(equity),
+        'max_drawdown_duration': max_drawdown_duration(equity)
+    }
+    if trade_returns is not None:
+        metrics['win_rate'] = win_rate(trade_returns)
+        metrics['profit_factor'] = profit_factor(trade_returns)
+    if in_market is not None:
+        metrics['exposure'] = exposure(in_market)
+    return metrics
+
+# Rolling metrics: the value at row t covers the trailing ``window`` periods
+# ending at t - equity rows t - window .. t, or rows t - window + 1 .. t of
+# per-period inputs (trade returns by exit row, in-market flags). Rows
+# without a full window are NaN, so outputs line up with the input rows.
+
+def _pad(values: np.ndarray, rows: int) -> np.ndarray:
+    return np.concatenate((np.full((rows,) + values.shape[1:], np.nan), values))
+
+def _window_sums(values: np.ndarray, window: int):
+    """Trailing-window sums of ``values`` (NaN counted as 0) and of its non-NaN count, via cumulative sums"""
+    valid = ~np.isnan(values)
+    zeros = np.zeros((1,) + values.shape[1:])
+    sums = np.cumsum(np.concatenate((zeros, np.where(valid, values, 0.0))), axis=0)
+    counts = np.cumsum(np.concatenate((zeros, valid)), axis=0)
+    return sums[window:] - sums[:-window], counts[window:] - counts[:-window]
+
+def _rolling_apply(func, equity: np.ndarray, window: int) -> np.ndarray:
+    """``func(windows, axis=-1)`` over every (window + 1)-row equity window, in bounded chunks"""
+    equity = np.asarray(equity, dtype=np.float64)
+    if len(equity) <= window:
+        return np.full(equity.shape, np.nan)
+    
+    windows = sliding_window_view(equity, window + 1, axis=0)
+    chunk = max(1, MAX_WINDOW_ELEMENTS // max(1, windows[0].size))
+    values = np.concatenate([func(windows[start:start + chunk], axis=-1) for start in range(0, len(windows), chunk)])
+    return _pad(values, window)
+
+def rolling_return(equity: np.ndarray, window: int) -> np.ndarray:
+    equity = np.asarray(equity, dtype=np.float64)
+    return _pad(equity[window:] / equity[:-window] - 1, window)
+
+def rolling_annualized_return(equity: np.ndarray, window: int, periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    with np.errstate(invalid='ignore'):
+        return (1 + rolling_return(equity, window)) ** (periods_per_year / window) - 1
+
+def _rolling_moments(equity: np.ndarray, window: int, risk_free_rate: float, periods_per_year: int):
+    excess = period_returns(equity) - risk_free_rate / periods_per_year
+    sums, counts = _window_sums(excess, window)
+    squares, _ = _window_sums(excess ** 2, window)
+    downside, _ = _window_sums(np.minimum(excess, 0) ** 2, window)
+    mean = sums / counts
+    variance = np.maximum(squares - sums * mean, 0) / (counts - 1)
+    return _pad(mean, window), _pad(np.sqrt(variance), window), _pad(np.sqrt(downside / counts), window)
+
+def rolling_volatility(equity: np.ndarray, window: int, periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    _, std, _ = _rolling_moments(equity, window, 0.0, periods_per_year)
+    return std * np.sqrt(periods_per_year)
+
+def rolling_sharpe_ratio(equity: np.ndarray, window: int, risk_free_rate: float = 0.0,
+                         periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    mean, std, _ = _rolling_moments(equity, window, risk_free_rate, periods_per_year)
+    return _divide(mean, std) * np.sqrt(periods_per_year)
+
+def rolling_sortino_ratio(equity: np.ndarray, window: int, risk_free_rate: float = 0.0,
+                          periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    mean, _, downside = _rolling_moments(equity, window, risk_free_rate, periods_per_year)
+    return _divide(mean, downside) * np.sqrt(periods_per_year)
+
+def rolling_max_drawdown(equity: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_apply(max_drawdown, equity, window)
+
+def rolling_max_drawdown_duration(equity: np.ndarray, window: int) -> np.ndarray:
+    return _rolling_apply(max_drawdown_duration, equity, window)
+
+def rolling_calmar_ratio(equity: np.ndarray, window: int, periods_per_year: int = PERIODS_PER_YEAR) -> np.ndarray:
+    return _divide(rolling_annualized_return(equity, window, periods_per_year), -rolling_max_drawdown(equity, window))
+
+def rolling_win_rate(trade_returns: np.ndarray, window: int) -> np.ndarray:
+    """Win rate of the trades closed in each window (``trade_returns`` per row, NaN where none closed)"""
+    trade_returns = np.asarray(trade_returns, dtype=np.float64)
+    wins, _ = _window_sums(np.where(np.isnan(trade_returns), np.nan, trade_returns > 0), window)
+    _, trades = _window_sums(trade_returns, window)
+    return _pad(_divide(wins, trades), window - 1)
+
+def rolling_profit_factor(trade_returns: np.ndarray, window: int) -> np.ndarray:
+    trade_returns = np.asarray(trade_returns, dtype=np.float64)
+    gains, _ = _window_sums(np.where(trade_returns > 0, trade_returns, 0), window)
+    losses, _ = _window_sums(np.where(trade_returns < 0, -trade_returns, 0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(losses > 0, gains / np.where(losses > 0, losses, 1), np.where(gains > 0, np.inf, np.nan))
+    return _pad(factor, window - 1)
+
+def rolling_exposure(in_market: np.ndarray, window: int) -> np.ndarray:
+    held, _ = _window_sums(np.asarray(in_market, dtype=np.float64), window)
+    return _pad(held / window, window - 1)
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+# Resampled trade indices are drawn as (trades x paths) matrices; paths are
+# processed in chunks so one matrix stays under this many elements
+MAX_PATH_ELEMENTS = 2 ** 22
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+
+def resample_indices(rng: np.random.Generator, trades: int, paths: int, block_size: int = 1) -> np.ndarray:
+    """(trades x paths) trade indices for ``paths`` bootstrap resamples.
+    
+    ``block_size`` 1 draws trades independently (IID bootstrap); larger
+    blocks draw runs of consecutive trades (circular block bootstrap), which
+    keeps streaks of wins and losses together.
+    """
+    if block_size <= 1:
+        return rng.integers(0, trades, size=(trades, paths), dtype=np.min_scalar_type(trades - 1))
+    
+    blocks = -(-trades // block_size)
+    starts = rng.integers(0, trades, size=(blocks, 1, paths))
+    indices = (starts + np.arange(block_size)[:, None]) % trades
+    return indices.reshape(blocks * block_size, paths)[:trades]
+
+def bootstrap(trade_returns: np.ndarray, paths: int = 100_000, block_size: int = 1, seed: Optional[int] = None,
+              max_elements: int = MAX_PATH_ELEMENTS) -> Dict[str, np.ndarray]:
+    """Total return and max drawdown of ``paths`` resampled trade sequences.
+    
+    Each path is as many trades as the backtest made, drawn with replacement
+    and compounded in full. The resampled indices are drawn as one (trades x
+    paths) matrix per chunk of paths; equity, peak and drawdown are then
+    carried in log space across all the chunk's paths, one trade at a time,
+    which keeps the working set to a few rows instead of the whole matrix.
+    """
+    log_returns = np.log1p(np.asarray(trade_returns, dtype=np.float64))
+    trades = len(log_returns)
+    results = {'total_return': np.zeros(paths), 'max_drawdown': np.zeros(paths)}
+    if not trades:
+        return results
+    
+    rng = np.random.default_rng(seed)
+    chunk = max(1, max_elements // trades)
+    for start in range(0, paths, chunk):
+        count = min(chunk, paths - start)
+        log_equity, peak, drawdown = np.zeros(count), np.zeros(count), np.zeros(count)  # The starting capital is the first peak
+        for row in resample_indices(rng, trades, count, block_size):
+            log_equity += log_returns[row]
+            np.maximum(peak, log_equity, out=peak)
+            np.minimum(drawdown, log_equity - peak, out=drawdown)
+        
+        results['total_return'][start:start + count] = np.expm1(log_equity)
+        results['max_drawdown'][start:start + count] = np.expm1(drawdown)
+    return results
+
+def percentiles(results: Dict[str, np.ndarray], levels: Sequence[float] = PERCENTILES) -> pd.DataFrame:
+    """Percentiles of every bootstrapped metric, one row per level.
+    
+    Drawdowns are negative, so the low percentiles are the bad outcomes
+    for both columns.
+    """
+    return pd.DataFrame(
+        {name: np.percentile(values, levels) for name, values in results.items()},
+        index=pd.Index(levels, name='percentile')
+    )
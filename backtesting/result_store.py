@@ -0,0 +1,275 @@
+import json
+import os
+import shutil
+import time
+import uuid
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Per-part description (runs, column names, timezone), written with the part
+MANIFEST = 'part.json'
+
+# Per-run frames stored besides the run table, each concatenated across runs
+FRAMES = ('trades', 'monte_carlo')
+
+def _column(values) -> np.ndarray:
+    """A plain (memory-mappable) array: timestamps as UTC datetime64[ns], text as fixed-width unicode"""
+    if isinstance(values, (pd.Series, pd.Index)) and isinstance(values.dtype, pd.DatetimeTZDtype):
+        values = pd.DatetimeIndex(values).tz_convert('UTC').tz_localize(None)
+    array = np.asarray(values)
+    if array.dtype.kind == 'M':
+        return array.astype('datetime64[ns]')
+    if array.dtype == object:
+        return array.astype(str)
+    return array
+
+def _timezone(values) -> Optional[str]:
+    tz = getattr(values.dtype, 'tz', None)
+    return str(tz) if tz is not None else None
+
+def _restore_times(values: np.ndarray, tz: Optional[str]) -> pd.DatetimeIndex:
+    index = pd.DatetimeIndex(values)
+    return index.tz_localize('UTC').tz_convert(tz) if tz else index
+
+def _metric(values) -> np.ndarray:
+    """Integer metrics (trade counts) stay integers, everything else is float64"""
+    array = np.asarray(values)
+    return array if array.dtype.kind in 'biu' else array.astype(np.float64)
+
+def _plain(value):
+    """A parameter value as a scalar a column can hold and be compared with.
+    
+    NumPy scalars become Python ones; None and containers (a config's
+    ``universe`` list) become their JSON text, so they are stored and
+    looked up as one string instead of an extra array dimension.
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (list, tuple, dict, set)):
+        return json.dumps(sorted(value) if isinstance(value, set) else value, sort_keys=True, default=str)
+    return value
+
+def _param_column(values) -> np.ndarray:
+    return _column([_plain(value) for value in values])
+
+def _matches(column: np.ndarray, value) -> np.ndarray:
+    """Rows of a parameter column equal to ``value``; mixed columns were stored as text"""
+    value = _plain(value)
+    if column.dtype.kind == 'U' and not isinstance(value, str):
+        value = str(value)
+    return column == value
+
+class ResultStore:
+    """Backtest and sweep results on disk, one column per ``.npy`` file.
+    
+    Every ``append`` writes a new part directory holding a batch of runs:
+    a run table (one column per parameter and metric, plus each run's
+    offsets into the other columns) and the concatenated trade, Monte
+    Carlo and equity columns of all its runs. Parts are staged under a
+    hidden name and renamed into place with their own ``part.json``, so a
+    batch only becomes visible once it is complete and is never rewritten.
+    Part names are unique (write time plus a random suffix), so several
+    stores - or processes - can append to one directory; the parts are
+    re-listed on every query, so each sees the others' runs.
+    
+    Columns are memory-mapped when read: queries only touch the parameter
+    columns they filter on, and a run's trades or equity curve are slices
+    of the mapped files.
+    """
+    
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._manifests: Dict[str, Dict] = {}
+        self._mapped: Dict[Tuple[str, str], np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return sum(part['runs'] for part in self.parts())
+    
+    def parts(self) -> List[Dict]:
+        """Descriptions of the finished parts, oldest first"""
+        names = sorted(entry.name for entry in os.scandir(self.path) if entry.is_dir() and entry.name.startswith('part-'))
+        for name in names:
+            if name not in self._manifests:
+                self._manifests[name] = json.loads((self.path / name / MANIFEST).read_text())
+        return [self._manifests[name] for name in names]
+    
+    def append(self, runs: Sequence[Tuple[Dict, Dict]]) -> str:
+        """Store a batch of (params, results) pairs as a new part and return its name.
+        
+        ``results`` is a ``StrategyBacktester.backtest`` style dict; its
+        ``trades``, ``monte_carlo`` and ``equity_curve`` are optional
+        (metrics-only runs).
+        """
+        runs = list(runs)
+        if not runs:
+            raise ValueError("No runs to store")
+        param_names = sorted({name for params, _ in runs for name in params})
+        metric_names = sorted({name for _, results in runs for name in results.get('metrics', {})})
+        return self._write_part(
+            {name: _param_column([params.get(name, np.nan) for params, _ in runs]) for name in param_names},
+            {name: _metric([results.get('metrics', {}).get(name, np.nan) for _, results in runs]) for name in metric_names},
+            len(runs),
+            {kind: [results.get(kind) for _, results in runs] for kind in FRAMES},
+            [results.get('equity_curve') for _, results in runs]
+        )
+    
+    def append_sweep(self, results: pd.DataFrame, metric_columns: Sequence[str]) -> str:
+        """Store a ``ParameterSweep`` results frame as a part, one run per row"""
+        if results.empty:
+            raise ValueError("No runs to store")
+        return self._write_part(
+            {str(name): _param_column(results[name]) for name in results.columns if name not in metric_columns},
+            {name: _metric(results[name].to_numpy()) for name in metric_columns},
+            len(results)
+        )
+    
+    def find(self, **params) -> pd.DataFrame:
+        """Parameters and metrics of the runs whose parameters equal ``params``.
+        
+        Only the filtered parameter columns are read to select rows, then
+        the run table of the matching rows; ``part`` and ``row`` locate each
+        run for ``load``.
+        """
+        frames = []
+        for part in self.parts():
+            if any(name not in part['params'] for name in params):
+                continue
+            mask = np.ones(part['runs'], dtype=bool)
+            for name, value in params.items():
+                mask &= _matches(self._read(part['name'], f'table.param.{name}'), value)
+            rows = np.flatnonzero(mask)
+            if not len(rows):
+                continue
+            
+            frame = pd.DataFrame({name: self._read(part['name'], f'table.param.{name}')[rows] for name in part['params']})
+            for name in part['metrics']:
+                frame[name] = self._read(part['name'], f'table.metric.{name}')[rows]
+            frame['part'] = part['name']
+            frame['row'] = rows
+            frames.append(frame)
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['part', 'row'])
+    
+    def load(self, part: str, row: int) -> Dict:
+        """One run's results, its trades, Monte Carlo percentiles and equity curve sliced from the mapped columns"""
+        meta = self._part(part)
+        results = {kind: self._frame(part, row, kind) for kind in FRAMES}
+        
+        equity_start, equity_stop = (int(self._read(part, f'table.equity.{end}')[row]) for end in ('start', 'stop'))
+        equity = pd.Series(dtype=float, name='equity')
+        if equity_stop > equity_start:
+            equity = pd.Series(
+                self._read(part, 'equity.value')[equity_start:equity_stop],
+                index=_restore_times(self._read(part, 'equity.time')[equity_start:equity_stop], meta['tz']),
+                name='equity'
+            )
+        metrics = {name: self._read(part, f'table.metric.{name}')[row].item() for name in meta['metrics']}
+        return {'trades': results['trades'], 'equity_curve': equity, 'metrics': metrics, 'monte_carlo': results['monte_carlo']}
+    
+    def get(self, params: Dict) -> Optional[Dict]:
+        """The most recently stored results for exactly ``params``, if any"""
+        matches = self.find(**params)
+        matches = matches[[len(self._part(name)['params']) == len(params) for name in matches['part']]]
+        if matches.empty:
+            return None
+        latest = matches.iloc[-1]
+        return self.load(latest['part'], int(latest['row']))
+    
+    def cached(self, params: Dict, run: Callable[[], Dict]) -> Dict:
+        """Stored results for ``params``, running and storing them on a miss.
+        
+        ``params`` should cover everything the results depend on (strategy
+        settings and the date range), as it is the only cache key. A miss
+        returns the results as read back from the store, so hits and misses
+        look the same.
+        """
+        results = self.get(params)
+        if results is None:
+            return self.load(self.append([(params, run())]), 0)
+        return results
+    
+    def _write_part(self, params: Dict[str, np.ndarray], metrics: Dict[str, np.ndarray], runs: int,
+                    frames: Optional[Dict[str, List]] = None, curves: Optional[List] = None) -> str:
+        """Write one part under a new unique name, staged and then renamed into place"""
+        def lengths(items):
+            return [len(item) if item is not None else 0 for item in items] if items else [0] * runs
+        
+        frames = frames or {}
+        table = {f'param.{name}': values for name, values in params.items()}
+        table.update({f'metric.{name}': values for name, values in metrics.items()})
+        for kind in FRAMES:
+            table.update(self._offsets(kind, lengths(frames.get(kind))))
+        table.update(self._offsets('equity', lengths(curves)))
+        columns = {f'table.{name}': values for name, values in table.items()}
+        
+        # Index names (the Monte Carlo percentiles) are kept as a column
+        stacked, indexes = {}, {}
+        for kind in FRAMES:
+            items = [frame for frame in frames.get(kind) or [] if frame is not None and len(frame)]
+            indexes[kind] = items[0].index.name if items else None
+            if indexes[kind] is not None:
+                items = [frame.reset_index() for frame in items]
+            stacked[kind] = pd.concat(items, ignore_index=True) if items else pd.DataFrame()
+            columns.update({f'{kind}.{name}': _column(stacked[kind][name]) for name in stacked[kind].columns})
+        curves = [curve for curve in curves or [] if curve is not None and len(curve)]
+        if curves:
+            columns['equity.time'] = np.concatenate([_column(curve.index) for curve in curves])
+            columns['equity.value'] = np.concatenate([curve.to_numpy(dtype=np.float64) for curve in curves])
+        
+        times = [curve.index for curve in curves] + [stacked['trades'][column] for column in stacked['trades'].columns]
+        name = f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        manifest = {
+            'name': name,
+            'runs': runs,
+            'params': list(params),
+            'metrics': list(metrics),
+            **{kind: list(stacked[kind].columns) for kind in FRAMES},
+            'index': indexes,
+            'tz': next((_timezone(values) for values in times if _timezone(values)), None)  # One market, one timezone per part
+        }
+        
+        staging = self.path / f'.{name}.tmp'
+        staging.mkdir()
+        try:
+            for column, values in columns.items():
+                np.save(staging / f'{column}.npy', values, allow_pickle=False)
+            (staging / MANIFEST).write_text(json.dumps(manifest, indent=2))
+            staging.rename(self.path / name)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+        
+        self._manifests[name] = manifest
+        return name
+    
+    def _part(self, name: str) -> Dict:
+        if name not in self._manifests:
+            self._manifests[name] = json.loads((self.path / name / MANIFEST).read_text())
+        return self._manifests[name]
+    
+    def _frame(self, part: str, row: int, kind: str) -> pd.DataFrame:
+        """One run's rows of a stored frame (``trades`` or ``monte_carlo``)"""
+        meta = self._part(part)
+        start, stop = (int(self._read(part, f'table.{kind}.{end}')[row]) for end in ('start', 'stop'))
+        if kind != 'trades' and stop == start:
+            return pd.DataFrame()  # As a backtest without Monte Carlo paths
+        
+        frame = pd.DataFrame({name: self._read(part, f'{kind}.{name}')[start:stop] for name in meta[kind]})
+        for name in frame.columns:
+            if frame[name].dtype.kind == 'M':
+                frame[name] = _restore_times(frame[name].to_numpy(), meta['tz'])
+        index = meta['index'][kind]
+        return frame.set_index(index) if index is not None else frame
+    
+    def _read(self, part: str, column: str) -> np.ndarray:
+        key = (part, column)
+        if key not in self._mapped:
+            self._mapped[key] = np.load(self.path / part / f'{column}.npy', mmap_mode='r', allow_pickle=False)
+        return self._mapped[key]
+    
+    @staticmethod
+    def _offsets(prefix: str, lengths: List[int]) -> Dict[str, np.ndarray]:
+        stops = np.cumsum(np.asarray(lengths, dtype=np.int64))
+        return {f'{prefix}.start': stops - np.asarray(lengths, dtype=np.int64), f'{prefix}.stop': stops}
@@ -0,0 +1,173 @@
+import itertools
+import random
+import time
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from backtesting.backtester import fired
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+from utils.parallel import WORKER_STATE, map_with_state
+
+# Knobs worth sweeping and reasonable ranges for them. A list is a set of
+# choices; a (low, high) tuple is a range to sample from (ints stay ints).
+DEFAULT_SPACE = {
+    'sma_10_period': [5, 8, 10, 13, 15, 20],
+    'sma_50_period': [30, 40, 50, 60, 75, 100],
+    'sma_200_period': [150, 200],
+    'ema_9_period': [5, 9, 12],
+    'ema_21_period': [21, 26, 34],
+    'oversold_threshold': (-6.0, -1.0),
+    'overbought_threshold': (1.0, 6.0),
+    'nasdaq_lookback_days': [3, 5, 10],
+    'min_confidence': [50, 60, 70, 80]
+}
+
+METRIC_COLUMNS = ['long_signals', 'short_signals', 'mean_forward_return', 'hit_rate', 't_stat']
+
+def _is_valid(config: Dict) -> bool:
+    """Fast averages must be shorter than the slow ones they are compared to"""
+    return (config.get('sma_10_period', 10) < config.get('sma_50_period', 50)
+            and config.get('ema_9_period', 9) < config.get('ema_21_period', 21))
+
+def parameter_grid(space: Dict[str, Sequence]) -> List[Dict]:
+    """Every combination of the listed values (skipping invalid ones)"""
+    names = list(space)
+    configs = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    return [config for config in configs if _is_valid(config)]
+
+def random_samples(space: Dict[str, Sequence], count: int, seed: int = 0) -> List[Dict]:
+    """``count`` random valid configurations drawn from ``space``"""
+    rng = random.Random(seed)
+    
+    def draw(values):
+        if isinstance(values, tuple):
+            low, high = values
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.randint(low, high)
+            return rng.uniform(low, high)
+        return rng.choice(list(values))
+    
+    configs = []
+    attempts = 0
+    while len(configs) < count and attempts < count * 100:
+        attempts += 1
+        config = {name: draw(values) for name, values in space.items()}
+        if _is_valid(config):
+            configs.append(config)
+    return configs
+
+def score_history(history, forward_returns: np.ndarray, min_confidence: float) -> Dict:
+    """How the price moved after the signals of one evaluated history.
+    
+    Buy crosses and oversold bounces count as long calls, sell crosses and
+    overbought warnings as short calls; each call's return is the forward
+    return in its direction. Signals below ``min_confidence`` are dropped,
+    as the live scan does. ``history`` is an ``evaluate_history`` frame or
+    the single-column panel dict behind it.
+    """
+    long = fired(history, 'buy_cross', min_confidence) | fired(history, 'bounce', min_confidence)
+    short = fired(history, 'sell_cross', min_confidence) | fired(history, 'overbought', min_confidence)
+    
+    returns = np.concatenate((forward_returns[long], -forward_returns[short]))
+    returns = returns[~np.isnan(returns)]
+    
+    mean = returns.mean() if len(returns) else np.nan
+    std = returns.std(ddof=1) if len(returns) > 1 else np.nan
+    return {
+        'long_signals': int(long.sum()),
+        'short_signals': int(short.sum()),
+        'mean_forward_return': mean,
+        'hit_rate': (returns > 0).mean() if len(returns) else np.nan,
+        't_stat': mean / std * np.sqrt(len(returns)) if std > 0 else np.nan
+    }
+
+def forward_returns(close: np.ndarray, horizon: int) -> np.ndarray:
+    """Return from each bar's close to the close ``horizon`` bars later (NaN at the end)"""
+    returns = np.full(len(close), np.nan)
+    returns[:-horizon] = close[horizon:] / close[:-horizon] - 1
+    return returns
+
+def _evaluate_chunk(configs: List[Dict]) -> List[Dict]:
+    """Score a batch of configurations against the worker's history"""
+    data = WORKER_STATE['data']
+    rows = []
+    for config in configs:
+        # The panel arrays behind evaluate_history, without building the frame
+        strategy = TheSystemStrategy({**WORKER_STATE['base_config'], **config})
+        panel = strategy._evaluate_panel(WORKER_STATE['close'], data['SPY'].index, data.get('QQQ'), ('SPY',))
+        rows.append(score_history(panel, WORKER_STATE['forward_returns'], strategy.config.get('min_confidence', 0)))
+    return rows
+
+def _period_key(config: Dict):
+    return tuple(config.get(name, 0) for name in ('sma_10_period', 'sma_50_period', 'sma_200_period', 'ema_9_period', 'ema_21_period'))
+
+class ParameterSweep:
+    """Scores many strategy configurations over one history.
+    
+    Each configuration is a dict of overrides on ``base_config``. Every one
+    is evaluated with ``evaluate_history`` and scored on the forward
+    returns after its signals (``score_history``). Configurations are
+    ordered by their moving-average periods and dealt out in chunks
+    across a process pool. Each worker's indicator store keeps the
+    averages it has computed, so configurations sharing periods reuse them.
+    """
+    
+    def __init__(self, data: Dict[str, pd.DataFrame], base_config: Optional[Dict] = None, horizon: int = 10,
+                 max_workers: int = 1, chunk_size: int = 64):
+        if horizon < 1:
+            raise ValueError(f"horizon must be at least 1 bar, got {horizon}")
+        
+        self.data = data
+        self.base_config = dict(base_config or EnhancedStrategyConfig.THE_SYSTEM)
+        self.horizon = horizon
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+    
+    def run(self, configs: List[Dict]) -> pd.DataFrame:
+        """One row per configuration (in the given order): its parameters and scores"""
+        order = sorted(range(len(configs)), key=lambda i: _period_key(configs[i]))
+        chunks = [[configs[i] for i in order[start:start + self.chunk_size]]
+                  for start in range(0, len(order), self.chunk_size)]
+        
+        started = time.monotonic()
+        print(f"Sweeping {len(configs)} configurations in {len(chunks)} chunks on {self.max_workers} worker(s)...")
+        
+        close = self.data['SPY']['Close'].to_numpy(dtype=np.float64)
+        state = {'data': self.data, 'close': close[:, None], 'base_config': self.base_config,
+                 'forward_returns': forward_returns(close, self.horizon)}
+        scored = map_with_state(_evaluate_chunk, chunks, state, self.max_workers)
+        
+        rows = [None] * len(configs)
+        for position, row in zip(order, itertools.chain.from_iterable(scored)):
+            rows[position] = row
+        
+        elapsed = time.monotonic() - started
+        print(f"✓ {len(configs)} configurations in {elapsed:.1f}s ({len(configs) / max(elapsed, 1e-9):.0f}/s)")
+        return pd.concat([pd.DataFrame(configs), pd.DataFrame(rows, columns=METRIC_COLUMNS)], axis=1)
+
+def write_results(results: pd.DataFrame, path: str) -> Path:
+    """Save sweep results column by column and return the file written.
+    
+    ``.parquet`` paths need pyarrow; anything else is written as an
+    ``.npz`` archive with one array per column.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == '.parquet':
+        results.to_parquet(path, index=False)
+    else:
+        path = path.with_suffix('.npz')
+        np.savez(path, **{str(column): _plain_column(results[column]) for column in results.columns})
+    return path
+
+def _plain_column(values: pd.Series) -> np.ndarray:
+    """Column as an array ``np.load`` reads without pickling: text becomes fixed-width unicode"""
+    array = values.to_numpy()
+    return array.astype(str) if array.dtype == object else array
+
+def read_results(path: str) -> pd.DataFrame:
+    if Path(path).suffix == '.parquet':
+        return pd.read_parquet(path)
+    with np.load(path, allow_pickle=False) as archive:
+        return pd.DataFrame({column: archive[column] for column in archive.files})
@@ -0,0 +1,195 @@
+import time
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+from backtesting.backtester import EXIT_REASONS, entry_exit_signals, equity_curve, in_market, simulate_trades
+from backtesting.metrics import summary
+from backtesting.monte_carlo import bootstrap, percentiles
+from config.settings import BacktestConfig
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+from utils.parallel import WORKER_STATE, map_with_state
+
+# Objectives a window's best configuration can be picked by (every
+# ``metrics.summary`` key) and whether higher values are better
+OBJECTIVES = {
+    'total_return': True,
+    'annualized_return': True,
+    'volatility': False,
+    'sharpe_ratio': True,
+    'sortino_ratio': True,
+    'calmar_ratio': True,
+    'max_drawdown': True,  # Drawdowns are negative, so higher is shallower
+    'max_drawdown_duration': False,
+    'win_rate': True,
+    'profit_factor': True,
+    'exposure': True
+}
+
+def walk_forward_windows(bars: int, train_bars: int, test_bars: int, start: int = 0,
+                         anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """(train_start, train_end, test_start, test_end) row ranges, ends exclusive.
+    
+    Test windows follow each other without gaps from ``start + train_bars``
+    to the end (the last one may be shorter). Rolling windows train on the
+    ``train_bars`` rows before each test window; anchored ones train on
+    everything from ``start``.
+    """
+    windows = []
+    test_start = start + train_bars
+    while test_start < bars:
+        train_start = start if anchored else test_start - train_bars
+        windows.append((train_start, test_start, test_start, min(test_start + test_bars, bars)))
+        test_start += test_bars
+    return windows
+
+def config_signals(data: Dict[str, pd.DataFrame], configs: List[Dict], base_config: Dict) -> Tuple[np.ndarray, np.ndarray]:
+    """(configs x bars) entry and exit signals over the full history.
+    
+    Signals at a bar only depend on the bars up to it, so every window can
+    slice these instead of re-running the strategy; moving averages come
+    from the shared indicator store, so configurations that share periods
+    compute them once.
+    """
+    spy_data = data['SPY']
+    close = spy_data['Close'].to_numpy(dtype=np.float64)[:, None]
+    
+    entries = np.zeros((len(configs), len(spy_data)), dtype=bool)
+    exits = np.zeros((len(configs), len(spy_data)), dtype=bool)
+    for row, config in enumerate(configs):
+        strategy = TheSystemStrategy({**base_config, **config})
+        panel = strategy._evaluate_panel(close, spy_data.index, data.get('QQQ'), ('SPY',))
+        entries[row], exits[row] = entry_exit_signals(panel, strategy.config.get('min_confidence', 0))
+    return entries, exits
+
+def _simulate(config_row: int, start: int, end: int, capital: float):
+    bars, config = WORKER_STATE['bars'], WORKER_STATE['backtest_config']
+    window = slice(start, end)
+    trades = simulate_trades(
+        bars['Open'][window], bars['High'][window], bars['Low'][window], bars['Close'][window],
+        WORKER_STATE['entries'][config_row, window], WORKER_STATE['exits'][config_row, window], config
+    )
+    return trades, equity_curve(bars['Close'][window], trades, capital, config.commission_pct)
+
+def _evaluate_window(window: Tuple[int, int, int, int]) -> Dict:
+    """Pick the best configuration on the train rows and trade it on the test rows"""
+    train_start, train_end, test_start, test_end = window
+    candidates = len(WORKER_STATE['entries'])
+    
+    # All candidates' train runs side by side (trade returns NaN-padded), scored in one call
+    runs = [_simulate(row, train_start, train_end, 1.0) for row in range(candidates)]
+    curves = np.column_stack([equity for _, equity in runs])
+    trade_returns = np.full((max(len(trades['return']) for trades, _ in runs), candidates), np.nan)
+    for column, (trades, _) in enumerate(runs):
+        trade_returns[:len(trades['return']), column] = trades['return']
+    exposure = np.column_stack([in_market(len(equity), trades) for trades, equity in runs])
+    scores = np.asarray(summary(curves, trade_returns, exposure)[WORKER_STATE['objective']], dtype=np.float64)
+    
+    ranked = scores if WORKER_STATE['maximize'] else -scores
+    best = int(np.argmax(np.where(np.isnan(ranked), -np.inf, ranked)))
+    
+    trades, equity = _simulate(best, test_start, test_end, 1.0)
+    return {'best': best, 'train_score': float(scores[best]), 'trades': trades, 'equity': equity}
+
+class WalkForwardAnalysis:
+    """Walk-forward validation of strategy configurations.
+    
+    The history is cut into consecutive test windows, each preceded by a
+    train window (rolling or anchored). On every train window each
+    candidate configuration is backtested and the best by ``objective``
+    (any ``metrics.summary`` key, see ``OBJECTIVES``; ``maximize`` overrides
+    whether higher is better) is traded, unchanged, on the following
+    test window. The test windows' equity curves are chained into one
+    out-of-sample curve, and their trades are bootstrapped like a backtest's
+    (unless ``monte_carlo_paths`` is 0).
+    
+    Signals are computed once per configuration over the whole history
+    and sliced per window; windows are evaluated across a process pool
+    that receives the bars and signals once per worker.
+    """
+    
+    def __init__(self, data: Dict[str, pd.DataFrame], configs: List[Dict], base_config: Optional[Dict] = None,
+                 backtest_config: Optional[BacktestConfig] = None, train_bars: int = 756, test_bars: int = 126,
+                 anchored: bool = False, warmup_bars: int = 200, objective: str = 'sharpe_ratio',
+                 maximize: Optional[bool] = None, max_workers: int = 1):
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Unknown objective {objective!r}, expected one of: {', '.join(OBJECTIVES)}")
+        
+        self.data = data
+        self.configs = list(configs) or [{}]
+        self.base_config = dict(base_config or EnhancedStrategyConfig.THE_SYSTEM)
+        self.backtest_config = backtest_config or BacktestConfig()
+        self.train_bars = train_bars
+        self.test_bars = test_bars
+        self.anchored = anchored
+        self.warmup_bars = warmup_bars  # Rows before the first train window, for the indicators to warm up
+        self.objective = objective
+        self.maximize = OBJECTIVES[objective] if maximize is None else maximize
+        self.max_workers = max_workers
+    
+    def run(self) -> Dict:
+        spy_data = self.data['SPY']
+        windows = walk_forward_windows(len(spy_data), self.train_bars, self.test_bars, self.warmup_bars, self.anchored)
+        if not windows:
+            print(f"Not enough history for a walk-forward: {len(spy_data)} bars")
+            return {'windows': pd.DataFrame(), 'trades': pd.DataFrame(), 'equity_curve': pd.Series(dtype=float),
+                    'metrics': {}, 'monte_carlo': pd.DataFrame()}
+        
+        started = time.monotonic()
+        print(f"Walk-forward: {len(windows)} windows x {len(self.configs)} configurations on {self.max_workers} worker(s)...")
+        
+        entries, exits = config_signals(self.data, self.configs, self.base_config)
+        bars = {column: spy_data[column].to_numpy(dtype=np.float64) for column in ('Open', 'High', 'Low', 'Close')}
+        state = {'bars': bars, 'entries': entries, 'exits': exits, 'backtest_config': self.backtest_config,
+                 'objective': self.objective, 'maximize': self.maximize}
+        outcomes = map_with_state(_evaluate_window, windows, state, self.max_workers)
+        
+        results = self._stitch(windows, outcomes)
+        print(f"✓ Walk-forward done in {time.monotonic() - started:.1f}s, "
+              f"out-of-sample return {results['metrics']['total_return']:.1%}")
+        return results
+    
+    def _stitch(self, windows: List[Tuple[int, int, int, int]], outcomes: List[Dict]) -> Dict:
+        """Chain the test windows into one out-of-sample run"""
+        index = self.data['SPY'].index
+        config = self.backtest_config
+        capital = config.initial_capital
+        
+        rows, trades, curves, exposure = [], [], [], []
+        for (train_start, train_end, test_start, test_end), outcome in zip(windows, outcomes):
+            equity = capital * outcome['equity']
+            window_trades = outcome['trades']
+            rows.append({
+                'train_start': index[train_start],
+                'train_end': index[train_end - 1],
+                'test_start': index[test_start],
+                'test_end': index[test_end - 1],
+                'train_score': outcome['train_score'],
+                'test_return': equity[-1] / capital - 1,
+                'test_trades': len(window_trades['return']),
+                **self.configs[outcome['best']]
+            })
+            trades.append(pd.DataFrame({
+                'entry_time': index[test_start + window_trades['entry_bar']],
+                'exit_time': index[test_start + window_trades['exit_bar']],
+                'entry_price': window_trades['entry_price'],
+                'exit_price': window_trades['exit_price'],
+                'return': window_trades['return'],
+                'bars_held': window_trades['exit_bar'] - window_trades['entry_bar'],
+                'exit_reason': EXIT_REASONS[window_trades['exit_reason']]
+            }))
+            curves.append(equity)
+            exposure.append(in_market(len(equity), window_trades))
+            capital = equity[-1]
+        
+        equity = np.concatenate(curves)
+        trade_frame = pd.concat(trades, ignore_index=True)
+        metrics = summary(equity, trade_frame['return'].to_numpy(), np.concatenate(exposure))
+        return {
+            'windows': pd.DataFrame(rows),
+            'trades': trade_frame,
+            'equity_curve': pd.Series(equity, index=index[windows[0][2]:windows[-1][3]], name='equity'),
+            'metrics': {name: value.item() for name, value in metrics.items()},
+            'monte_carlo': percentiles(bootstrap(
+                trade_frame['return'].to_numpy(), config.monte_carlo_paths, config.monte_carlo_block_size, config.monte_carlo_seed
+            )) if config.monte_carlo_paths > 0 else pd.DataFrame()
+        }
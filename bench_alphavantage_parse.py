@@ -0,0 +1,73 @@
+# bench_alphavantage_parse.py
+import json
+import time
+import numpy as np
+import pandas as pd
+from data.parsers import loads_json, parse_time_series, orjson
+
+def create_full_payload(rows: int = 6000) -> bytes:
+    """Build a TIME_SERIES_DAILY outputsize=full sized response body"""
+    rng = np.random.default_rng(42)
+    dates = pd.bdate_range(end='2025-10-16', periods=rows)[::-1]  # Newest first, like the API
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    
+    time_series = {
+        date.strftime('%Y-%m-%d'): {
+            '1. open': f"{close * 0.999:.4f}",
+            '2. high': f"{close * 1.01:.4f}",
+            '3. low': f"{close * 0.99:.4f}",
+            '4. close': f"{close:.4f}",
+            '5. volume': str(int(rng.integers(50_000_000, 150_000_000)))
+        }
+        for date, close in zip(dates, closes)
+    }
+    payload = {'Meta Data': {'2. Symbol': 'SPY'}, 'Time Series (Daily)': time_series}
+    return json.dumps(payload).encode()
+
+def legacy_parse(content: bytes) -> pd.DataFrame:
+    """The original per-row conversion from MarketDataFetcher"""
+    time_series = json.loads(content)["Time Series (Daily)"]
+    
+    df_data = []
+    for date_str, values in time_series.items():
+        df_data.append({
+            'Open': float(values['1. open']),
+            'High': float(values['2. high']),
+            'Low': float(values['3. low']),
+            'Close': float(values['4. close']),
+            'Volume': int(values['5. volume'])
+        })
+    
+    dates = [pd.to_datetime(date) for date in time_series.keys()]
+    df = pd.DataFrame(df_data, index=dates)
+    df.sort_index(inplace=True)
+    return df
+
+def bulk_parse(content: bytes) -> pd.DataFrame:
+    return parse_time_series(loads_json(content)["Time Series (Daily)"])
+
+def best_of(func, content: bytes, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def run_benchmark(rows: int = 6000):
+    content = create_full_payload(rows)
+    print(f"Payload: {rows} rows, {len(content) / 1024:.0f} KiB, JSON decoder: {'orjson' if orjson else 'json'}")
+    
+    expected = legacy_parse(content)
+    result = bulk_parse(content)
+    pd.testing.assert_frame_equal(result, expected, check_index_type=False, check_freq=False)
+    
+    legacy = best_of(legacy_parse, content)
+    bulk = best_of(bulk_parse, content)
+    
+    print(f"  Legacy per-row parse: {legacy * 1000:8.2f} ms")
+    print(f"  Bulk parse:           {bulk * 1000:8.2f} ms")
+    print(f"  Speedup:              {legacy / bulk:8.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,78 @@
+# bench_analyze.py
+import time
+import numpy as np
+from data.resample import resample_bars, wall_clock_ns
+from data.synthetic import SyntheticMarketGenerator
+from strategies.indicators import IndicatorStore, window_mean
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+def legacy_market_state(strategy, spy_data, nasdaq_data) -> dict:
+    """The original per-row pandas market state (iloc scalars, resampled frames)"""
+    current = strategy.indicator_engine.update('SPY', spy_data)
+    current_price = spy_data['Close'].iloc[-1]
+    
+    spy_recent = spy_data['Close'].iloc[-strategy.nasdaq_lookback:]
+    nasdaq_recent = nasdaq_data['Close'].iloc[-strategy.nasdaq_lookback:]
+    spy_return = (spy_recent.iloc[-1] - spy_recent.iloc[0]) / spy_recent.iloc[0]
+    nasdaq_return = (nasdaq_recent.iloc[-1] - nasdaq_recent.iloc[0]) / nasdaq_recent.iloc[0]
+    
+    htf_close = resample_bars(spy_data, strategy.higher_timeframe)['Close'].to_numpy(dtype=np.float64)
+    return {
+        'current_price': current_price,
+        'distance_50sma': ((current_price - current['SMA_50']) / current['SMA_50']) * 100,
+        'relative_strength': nasdaq_return - spy_return,
+        'fast_ma': window_mean(htf_close[-strategy.htf_fast_period:]),
+        'slow_ma': window_mean(htf_close[-strategy.htf_slow_period:])
+    }
+
+def array_market_state(strategy, timestamps, close, nasdaq_close) -> dict:
+    state = strategy._market_state_from_arrays(timestamps, close, nasdaq_close)
+    return {
+        'current_price': state['current_price'],
+        'distance_50sma': state['distance_50sma'],
+        'relative_strength': state['nasdaq_analysis']['relative_strength'],
+        'fast_ma': state['higher_tf_context']['fast_ma'],
+        'slow_ma': state['higher_tf_context']['slow_ma']
+    }
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    results = [func(*args) for args in calls]
+    return (time.perf_counter() - start) / len(calls), results
+
+def run_benchmark(bars: int = 1000, calls: int = 500):
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=42).generate(bars)
+    spy, qqq = data['SPY'], data['QQQ']
+    ends = range(bars - calls + 1, bars + 1)  # One new bar per call, like successive scans
+    print(f"History: {bars} bars, {calls} calls with one new bar each")
+    
+    # Separate indicator stores, so each variant updates its own running averages
+    legacy_strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM, IndicatorStore())
+    legacy, expected = per_call(
+        lambda spy_data, nasdaq_data: legacy_market_state(legacy_strategy, spy_data, nasdaq_data),
+        [(spy.iloc[:end], qqq.iloc[:end]) for end in ends]
+    )
+    
+    # Arrays pulled out of the frames on every call (what analyze() does)
+    adapter_strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM, IndicatorStore())
+    adapter, _ = per_call(
+        lambda spy_data, nasdaq_data: adapter_strategy._analyze_current_market_state(spy_data, nasdaq_data),
+        [(spy.iloc[:end], qqq.iloc[:end]) for end in ends]
+    )
+    
+    # Arrays held by the caller (backtests, universe panels)
+    core_strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM, IndicatorStore())
+    timestamps, close, nasdaq_close = wall_clock_ns(spy.index), spy['Close'].to_numpy(), qqq['Close'].to_numpy()
+    core, results = per_call(
+        lambda end: array_market_state(core_strategy, timestamps[:end], close[:end], nasdaq_close[:end]),
+        [(end,) for end in ends]
+    )
+    assert results == expected
+    
+    print(f"  Legacy pandas market state: {legacy * 1e6:8.1f} us/call")
+    print(f"  Array core via adapter:     {adapter * 1e6:8.1f} us/call")
+    print(f"  Array core on arrays:       {core * 1e6:8.1f} us/call")
+    print(f"  Speedup:                    {legacy / core:8.1f}x")
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -17,6 +17,40 @@ class EmailConfig:
 class DataConfig:
     alphavantage_api_key: str = os.getenv("ALPHAVANTAGE_API_KEY", "")
     cache_duration_minutes: int = 5
+    memory_cache_max_mb: int = int(os.getenv("MARKET_DATA_MEMORY_CACHE_MB", "256"))
+    memory_cache_compact: bool = False  # float32/int32 for cold entries before evicting
+    disk_cache_enabled: bool = True
+    disk_cache_dir: str = os.getenv("MARKET_DATA_CACHE_DIR", ".cache/market_data")
+    data_providers: str = os.getenv("MARKET_DATA_PROVIDERS", "local,alphavantage,yfinance")  # Tried in order
+    local_data_dir: str = os.getenv("MARKET_DATA_LOCAL_DIR", "")
+    alphavantage_calls_per_minute: int = 5  # Free tier limits
+    alphavantage_calls_per_day: int = 500
+    yfinance_calls_per_minute: int = 30
+    rate_limit_max_wait_seconds: int = 120
+    max_fetch_workers: int = 4
+    http_pool_maxsize: int = 10
+    http_max_retries: int = 3
+    http_backoff_seconds: float = 2.0
+    circuit_breaker_threshold: int = 3
+    circuit_breaker_reset_seconds: int = 300
+
+@dataclass
+class ExecutionConfig:
+    parallel: bool = os.getenv("SCAN_PARALLEL", "false").lower() == "true"
+    max_workers: int = int(os.getenv("SCAN_WORKERS", "0")) or (os.cpu_count() or 1)
+    task_timeout_seconds: int = 120  # Per strategy/shard
+    shard_size: int = 100  # Universe symbols per parallel task
+
+@dataclass
+class BacktestConfig:
+    initial_capital: float = 10000
+    commission_pct: float = 0.0005  # Per side, fraction of the traded value
+    slippage_pct: float = 0.0005    # Per fill, against us
+    stop_loss_pct: float = 0.05     # Below the entry fill; 0 disables
+    take_profit_pct: float = 0.0    # Above the entry fill; 0 disables (overbought signals take profits)
+    monte_carlo_paths: int = int(os.getenv("BACKTEST_MONTE_CARLO_PATHS", "10000"))  # Bootstrapped trade sequences per backtest; 0 disables
+    monte_carlo_block_size: int = 1   # Consecutive trades per draw; 1 is an IID bootstrap
+    monte_carlo_seed: int = 0
 
 @dataclass
 class MarketConfig:
@@ -33,5 +67,7 @@ class StrategyConfig:
         'timeframe': '1d',  # Alpha Vantage gives us daily data
         'min_confidence': 60,
         'oversold_threshold': -3.0,
-        'overbought_threshold': 3.0
+        'overbought_threshold': 3.0,
+        'universe': [symbol.strip() for symbol in os.getenv("SCAN_UNIVERSE", "").split(",") if symbol.strip()],  # Empty = SPY only
+        'event_calendar_path': os.getenv("ECONOMIC_CALENDAR_PATH", "")  # Empty = bundled calendar
     }
\ No newline at end of file
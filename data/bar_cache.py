@@ -0,0 +1,186 @@
+import json
+import os
+import shutil
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Optional
+
+from utils.market_hours import is_market_hours, latest_session_date, session_close
+
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def merge_bars(history: pd.DataFrame, recent: pd.DataFrame) -> pd.DataFrame:
+    """Merge newly fetched bars onto stored history by date.
+    
+    Where both contain a date the recent bar wins, since the stored one may
+    have been a partial intraday bar.
+    """
+    merged = pd.concat([history[BAR_COLUMNS], recent[BAR_COLUMNS]])
+    merged = merged[~merged.index.duplicated(keep='last')]
+    return merged.sort_index()
+
+class BarCache:
+    """Persistent on-disk OHLCV store.
+    
+    Each symbol/timeframe is kept as a versioned directory of NumPy column
+    files plus a small JSON manifest pointing at the current version:
+        
+        {root}/{timeframe}/{SYMBOL}/{version}/index.npy    int64 nanoseconds since epoch
+        {root}/{timeframe}/{SYMBOL}/{version}/Open.npy     float64 (same for High/Low/Close)
+        {root}/{timeframe}/{SYMBOL}/{version}/Volume.npy   int64
+        {root}/{timeframe}/{SYMBOL}/meta.json              version, fetch time and row count
+        {root}/{timeframe}/{SYMBOL}/backfill.json          when each provider last failed to return full history
+    
+    A store writes a complete new version and then swaps the manifest in
+    with one atomic rename, so a reader sees either the old bars or the new
+    ones, never a mix. Columns are loaded memory-mapped so a warm read
+    costs a few milliseconds.
+    """
+    
+    def __init__(self, root: str, ttl: timedelta = timedelta(minutes=5)):
+        self.root = Path(root)
+        self.ttl = ttl
+    
+    def load(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Load stored bars, or None if nothing usable is on disk"""
+        meta = self.load_meta(symbol, timeframe)
+        if meta is None:
+            return None
+        
+        path = self._path(symbol, timeframe) / meta.get('version', '')
+        try:
+            index = np.load(path / 'index.npy', mmap_mode='r')
+            columns = {
+                column: np.load(path / f'{column}.npy', mmap_mode='r')
+                for column in BAR_COLUMNS
+            }
+        except (OSError, ValueError) as e:
+            print(f"Bar cache read error for {symbol}: {e}")
+            return None
+        
+        if any(len(values) != meta['rows'] for values in [index, *columns.values()]):
+            print(f"Bar cache for {symbol} is inconsistent, ignoring it")
+            return None
+        
+        return pd.DataFrame(columns, index=pd.DatetimeIndex(index.astype('datetime64[ns]')))
+    
+    def load_meta(self, symbol: str, timeframe: str) -> Optional[Dict]:
+        meta_file = self._path(symbol, timeframe) / 'meta.json'
+        if not meta_file.exists():
+            return None
+        
+        try:
+            with open(meta_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Bar cache manifest error for {symbol}: {e}")
+            return None
+    
+    def store(self, symbol: str, timeframe: str, data: pd.DataFrame, fetched_at: Optional[datetime] = None):
+        """Write bars to disk, replacing whatever was stored before"""
+        if data.empty:
+            return
+        
+        fetched_at = fetched_at or datetime.now(timezone.utc)
+        path = self._path(symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        arrays = {'index': data.index.values.astype('datetime64[ns]').astype(np.int64)}
+        for column in BAR_COLUMNS:
+            dtype = np.int64 if column == 'Volume' else np.float64
+            arrays[column] = data[column].to_numpy(dtype=dtype)
+        
+        # Write every column into a fresh version directory, then point the
+        # manifest at it in one rename
+        previous = self.load_meta(symbol, timeframe)
+        suffix = f'{os.getpid()}.{threading.get_ident()}'
+        version = f'v{time.time_ns()}.{suffix}'
+        (path / version).mkdir()
+        for name, values in arrays.items():
+            np.save(path / version / f'{name}.npy', values)
+        
+        meta = {
+            'version': version,
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'rows': len(data),
+            'first_bar': data.index[0].isoformat(),
+            'last_bar': data.index[-1].isoformat(),
+            'fetched_at': fetched_at.astimezone(timezone.utc).isoformat()
+        }
+        tmp_meta = path / f'meta.{suffix}.tmp.json'
+        with open(tmp_meta, 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(tmp_meta, path / 'meta.json')
+        
+        # Keep the version just replaced for readers that picked it up before
+        # the swap; anything older has had a whole store's time to finish
+        keep = {version, (previous or {}).get('version')}
+        for stale in path.glob('v*'):
+            if stale.is_dir() and stale.name not in keep:
+                shutil.rmtree(stale, ignore_errors=True)
+    
+    def load_backfill_failure(self, symbol: str, timeframe: str, provider: str) -> Optional[datetime]:
+        """When ``provider`` last returned no full history for the symbol, or None"""
+        failures = self._load_backfill_failures(symbol, timeframe)
+        return datetime.fromisoformat(failures[provider]) if provider in failures else None
+    
+    def record_backfill_failure(self, symbol: str, timeframe: str, provider: str,
+                                failed_at: Optional[datetime] = None):
+        """Remember that a full backfill failed so it isn't retried on every sync"""
+        failed_at = failed_at or datetime.now(timezone.utc)
+        path = self._path(symbol, timeframe)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        failures = self._load_backfill_failures(symbol, timeframe)
+        failures[provider] = failed_at.astimezone(timezone.utc).isoformat()
+        tmp_file = path / f'backfill.{os.getpid()}.{threading.get_ident()}.tmp.json'
+        with open(tmp_file, 'w') as f:
+            json.dump(failures, f, indent=2)
+        os.replace(tmp_file, path / 'backfill.json')
+    
+    def _load_backfill_failures(self, symbol: str, timeframe: str) -> Dict[str, str]:
+        failure_file = self._path(symbol, timeframe) / 'backfill.json'
+        if not failure_file.exists():
+            return {}
+        
+        try:
+            with open(failure_file, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Bar cache backfill record error for {symbol}: {e}")
+            return {}
+    
+    def is_fresh(self, meta: Dict, now: Optional[datetime] = None) -> bool:
+        """Decide whether stored daily bars can still be served.
+        
+        Fresh when any of these hold:
+          * they were fetched less than ``ttl`` ago
+          * the market is closed, the newest bar is from the latest session
+            and it was fetched after that session closed, so no newer bar
+            can exist yet
+        """
+        now = now or datetime.now(timezone.utc)
+        if now.tzinfo is None:
+            now = now.astimezone()
+        
+        fetched_at = datetime.fromisoformat(meta['fetched_at'])
+        if now - fetched_at < self.ttl:
+            return True
+        
+        # While the session is running the latest bar keeps changing
+        if is_market_hours(now):
+            return False
+        
+        last_bar = pd.Timestamp(meta['last_bar']).date()
+        if last_bar < latest_session_date(now):
+            return False
+        
+        return fetched_at >= session_close(last_bar)
+    
+    def _path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / symbol.upper()
@@ -0,0 +1,85 @@
+import os
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Bundled calendar (date,event,description): FOMC rate decisions from 2015. Other
+# releases (CPI, NFP, ...) can be added as rows with their own event type
+DEFAULT_CALENDAR_PATH = os.path.join(os.path.dirname(__file__), 'calendars', 'economic_events.csv')
+
+# Days-to-event value for dates with no event on the calendar at all
+NO_EVENT = np.iinfo(np.int32).max
+
+def _as_days(dates) -> np.ndarray:
+    """Calendar days (datetime64[D]) of a timestamp or sequence of timestamps"""
+    if isinstance(dates, datetime):
+        return np.array([dates.date()], dtype='datetime64[D]')  # Local date, no index needed
+    if np.ndim(dates) == 0:
+        dates = [dates]
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_localize(None)  # Keep the local trading date
+    return index.values.astype('datetime64[D]')
+
+class EventCalendar:
+    """Scheduled economic events held as a sorted array of dates.
+    
+    Lookups are binary searches (``np.searchsorted``), so the distance to
+    the nearest event can be computed for a whole bar history in one call.
+    """
+    
+    def __init__(self, dates=(), events=()):
+        days = _as_days(list(dates)) if len(dates) else np.zeros(0, dtype='datetime64[D]')
+        order = np.argsort(days, kind='stable')
+        self.dates = days[order]
+        self.events = np.asarray(events, dtype=object)[order] if len(events) else np.full(len(days), '', dtype=object)
+    
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> 'EventCalendar':
+        data = pd.read_csv(path or DEFAULT_CALENDAR_PATH, parse_dates=['date'])
+        return cls(data['date'], data['event'].str.strip())
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def select(self, *events: str) -> 'EventCalendar':
+        """Calendar with only the given event types (e.g. 'FOMC', 'CPI')"""
+        keep = np.isin(self.events, events)
+        return EventCalendar(self.dates[keep], self.events[keep])
+    
+    def days_to_nearest(self, dates) -> np.ndarray:
+        """Signed days from each date to its nearest event.
+        
+        Positive means the event is ahead, negative that it has passed, 0
+        that it falls on that date. When a past and an upcoming event are
+        equally far, the past one wins. Dates are compared by calendar day;
+        ``NO_EVENT`` is returned if the calendar is empty.
+        """
+        days = _as_days(dates)
+        if len(self.dates) == 0:
+            return np.full(len(days), NO_EVENT, dtype=np.int64)
+        
+        after = np.searchsorted(self.dates, days, side='left')
+        upcoming = (self.dates[np.minimum(after, len(self.dates) - 1)] - days).astype(np.int64)
+        passed = (self.dates[np.maximum(after - 1, 0)] - days).astype(np.int64)
+        
+        # Past the last event / before the first one there is only one side
+        upcoming[after == len(self.dates)] = NO_EVENT
+        passed[after == 0] = -NO_EVENT
+        return np.where(-passed <= upcoming, passed, upcoming)
+    
+    def nearest(self, as_of) -> Tuple[int, str]:
+        """Signed days to the event nearest ``as_of`` and its name"""
+        days = int(self.days_to_nearest(as_of)[0])
+        if abs(days) == NO_EVENT:
+            return NO_EVENT, ''
+        
+        position = np.searchsorted(self.dates, _as_days(as_of)[0] + np.timedelta64(days, 'D'))
+        return days, self.events[position]
+
+@lru_cache(maxsize=8)
+def load_calendar(path: Optional[str] = None) -> EventCalendar:
+    """Shared, parsed-once calendar for ``path`` (the bundled one by default)"""
+    return EventCalendar.load(path)
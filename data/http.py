@@ -0,0 +1,158 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from data.parsers import loads_json
+from data.rate_limiter import RateLimiter
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class ProviderError(Exception):
+    """A data provider request failed"""
+
+class ThrottledError(ProviderError):
+    """The provider kept throttling us after all retries"""
+
+class CircuitOpenError(ProviderError):
+    """The provider has failed repeatedly and is being left alone for a while"""
+
+class CircuitBreaker:
+    """Stops calling a provider after repeated failures.
+    
+    closed    - requests flow normally
+    open      - requests are refused until ``reset_timeout`` has passed
+    half-open - one trial request is let through; success closes the
+                circuit, failure opens it again
+    """
+    
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+    
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+    
+    def release(self):
+        """Give up a trial request without judging the provider either way"""
+        with self._lock:
+            self._trial_in_flight = False
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_in_flight = False
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+class ProviderSession:
+    """Keep-alive HTTP session for one data provider.
+    
+    Holds a bounded connection pool so repeated calls reuse TCP/TLS
+    connections, retries throttled or timed-out requests with exponential
+    backoff and full jitter, and trips a circuit breaker when the provider
+    keeps failing.
+    """
+    
+    def __init__(self, name: str, rate_limiter: Optional[RateLimiter] = None,
+                 is_throttled: Optional[Callable[[Dict], bool]] = None,
+                 pool_maxsize: int = 10, max_retries: int = 3,
+                 backoff_seconds: float = 2.0, max_backoff_seconds: float = 60.0,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.name = name
+        self.rate_limiter = rate_limiter
+        self.is_throttled = is_throttled or (lambda payload: False)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.breaker = breaker or CircuitBreaker()
+        
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def get_json(self, url: str, params: Dict, timeout: float = 15,
+                 rate_limit_wait: Optional[float] = None) -> Dict:
+        """GET a JSON document, retrying transient failures.
+        
+        Raises CircuitOpenError, ThrottledError or ProviderError on failure.
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"{self.name} circuit open after repeated failures")
+        
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None and not self.rate_limiter.acquire(timeout=rate_limit_wait):
+                # Our own quota is spent - not the provider's fault
+                self.breaker.release()
+                raise ThrottledError(f"{self.name} request quota exhausted")
+            
+            retry_after = None
+            try:
+                response = self.session.get(url, params=params, timeout=timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                error = ProviderError(f"{self.name} request failed: {e}")
+            else:
+                if response.status_code in RETRYABLE_STATUS_CODES:
+                    error = ThrottledError(f"{self.name} HTTP {response.status_code}")
+                    retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                elif response.status_code != 200:
+                    self.breaker.record_success()  # Client error, provider is healthy
+                    raise ProviderError(f"{self.name} HTTP {response.status_code}")
+                else:
+                    try:
+                        payload = loads_json(response.content)
+                    except ValueError as e:
+                        self.breaker.record_failure()
+                        raise ProviderError(f"{self.name} returned invalid JSON: {e}")
+                    if not self.is_throttled(payload):
+                        self.breaker.record_success()
+                        return payload
+                    error = ThrottledError(f"{self.name} throttled the request")
+            
+            if attempt == self.max_retries:
+                self.breaker.record_failure()
+                raise error
+            
+            delay = self._backoff(attempt) if retry_after is None else min(retry_after, self.max_backoff_seconds)
+            print(f"{error} - retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+    
+    def _backoff(self, attempt: int) -> float:
+        """Exponential backoff with full jitter"""
+        ceiling = min(self.max_backoff_seconds, self.backoff_seconds * (2 ** attempt))
+        return random.uniform(0, ceiling)
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
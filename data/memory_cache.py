@@ -0,0 +1,155 @@
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Optional, Tuple
+
+INT32_MAX = np.iinfo(np.int32).max
+
+def frame_nbytes(data: pd.DataFrame) -> int:
+    """Actual memory held by a frame's columns and index"""
+    return int(data.memory_usage(index=True, deep=True).sum())
+
+def freeze_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """A copy of the frame backed by read-only column arrays.
+    
+    Cached bars are shared by every caller (lookbacks are views of them),
+    so an in-place write anywhere would corrupt them for everyone. Frozen,
+    such a write raises instead; adding columns or copying still works.
+    The columns are copied so the caller's frame can't write through either.
+    """
+    columns = {}
+    for column in data.columns:
+        values = data[column].to_numpy(copy=True)
+        values.flags.writeable = False
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index, copy=False)
+
+def compact_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """float64 prices to float32 and int64 volume to int32 (when it fits).
+    
+    Roughly halves the footprint at the cost of ~7 significant digits on
+    prices, which is plenty for OHLC quotes.
+    """
+    columns = {}
+    for column in data.columns:
+        values = data[column]
+        if values.dtype == np.float64:
+            values = values.astype(np.float32)
+        elif values.dtype == np.int64 and (values.empty or (values.min() >= 0 and values.max() <= INT32_MAX)):
+            values = values.astype(np.int32)
+        columns[column] = values
+    return pd.DataFrame(columns, index=data.index)
+
+class LRUBarCache:
+    """In-memory bar cache with a byte budget and least-recently-used eviction.
+    
+    Each entry is a DataFrame plus the time it was stored. When the budget
+    is exceeded, the coldest entries are first compacted (if enabled) and
+    then evicted until the cache fits again. The most recently stored entry
+    is never evicted, so a single oversized frame is still served.
+    """
+    
+    def __init__(self, max_bytes: int, compact_cold: bool = False):
+        self.max_bytes = max_bytes
+        self.compact_cold = compact_cold
+        self._entries: "OrderedDict[Hashable, Tuple[pd.DataFrame, datetime, int, bool]]" = OrderedDict()
+        self._lock = threading.RLock()
+        
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compactions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    def get(self, key: Hashable, max_age: Optional[timedelta] = None, now: Optional[datetime] = None) -> Optional[pd.DataFrame]:
+        """Return the frame for ``key`` and mark it recently used.
+        
+        Entries older than ``max_age`` count as a miss but are kept, so a
+        refresh can still merge into their history.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or (max_age is not None and (now or datetime.now()) - entry[1] >= max_age):
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def peek(self, key: Hashable) -> Optional[pd.DataFrame]:
+        """Return the frame for ``key`` without touching recency or counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return None if entry is None else entry[0]
+    
+    def put(self, key: Hashable, data: pd.DataFrame, stored_at: Optional[datetime] = None) -> pd.DataFrame:
+        """Store a frozen copy of ``data`` and return it"""
+        data = freeze_frame(data)
+        with self._lock:
+            self._remove(key)
+            size = frame_nbytes(data)
+            self._entries[key] = (data, stored_at or datetime.now(), size, False)
+            self.bytes += size
+            self._shrink()
+        return data
+    
+    def pop(self, key: Hashable) -> Optional[pd.DataFrame]:
+        with self._lock:
+            entry = self._remove(key)
+            return None if entry is None else entry[0]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'compactions': self.compactions
+            }
+    
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+        return entry
+    
+    def _shrink(self):
+        if self.bytes <= self.max_bytes:
+            return
+        
+        # Cheaper option first: compact cold entries, oldest first
+        if self.compact_cold:
+            for key in list(self._entries)[:-1]:
+                data, stored_at, size, compacted = self._entries[key]
+                if compacted:
+                    continue
+                
+                data = freeze_frame(compact_frame(data))
+                new_size = frame_nbytes(data)
+                self._entries[key] = (data, stored_at, new_size, True)
+                self.bytes += new_size - size
+                self.compactions += 1
+                if self.bytes <= self.max_bytes:
+                    return
+        
+        while self.bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
@@ -0,0 +1,55 @@
+import json
+from operator import itemgetter
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the stdlib decoder
+    orjson = None
+
+# Alpha Vantage field names, in output column order
+TIME_SERIES_FIELDS = {
+    'Open': '1. open',
+    'High': '2. high',
+    'Low': '3. low',
+    'Close': '4. close',
+    'Volume': '5. volume'
+}
+
+def loads_json(content: bytes) -> Dict:
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+def parse_time_series(time_series: Dict[str, Dict[str, str]]) -> pd.DataFrame:
+    """Convert an Alpha Vantage "Time Series" object into an OHLCV DataFrame.
+    
+    All values are converted in one bulk NumPy call and the dates in one
+    vectorized parse, instead of building a dict and a Timestamp per row.
+    """
+    if not time_series:
+        return pd.DataFrame(columns=list(TIME_SERIES_FIELDS))
+    
+    getter = itemgetter(*TIME_SERIES_FIELDS.values())
+    values = np.array(list(map(getter, time_series.values())), dtype=np.float64)
+    dates = np.array(list(time_series.keys()), dtype='datetime64[s]').astype('datetime64[ns]')
+    
+    # Alpha Vantage returns newest first
+    if len(dates) > 1 and dates[0] > dates[-1]:
+        values = values[::-1]
+        dates = dates[::-1]
+    if not (np.diff(dates.view(np.int64)) > 0).all():
+        order = np.argsort(dates, kind='stable')
+        values = values[order]
+        dates = dates[order]
+    
+    columns = {}
+    for i, column in enumerate(TIME_SERIES_FIELDS):
+        dtype = np.int64 if column == 'Volume' else np.float64
+        columns[column] = np.ascontiguousarray(values[:, i], dtype=dtype)
+    
+    return pd.DataFrame(columns, index=pd.DatetimeIndex(dates))
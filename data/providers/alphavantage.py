@@ -0,0 +1,109 @@
+import os
+import pandas as pd
+from typing import Dict
+
+from config.settings import DataConfig
+from data.http import CircuitBreaker, ProviderError, ProviderSession
+from data.parsers import parse_time_series
+from data.providers.base import DataProvider
+from data.rate_limiter import RateLimiter
+
+class AlphaVantageProvider(DataProvider):
+    """TIME_SERIES_DAILY from Alpha Vantage, one symbol per request"""
+    
+    url = "https://www.alphavantage.co/query"
+    
+    def __init__(self, config: DataConfig):
+        super().__init__("Alpha Vantage")
+        self.config = config
+        self.api_key = config.alphavantage_api_key or os.getenv("ALPHAVANTAGE_API_KEY")
+        
+        # Shared by every thread that hits the network
+        self.rate_limiter = RateLimiter(
+            self.name,
+            calls_per_minute=config.alphavantage_calls_per_minute,
+            calls_per_day=config.alphavantage_calls_per_day
+        )
+        
+        # Pooled keep-alive connections with retry/backoff and a circuit breaker
+        self.session = ProviderSession(
+            self.name,
+            rate_limiter=self.rate_limiter,
+            is_throttled=_is_alphavantage_throttled,
+            pool_maxsize=config.http_pool_maxsize,
+            max_retries=config.http_max_retries,
+            backoff_seconds=config.http_backoff_seconds,
+            breaker=CircuitBreaker(
+                failure_threshold=config.circuit_breaker_threshold,
+                reset_timeout=config.circuit_breaker_reset_seconds
+            )
+        )
+    
+    def is_available(self) -> bool:
+        return bool(self.api_key)
+    
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        """Fetch data from Alpha Vantage API
+        
+        outputsize: "compact" for the last 100 data points, "full" for 20+ years
+        """
+        if timeframe != '1d':
+            print(f"Alpha Vantage provider only supports daily bars, not {timeframe}")
+            return pd.DataFrame()
+        
+        try:
+            params = {
+                "function": "TIME_SERIES_DAILY",
+                "symbol": symbol,
+                "apikey": self.api_key,
+                "outputsize": outputsize
+            }
+            
+            print(f"Making API request for {symbol}...")
+            data = self.session.get_json(
+                self.url,
+                params,
+                timeout=30 if outputsize == "full" else 15,
+                rate_limit_wait=self.config.rate_limit_max_wait_seconds
+            )
+            
+            # Check for API errors
+            if "Error Message" in data:
+                print(f"Alpha Vantage Error for {symbol}: {data['Error Message']}")
+                return pd.DataFrame()
+            
+            # Rate limit notes are retried by the session; anything left is
+            # e.g. a premium-only parameter
+            if "Information" in data:
+                print(f"Alpha Vantage Information for {symbol}: {data['Information']}")
+                return pd.DataFrame()
+            
+            # Parse the time series data
+            if "Time Series (Daily)" not in data:
+                print(f"No time series data in response for {symbol}")
+                return pd.DataFrame()
+            
+            df = parse_time_series(data["Time Series (Daily)"])
+            if df.empty:
+                print(f"Empty time series in response for {symbol}")
+                return df
+            
+            print(f"Successfully fetched {len(df)} data points for {symbol}")
+            print(f"Date range: {df.index[0].date()} to {df.index[-1].date()}")
+            print(f"Latest close: ${df['Close'].iloc[-1]:.2f}")
+            
+            return df
+        
+        except ProviderError as e:
+            print(f"Alpha Vantage unavailable for {symbol}: {e}")
+            return pd.DataFrame()
+        except Exception as e:
+            print(f"Alpha Vantage fetch error for {symbol}: {e}")
+            return pd.DataFrame()
+
+def _is_alphavantage_throttled(payload: Dict) -> bool:
+    """Alpha Vantage signals throttling with a 200 response and a Note/Information message"""
+    if "Note" in payload:
+        return True
+    message = str(payload.get("Information", "")).lower()
+    return "rate limit" in message or "call frequency" in message
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+import pandas as pd
+
+class DataProvider(ABC):
+    """Source of daily OHLCV bars.
+    
+    ``outputsize`` follows Alpha Vantage's vocabulary: "compact" asks for
+    roughly the last 100 bars, "full" for all available history. Providers
+    that can serve many tickers in one request set ``supports_batch`` and
+    override ``fetch_many``.
+    """
+    
+    supports_batch = False
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def is_available(self) -> bool:
+        """Whether the provider is configured/installed and can be used"""
+        return True
+    
+    @abstractmethod
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        """Return bars for one symbol, or an empty DataFrame on failure"""
+        pass
+    
+    def fetch_many(self, symbols: List[str], timeframe: str = '1d', outputsize: str = 'compact') -> Dict[str, pd.DataFrame]:
+        """Return bars for several symbols; symbols that failed are left out"""
+        result = {}
+        for symbol in symbols:
+            data = self.fetch(symbol, timeframe, outputsize)
+            if not data.empty:
+                result[symbol] = data
+        return result
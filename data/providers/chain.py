@@ -0,0 +1,35 @@
+from typing import List
+
+from config.settings import DataConfig
+from data.providers.alphavantage import AlphaVantageProvider
+from data.providers.base import DataProvider
+from data.providers.local import LocalDirectoryProvider
+from data.providers.yahoo import YFinanceProvider
+
+def build_provider_chain(config: DataConfig) -> List[DataProvider]:
+    """Instantiate the providers named in ``config.data_providers``, in order.
+    
+    Providers that are not configured or installed are left out.
+    """
+    factories = {
+        'alphavantage': lambda: AlphaVantageProvider(config),
+        'yfinance': lambda: YFinanceProvider(config),
+        'local': lambda: LocalDirectoryProvider(config.local_data_dir)
+    }
+    
+    chain = []
+    for name in config.data_providers.split(','):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in factories:
+            print(f"Unknown data provider '{name}', skipping")
+            continue
+        
+        provider = factories[name]()
+        if provider.is_available():
+            chain.append(provider)
+        else:
+            print(f"Data provider '{name}' not available, skipping")
+    
+    return chain
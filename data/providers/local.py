@@ -0,0 +1,43 @@
+import pandas as pd
+from pathlib import Path
+
+from data.bar_cache import BAR_COLUMNS
+from data.providers.base import DataProvider
+
+class LocalDirectoryProvider(DataProvider):
+    """Bars from a directory of {SYMBOL}.parquet or {SYMBOL}.csv files.
+    
+    Useful for offline runs and research datasets. Parquet needs pyarrow (or
+    fastparquet) installed; CSV files need a date index in the first column.
+    """
+    
+    def __init__(self, root: str):
+        super().__init__("local files")
+        self.root = Path(root) if root else None
+    
+    def is_available(self) -> bool:
+        return self.root is not None and self.root.is_dir()
+    
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        for suffix in ('.parquet', '.csv'):
+            path = self.root / f"{symbol.upper()}{suffix}"
+            if not path.exists():
+                continue
+            
+            try:
+                if suffix == '.parquet':
+                    data = pd.read_parquet(path)
+                else:
+                    data = pd.read_csv(path, index_col=0, parse_dates=True)
+            except (ImportError, OSError, ValueError) as e:
+                print(f"Could not read {path}: {e}")
+                continue
+            
+            data.columns = [str(column).strip().title() for column in data.columns]
+            if any(column not in data.columns for column in BAR_COLUMNS):
+                print(f"{path} is missing OHLCV columns")
+                continue
+            
+            return data[BAR_COLUMNS].sort_index()
+        
+        return pd.DataFrame()
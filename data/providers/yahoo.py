@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from config.settings import DataConfig
+from data.bar_cache import BAR_COLUMNS
+from data.providers.base import DataProvider
+from data.rate_limiter import RateLimiter
+
+try:
+    import yfinance as yf
+except ImportError:  # Optional provider
+    yf = None
+
+# Roughly the same windows as Alpha Vantage's outputsize values
+PERIODS = {
+    'compact': '6mo',
+    'full': 'max'
+}
+
+class YFinanceProvider(DataProvider):
+    """Yahoo Finance via yfinance - downloads many tickers in one batched request"""
+    
+    supports_batch = True
+    
+    def __init__(self, config: DataConfig):
+        super().__init__("yfinance")
+        self.config = config
+        self.rate_limiter = RateLimiter(self.name, calls_per_minute=config.yfinance_calls_per_minute)
+    
+    def is_available(self) -> bool:
+        return yf is not None
+    
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        return self.fetch_many([symbol], timeframe, outputsize).get(symbol, pd.DataFrame())
+    
+    def fetch_many(self, symbols: List[str], timeframe: str = '1d', outputsize: str = 'compact') -> Dict[str, pd.DataFrame]:
+        if not symbols:
+            return {}
+        
+        if not self.rate_limiter.acquire(timeout=self.config.rate_limit_max_wait_seconds):
+            print("yfinance request quota exhausted")
+            return {}
+        
+        print(f"Downloading {len(symbols)} symbol(s) from yfinance in one request...")
+        try:
+            raw = yf.download(
+                symbols,
+                period=PERIODS.get(outputsize, PERIODS['compact']),
+                interval=timeframe,
+                group_by='ticker',
+                auto_adjust=False,  # Match Alpha Vantage's unadjusted TIME_SERIES_DAILY
+                threads=True,
+                progress=False
+            )
+        except Exception as e:
+            print(f"yfinance download error: {e}")
+            return {}
+        
+        if raw is None or raw.empty:
+            print("yfinance returned no data")
+            return {}
+        
+        result = {}
+        for symbol in symbols:
+            data = _extract_symbol(raw, symbol, single=len(symbols) == 1)
+            if data is not None and not data.empty:
+                result[symbol] = data
+        
+        print(f"yfinance returned data for {len(result)}/{len(symbols)} symbol(s)")
+        return result
+
+def _extract_symbol(raw: pd.DataFrame, symbol: str, single: bool):
+    """Pull one ticker's OHLCV out of a yf.download() frame"""
+    if isinstance(raw.columns, pd.MultiIndex):
+        if symbol in raw.columns.get_level_values(0):
+            frame = raw[symbol]
+        elif symbol in raw.columns.get_level_values(1):
+            frame = raw.xs(symbol, axis=1, level=1)
+        else:
+            return None
+    elif single:
+        frame = raw
+    else:
+        return None
+    
+    if any(column not in frame.columns for column in BAR_COLUMNS):
+        return None
+    
+    frame = frame[BAR_COLUMNS].dropna(subset=['Close'])
+    if frame.index.tz is not None:
+        frame.index = frame.index.tz_localize(None)
+    
+    return pd.DataFrame({
+        'Open': frame['Open'].to_numpy(dtype=np.float64),
+        'High': frame['High'].to_numpy(dtype=np.float64),
+        'Low': frame['Low'].to_numpy(dtype=np.float64),
+        'Close': frame['Close'].to_numpy(dtype=np.float64),
+        'Volume': frame['Volume'].fillna(0).to_numpy(dtype=np.int64)
+    }, index=pd.DatetimeIndex(frame.index))
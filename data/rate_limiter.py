@@ -0,0 +1,76 @@
+import threading
+import time
+from typing import Optional
+
+class TokenBucket:
+    """Classic token bucket: holds up to ``capacity`` tokens, refilled continuously"""
+    
+    def __init__(self, capacity: float, period_seconds: float):
+        self.capacity = float(capacity)
+        self.refill_rate = self.capacity / period_seconds  # tokens per second
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+    
+    def refill(self, now: float):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+            self.updated = now
+    
+    def wait_time(self) -> float:
+        """Seconds until one token is available (0 if available now)"""
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.refill_rate
+
+class RateLimiter:
+    """Thread-safe limiter for one data provider.
+    
+    Combines a per-minute and an optional per-day bucket; a call is only
+    allowed when every bucket has a token, and then consumes one from each.
+    Only real network requests should acquire - cache hits never touch it.
+    """
+    
+    def __init__(self, name: str, calls_per_minute: int, calls_per_day: Optional[int] = None):
+        self.name = name
+        self.buckets = [TokenBucket(calls_per_minute, 60)]
+        if calls_per_day:
+            self.buckets.append(TokenBucket(calls_per_day, 24 * 60 * 60))
+        self._lock = threading.Lock()
+    
+    def try_acquire(self) -> float:
+        """Take a token if one is available.
+        
+        Returns 0 on success, otherwise the number of seconds to wait.
+        """
+        with self._lock:
+            now = time.monotonic()
+            for bucket in self.buckets:
+                bucket.refill(now)
+            
+            wait = max(bucket.wait_time() for bucket in self.buckets)
+            if wait > 0:
+                return wait
+            
+            for bucket in self.buckets:
+                bucket.tokens -= 1
+            return 0.0
+    
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """Block until a token is available.
+        
+        Returns False if that would take longer than ``timeout`` seconds
+        (e.g. the daily quota is exhausted).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            wait = self.try_acquire()
+            if wait == 0:
+                return True
+            
+            if deadline is not None and time.monotonic() + wait > deadline:
+                return False
+            
+            print(f"{self.name} rate limit reached, waiting {wait:.1f}s...")
+            time.sleep(wait)
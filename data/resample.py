@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+# Higher timeframes built from the base bars: calendar periods for daily
+# data, fixed buckets (nanoseconds) for intraday data
+PERIOD_TIMEFRAMES = {'1wk', '1mo'}
+BUCKET_TIMEFRAMES = {'1h': 3_600_000_000_000, '4h': 14_400_000_000_000}
+
+NS_PER_DAY = 86_400_000_000_000
+
+def wall_clock_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """int64 nanosecond timestamps in the index's local time"""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[ns]', copy=False).view(np.int64)
+
+def timestamp_labels(timestamps: np.ndarray, timeframe: str) -> np.ndarray:
+    """``period_labels`` on int64 nanosecond wall-clock timestamps"""
+    if timeframe == '1wk':
+        # Weeks end on Friday; 1970-01-01 was a Thursday, so Saturdays land on multiples of 7
+        return (timestamps // NS_PER_DAY + 5) // 7
+    if timeframe == '1mo':
+        return timestamps.astype('datetime64[ns]').astype('datetime64[M]').astype(np.int64)
+    if timeframe in BUCKET_TIMEFRAMES:
+        return timestamps // BUCKET_TIMEFRAMES[timeframe]
+    raise ValueError(f"Unsupported higher timeframe: {timeframe}")
+
+def period_labels(index: pd.DatetimeIndex, timeframe: str) -> np.ndarray:
+    """Integer label of the higher-timeframe bar each base bar belongs to"""
+    return timestamp_labels(wall_clock_ns(index), timeframe)
+
+def period_starts(labels: np.ndarray) -> np.ndarray:
+    """Row positions where a new higher-timeframe bar begins (labels must be sorted)"""
+    if len(labels) == 0:
+        return np.zeros(0, dtype=np.int64)
+    return np.flatnonzero(np.concatenate(([True], labels[1:] != labels[:-1])))
+
+def period_closes(timestamps: np.ndarray, close: np.ndarray, timeframe: str) -> np.ndarray:
+    """Close of each higher-timeframe bar (the last one possibly still open).
+    
+    The ``Close`` column of ``resample_bars`` straight from arrays, for hot
+    paths that don't need the other columns or a frame.
+    """
+    if len(close) == 0:
+        return close[:0]
+    labels = timestamp_labels(timestamps, timeframe)
+    return close[np.append(np.flatnonzero(labels[1:] != labels[:-1]), len(close) - 1)]
+
+def resample_bars(data: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Aggregate OHLCV bars into ``timeframe`` bars.
+    
+    Each output bar is stamped with the time of the last base bar in it, so
+    the final (possibly still open) bar is as of the latest base bar.
+    """
+    if data.empty:
+        return data.iloc[0:0]
+    
+    starts = period_starts(period_labels(data.index, timeframe))
+    ends = np.concatenate((starts[1:], [len(data)])) - 1
+    
+    columns = {}
+    if 'Open' in data:
+        columns['Open'] = data['Open'].to_numpy()[starts]
+    if 'High' in data:
+        columns['High'] = np.maximum.reduceat(data['High'].to_numpy(), starts)
+    if 'Low' in data:
+        columns['Low'] = np.minimum.reduceat(data['Low'].to_numpy(), starts)
+    columns['Close'] = data['Close'].to_numpy()[ends]
+    if 'Volume' in data:
+        columns['Volume'] = np.add.reduceat(data['Volume'].to_numpy(), starts)
+    
+    return pd.DataFrame(columns, index=data.index[ends])
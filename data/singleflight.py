@@ -0,0 +1,54 @@
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    """Collapse concurrent requests for the same key into one call.
+    
+    The first caller for a key becomes the leader and does the work; callers
+    arriving while it is in flight get the leader's Future and share its
+    result (or exception). Futures can be awaited from asyncio code with
+    ``asyncio.wrap_future``.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+    
+    def acquire(self, key: Hashable) -> Tuple[Future, bool]:
+        """Return the Future for ``key`` and whether the caller is the leader"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future, False
+            
+            future = Future()
+            self._calls[key] = future
+            return future, True
+    
+    def complete(self, key: Hashable, result: Any = None, error: BaseException = None):
+        """Publish the leader's outcome and release the key"""
+        with self._lock:
+            future = self._calls.pop(key, None)
+        
+        if future is None:
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once per key at a time and return its result to every caller"""
+        future, leader = self.acquire(key)
+        if not leader:
+            return future.result()
+        
+        try:
+            result = fn()
+        except BaseException as e:
+            self.complete(key, error=e)
+            raise
+        
+        self.complete(key, result=result)
+        return result
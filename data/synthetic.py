@@ -0,0 +1,163 @@
+import json
+import zlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+# Base prices for different symbols
+BASE_PRICES = {
+    'SPY': 475.0,
+    'QQQ': 380.0,
+    'AAPL': 190.0,
+    'MSFT': 380.0
+}
+
+PANEL_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+def stable_seed(*parts: Union[str, int]) -> int:
+    """Seed derived from symbols/ints that is identical in every process.
+    
+    Python's hash() of a str is randomized per process (PYTHONHASHSEED), so it
+    cannot be used for reproducible data.
+    """
+    key = '|'.join(str(part) for part in parts).encode()
+    return zlib.crc32(key)
+
+class SyntheticMarketGenerator:
+    """Vectorized, deterministic OHLCV generator.
+    
+    Closes follow a geometric random walk with drift; returns across symbols
+    are correlated through a Cholesky factor of the correlation matrix. Each
+    random stream (returns, opens, wicks, volume) has its own generator, so
+    a series produced in chunks uses exactly the same random draws as one
+    produced in a single call.
+    """
+    
+    def __init__(self, symbols: Sequence[str], seed: int = 0,
+                 correlation: Union[float, np.ndarray] = 0.0,
+                 volatility: Union[float, Sequence[float]] = 0.015,
+                 drift: float = 0.0005,
+                 base_prices: Optional[Dict[str, float]] = None):
+        self.symbols = list(symbols)
+        n = len(self.symbols)
+        prices = base_prices or BASE_PRICES
+        
+        self.base_prices = np.array([prices.get(symbol, 100.0) for symbol in self.symbols])
+        self.volatility = np.broadcast_to(np.asarray(volatility, dtype=np.float64), (n,)).copy()
+        self.drift = drift
+        self.cholesky = np.linalg.cholesky(_correlation_matrix(correlation, n))
+        
+        streams = np.random.SeedSequence(stable_seed(seed, *self.symbols)).spawn(4)
+        self._returns_rng, self._open_rng, self._wick_rng, self._volume_rng = (
+            np.random.default_rng(stream) for stream in streams
+        )
+        
+        # State carried between chunks
+        self._last_close = self.base_prices.copy()
+        self._first_chunk = True
+    
+    def next_chunk(self, periods: int) -> Dict[str, np.ndarray]:
+        """Generate the next ``periods`` bars as (periods x symbols) arrays"""
+        n = len(self.symbols)
+        
+        shocks = self._returns_rng.standard_normal((periods, n)) @ self.cholesky.T
+        log_returns = self.drift + shocks * self.volatility
+        if self._first_chunk:
+            log_returns[0] = 0.0  # First close is the base price
+        
+        close = self._last_close * np.exp(np.cumsum(log_returns, axis=0))
+        
+        previous_close = np.vstack([self._last_close[np.newaxis, :], close[:-1]])
+        open_ = previous_close * (1 + self._open_rng.normal(0, 0.005, (periods, n)))
+        if self._first_chunk:
+            open_[0] = close[0]
+        
+        # 2% typical daily range, wicks on both sides of the body
+        wicks = np.abs(self._wick_rng.normal(0, 0.02 / 4, (periods, 2, n)))
+        high = np.maximum(np.maximum(open_, close), close * (1 + wicks[:, 0]))
+        low = np.minimum(np.minimum(open_, close), close * (1 - wicks[:, 1]))
+        
+        volume = self._volume_rng.integers(80_000_000, 200_000_000, (periods, n), dtype=np.int64)
+        
+        self._last_close = close[-1].copy()
+        self._first_chunk = False
+        
+        return {'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume}
+    
+    def generate(self, periods: int, end: Optional[pd.Timestamp] = None, freq: str = 'B') -> Dict[str, pd.DataFrame]:
+        """Generate a full in-memory panel: symbol -> OHLCV DataFrame"""
+        index = _bar_index(periods, end, freq)
+        chunk = self.next_chunk(periods)
+        
+        return {
+            symbol: pd.DataFrame({column: chunk[column][:, i] for column in PANEL_COLUMNS}, index=index)
+            for i, symbol in enumerate(self.symbols)
+        }
+    
+    def write(self, path: Union[str, Path], periods: int, end: Optional[pd.Timestamp] = None,
+              freq: str = 'B', chunk_size: int = 100_000) -> Path:
+        """Stream a panel to disk without holding it in memory.
+        
+        Writes one (periods x symbols) .npy file per column plus index.npy and
+        a manifest.json; use load_panel() to memory-map it back.
+        """
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        n = len(self.symbols)
+        
+        index = _bar_index(periods, end, freq)
+        np.save(path / 'index.npy', index.values.astype('datetime64[ns]').astype(np.int64))
+        
+        outputs = {
+            column: np.lib.format.open_memmap(
+                path / f'{column}.npy', mode='w+',
+                dtype=np.int64 if column == 'Volume' else np.float64,
+                shape=(periods, n)
+            )
+            for column in PANEL_COLUMNS
+        }
+        
+        for start in range(0, periods, chunk_size):
+            stop = min(start + chunk_size, periods)
+            chunk = self.next_chunk(stop - start)
+            for column, values in chunk.items():
+                outputs[column][start:stop] = values
+        
+        for values in outputs.values():
+            values.flush()
+        
+        with open(path / 'manifest.json', 'w') as f:
+            json.dump({'symbols': self.symbols, 'periods': periods, 'freq': freq, 'columns': PANEL_COLUMNS}, f, indent=2)
+        
+        return path
+
+def generate_ohlcv(symbol: str, periods: int = 100, end: Optional[pd.Timestamp] = None,
+                   freq: str = 'B', seed: int = 0) -> pd.DataFrame:
+    """Deterministic single-symbol OHLCV frame"""
+    return SyntheticMarketGenerator([symbol], seed=seed).generate(periods, end=end, freq=freq)[symbol]
+
+def load_panel(path: Union[str, Path]) -> Tuple[pd.DatetimeIndex, List[str], Dict[str, np.ndarray]]:
+    """Memory-map a panel written by SyntheticMarketGenerator.write()"""
+    path = Path(path)
+    with open(path / 'manifest.json', 'r') as f:
+        manifest = json.load(f)
+    
+    index = pd.DatetimeIndex(np.load(path / 'index.npy').astype('datetime64[ns]'))
+    columns = {column: np.load(path / f'{column}.npy', mmap_mode='r') for column in manifest['columns']}
+    return index, manifest['symbols'], columns
+
+def _correlation_matrix(correlation: Union[float, np.ndarray], n: int) -> np.ndarray:
+    if np.isscalar(correlation):
+        matrix = np.full((n, n), float(correlation))
+        np.fill_diagonal(matrix, 1.0)
+        return matrix
+    
+    matrix = np.asarray(correlation, dtype=np.float64)
+    if matrix.shape != (n, n):
+        raise ValueError(f"correlation matrix must be {n}x{n}, got {matrix.shape}")
+    return matrix
+
+def _bar_index(periods: int, end: Optional[pd.Timestamp], freq: str) -> pd.DatetimeIndex:
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp.now().normalize()
+    return pd.date_range(end=end, periods=periods, freq=freq)
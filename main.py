@@ -7,12 +7,13 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, List
 
-from config.settings import StrategyConfig, EmailConfig
+from config.settings import StrategyConfig, EmailConfig, ExecutionConfig
 from strategies.the_system import TheSystemStrategy
 from data.market_data import MarketDataFetcher
 from notifications.email_notifier import EmailNotifier
 from utils.market_hours import is_market_hours
 from strategies.base_strategy import Signal
+from utils.parallel import StrategyPool
 
 class StateManager:
     """Manages signal state to detect changes"""
@@ -33,8 +34,8 @@ class StateManager:
             print(f"Error loading state: {e}")
             return None
     
-    def save_current_state(self, signals: List[Signal]):
-        """Save current signal state"""
+    def save_current_state(self, signals: List[Signal], indicators: Optional[Dict] = None):
+        """Save current signal state (and each strategy's indicator state, if given)"""
         if not signals:
             state = {
                 'timestamp': datetime.now().isoformat(),
@@ -52,6 +53,8 @@ class StateManager:
                 'price': top_signal.current_price,
                 'action': top_signal.action
             }
+        if indicators:
+            state['indicators'] = indicators
         
         try:
             with open(self.state_file, 'w') as f:
@@ -127,10 +130,29 @@ class TradingSignalSystem:
         self.data_fetcher = MarketDataFetcher()
         self.email_notifier = EmailNotifier(email_config)
         self.state_manager = StateManager()
+        self.execution_config = ExecutionConfig()
         
         # Load enabled strategies
         if StrategyConfig.THE_SYSTEM['enabled']:
             self.strategies.append(TheSystemStrategy(StrategyConfig.THE_SYSTEM))
+        
+        self._restore_indicators()
+    
+    def _restore_indicators(self):
+        """Resume the running indicators where the previous run left them.
+        
+        State that can't be read (an older format, a damaged file) is
+        dropped and the indicators are rebuilt from history instead.
+        """
+        saved = (self.state_manager.load_last_state() or {}).get('indicators', {})
+        for strategy in self.strategies:
+            if strategy.name not in saved:
+                continue
+            try:
+                strategy.indicator_engine.restore(saved[strategy.name])
+            except (AttributeError, KeyError, ValueError, TypeError) as e:
+                print(f"Could not restore indicators for {strategy.name} ({e!r}), rebuilding from history")
+                strategy.indicator_engine.reset()
     
     def run_scan(self, force_notify: bool = False) -> List[Signal]:
         """Run scan and notify only on state changes"""
@@ -146,62 +168,20 @@ class TradingSignalSystem:
             print("Market closed - skipping scan")
             return []
         
-        all_signals = []
-        
-        # Run all strategies
-        for strategy in self.strategies:
-            try:
-                print(f"\nRunning strategy: {strategy.name}")
-                
-                # Get required data
-                data_req = strategy.get_required_data()
-                
-                if 'symbols' in data_req:
-                    symbols = data_req['symbols']
-                    print(f"Fetching data for: {', '.join(symbols)}")
-                    
-                    market_data = self.data_fetcher.get_data(
-                        symbols,
-                        data_req['timeframe'], 
-                        data_req['periods']
-                    )
-                    
-                    if not market_data or all(df.empty for df in market_data.values()):
-                        print(f"No data available for {strategy.name}")
-                        continue
-                    
-                    print(f"Data fetched: {', '.join([f'{s} ({len(d)} pts)' for s, d in market_data.items()])}")
-                    
-                    signals = strategy.analyze(market_data)
-                
-                else:
-                    print(f"Invalid data requirements for {strategy.name}")
-                    continue
-                
-                # Filter by confidence
-                min_confidence = strategy.config.get('min_confidence', 0)
-                valid_signals = [s for s in signals if s.confidence >= min_confidence]
-                
-                all_signals.extend(valid_signals)
-                
-                if valid_signals:
-                    print(f"\n✓ Generated {len(valid_signals)} signal(s):")
-                    for signal in valid_signals:
-                        print(f"  • {signal.signal_type}: {signal.confidence}% confidence")
-                        print(f"    Action: {signal.action}")
-                else:
-                    print(f"No signals met minimum confidence threshold ({min_confidence}%)")
-                
-            except Exception as e:
-                print(f"Error running {strategy.name}: {e}")
-                import traceback
-                traceback.print_exc()
+        if self.execution_config.parallel:
+            all_signals = self._run_parallel()
+        else:
+            all_signals = self._run_serial()
         
         # Check if state changed
         state_changed = self.state_manager.has_state_changed(all_signals) or force_notify
         
-        # Save current state
-        self.state_manager.save_current_state(all_signals)
+        # Save current state. Parallel workers advance their own copies of
+        # the indicators, so the ones here are stale and aren't saved
+        indicators = None if self.execution_config.parallel else {
+            strategy.name: strategy.indicator_engine.snapshot() for strategy in self.strategies
+        }
+        self.state_manager.save_current_state(all_signals, indicators)
         
         # Send notifications only if state changed
         if state_changed and all_signals:
@@ -223,6 +203,97 @@ class TradingSignalSystem:
             print("\nNo state change - skipping notification")
         
         return all_signals
+    
+    def _run_serial(self) -> List[Signal]:
+        """Fetch and analyze each strategy in turn"""
+        all_signals = []
+        
+        # Run all strategies
+        for strategy in self.strategies:
+            try:
+                print(f"\nRunning strategy: {strategy.name}")
+                
+                market_data = self._fetch_strategy_data(strategy)
+                if market_data is None:
+                    continue
+                
+                all_signals.extend(self._filter_signals(strategy, strategy.analyze(market_data)))
+            
+            except Exception as e:
+                print(f"Error running {strategy.name}: {e}")
+                import traceback
+                traceback.print_exc()
+        
+        return all_signals
+    
+    def _run_parallel(self) -> List[Signal]:
+        """Analyze strategies (and universe shards) across a process pool.
+        
+        Data is fetched here while earlier tasks are already being analyzed;
+        signals are merged in task order so the result doesn't depend on
+        which worker finished first.
+        """
+        config = self.execution_config
+        tasks = [shard for strategy in self.strategies for shard in strategy.shard(config.shard_size)]
+        print(f"\nRunning {len(tasks)} task(s) on {config.max_workers} worker(s)")
+        
+        all_signals = []
+        with StrategyPool(config.max_workers, config.task_timeout_seconds) as pool:
+            for task in tasks:
+                try:
+                    market_data = self._fetch_strategy_data(task)
+                except Exception as e:
+                    print(f"Error fetching data for {task.task_name}: {e}")
+                    continue
+                
+                if market_data is not None:
+                    pool.submit(task, market_data)
+            
+            for task, signals in pool.results():
+                if signals is not None:
+                    all_signals.extend(self._filter_signals(task, signals))
+        
+        return all_signals
+    
+    def _fetch_strategy_data(self, strategy) -> Optional[Dict]:
+        """Fetch the data a strategy asks for, or None if there is nothing to analyze"""
+        # Get required data
+        data_req = strategy.get_required_data()
+        
+        if 'symbols' not in data_req:
+            print(f"Invalid data requirements for {strategy.name}")
+            return None
+        
+        symbols = data_req['symbols']
+        print(f"Fetching data for: {', '.join(symbols)}")
+        
+        market_data = self.data_fetcher.get_data(
+            symbols,
+            data_req['timeframe'], 
+            data_req['periods']
+        )
+        
+        if not market_data or all(df.empty for df in market_data.values()):
+            print(f"No data available for {strategy.name}")
+            return None
+        
+        print(f"Data fetched: {', '.join([f'{s} ({len(d)} pts)' for s, d in market_data.items()])}")
+        return market_data
+    
+    def _filter_signals(self, strategy, signals: List[Signal]) -> List[Signal]:
+        # Filter by confidence
+        min_confidence = strategy.config.get('min_confidence', 0)
+        valid_signals = [s for s in signals if s.confidence >= min_confidence]
+        
+        if valid_signals:
+            print(f"\n✓ Generated {len(valid_signals)} signal(s):")
+            for signal in valid_signals:
+                print(f"  • {signal.signal_type}: {signal.confidence}% confidence")
+                print(f"    Action: {signal.action}")
+        else:
+            print(f"No signals met minimum confidence threshold ({min_confidence}%)")
+        
+        return valid_signals
 
 def main():
     """Main entry point"""
@@ -25,11 +25,20 @@ class BaseStrategy(ABC):
         self.name = name
         self.config = config
         self.enabled = config.get('enabled', True)
-        
+    
     @abstractmethod
     def analyze(self, data: pd.DataFrame) -> List[Signal]:
         pass
     
     @abstractmethod
     def get_required_data(self) -> Dict:
-        pass
\ No newline at end of file
+        pass
+    
+    @property
+    def task_name(self) -> str:
+        """How pools and logs refer to this task (shards say which part they cover)"""
+        return self.name
+    
+    def shard(self, shard_size: int) -> List['BaseStrategy']:
+        """Split into independent tasks that can run in parallel (default: one)"""
+        return [self]
\ No newline at end of file
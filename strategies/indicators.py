@@ -0,0 +1,517 @@
+import math
+import threading
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Tuple
+from data.resample import wall_clock_ns
+
+class RollingMean:
+    """Streaming equivalent of ``Series.rolling(window).mean()``.
+    
+    Keeps a ring buffer of the last ``window`` values and a compensated
+    (Kahan) running sum, mirroring pandas' own add/remove algorithm so the
+    output matches it bit for bit. Each update is O(1).
+    """
+    
+    def __init__(self, window: int):
+        self.window = window
+        self.buffer = [math.nan] * window
+        self.position = 0  # Slot the next value goes into
+        self.count = 0     # Values seen so far
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.num_consecutive_same_value = 0
+        self.prev_value = math.nan
+        self._undo = None
+    
+    def update(self, value: float) -> float:
+        value = float(value)
+        evicted = self.buffer[self.position]
+        self._undo = self._scalars() + (evicted,)
+        
+        # Drop the value leaving the window first, then add the new one
+        if self.count >= self.window and evicted == evicted:
+            self.nobs -= 1
+            y = -evicted - self.compensation_remove
+            t = self.sum_x + y
+            self.compensation_remove = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, evicted) < 0:
+                self.neg_ct -= 1
+        
+        if value == value:
+            self.nobs += 1
+            y = value - self.compensation_add
+            t = self.sum_x + y
+            self.compensation_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, value) < 0:
+                self.neg_ct += 1
+            
+            # pandas snaps runs of identical values to avoid float artifacts
+            if value == self.prev_value:
+                self.num_consecutive_same_value += 1
+            else:
+                self.num_consecutive_same_value = 1
+            self.prev_value = value
+        
+        self.buffer[self.position] = value
+        self.position = (self.position + 1) % self.window
+        self.count += 1
+        return self.value
+    
+    def revert(self):
+        """Undo the most recent update (one level only)"""
+        if self._undo is None:
+            raise RuntimeError("Nothing to revert")
+        
+        *scalars, evicted = self._undo
+        (self.position, self.count, self.nobs, self.neg_ct, self.sum_x, self.compensation_add,
+         self.compensation_remove, self.num_consecutive_same_value, self.prev_value) = scalars
+        self.buffer[self.position] = evicted
+        self._undo = None
+    
+    @property
+    def value(self) -> float:
+        if self.nobs < self.window:
+            return math.nan
+        
+        result = self.sum_x / self.nobs
+        if self.num_consecutive_same_value >= self.nobs:
+            return self.prev_value
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+    
+    def get_state(self) -> Dict:
+        return {'kind': 'sma', 'window': self.window, 'buffer': list(self.buffer), 'scalars': list(self._scalars()),
+                'undo': list(self._undo) if self._undo is not None else None}
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'RollingMean':
+        indicator = cls(state['window'])
+        indicator.buffer = [float(value) for value in state['buffer']]
+        (indicator.position, indicator.count, indicator.nobs, indicator.neg_ct, indicator.sum_x,
+         indicator.compensation_add, indicator.compensation_remove, indicator.num_consecutive_same_value,
+         indicator.prev_value) = state['scalars']
+        indicator._undo = tuple(state['undo']) if state.get('undo') is not None else None
+        return indicator
+    
+    def _scalars(self) -> Tuple:
+        return (self.position, self.count, self.nobs, self.neg_ct, self.sum_x, self.compensation_add,
+                self.compensation_remove, self.num_consecutive_same_value, self.prev_value)
+
+class ExponentialMean:
+    """Streaming equivalent of ``Series.ewm(span=span).mean()`` (adjust=True).
+    
+    Holds only the last weighted value and the accumulated weight of the
+    history, following pandas' recursion step for step.
+    """
+    
+    def __init__(self, span: int):
+        self.span = span
+        com = (span - 1) / 2
+        self.alpha = 1.0 / (1.0 + com)
+        self.weighted = math.nan
+        self.old_wt = 1.0
+        self.nobs = 0
+        self._undo = None
+    
+    def update(self, value: float) -> float:
+        value = float(value)
+        self._undo = (self.weighted, self.old_wt, self.nobs)
+        is_observation = value == value
+        
+        if self.nobs == 0 and self.weighted != self.weighted:
+            # First bar (or only NaNs so far) seeds the average
+            self.weighted = value
+            self.old_wt = 1.0
+        elif self.weighted == self.weighted:
+            self.old_wt *= 1.0 - self.alpha
+            if is_observation and self.weighted != value:
+                self.weighted = (self.old_wt * self.weighted + value) / (self.old_wt + 1.0)
+                self.old_wt += 1.0
+        elif is_observation:
+            self.weighted = value
+        
+        self.nobs += is_observation
+        return self.value
+    
+    def revert(self):
+        """Undo the most recent update (one level only)"""
+        if self._undo is None:
+            raise RuntimeError("Nothing to revert")
+        self.weighted, self.old_wt, self.nobs = self._undo
+        self._undo = None
+    
+    @property
+    def value(self) -> float:
+        return self.weighted if self.nobs >= 1 else math.nan
+    
+    def get_state(self) -> Dict:
+        return {'kind': 'ema', 'span': self.span, 'weighted': self.weighted, 'old_wt': self.old_wt, 'nobs': self.nobs,
+                'undo': list(self._undo) if self._undo is not None else None}
+    
+    @classmethod
+    def from_state(cls, state: Dict) -> 'ExponentialMean':
+        indicator = cls(state['span'])
+        indicator.weighted = float(state['weighted'])
+        indicator.old_wt = float(state['old_wt'])
+        indicator.nobs = int(state['nobs'])
+        if state.get('undo') is not None:
+            weighted, old_wt, nobs = state['undo']
+            indicator._undo = (float(weighted), float(old_wt), int(nobs))
+        return indicator
+
+def _narrow(panel: np.ndarray) -> bool:
+    """Long, narrow panels are faster through pandas' per-column kernels;
+    wide ones are faster stepping through time across all columns at once"""
+    return panel.shape[1] * 2 < len(panel)
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """``rolling(window).mean()`` over the rows of a 1D or (time x symbol) array.
+    
+    Runs RollingMean's algorithm for all columns at once, stepping through
+    time with vector operations, so each column matches pandas bit for bit
+    without pandas' per-column overhead.
+    """
+    panel = values.reshape(len(values), -1).astype(np.float64, copy=False)
+    if _narrow(panel):
+        return pd.DataFrame(panel).rolling(window=window).mean().to_numpy().reshape(values.shape)
+    
+    columns = panel.shape[1]
+    output = np.full(panel.shape, np.nan)
+    
+    nobs = np.zeros(columns, dtype=np.int64)
+    neg_ct = np.zeros(columns, dtype=np.int64)
+    sum_x = np.zeros(columns)
+    compensation_add = np.zeros(columns)
+    compensation_remove = np.zeros(columns)
+    num_consecutive_same_value = np.zeros(columns, dtype=np.int64)
+    prev_value = np.full(columns, np.nan)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        for i in range(len(panel)):
+            if i >= window:
+                value = panel[i - window]
+                valid = value == value
+                y = -value - compensation_remove
+                t = sum_x + y
+                compensation_remove = np.where(valid, t - sum_x - y, compensation_remove)
+                sum_x = np.where(valid, t, sum_x)
+                nobs -= valid
+                neg_ct -= valid & np.signbit(value)
+            
+            value = panel[i]
+            valid = value == value
+            y = value - compensation_add
+            t = sum_x + y
+            compensation_add = np.where(valid, t - sum_x - y, compensation_add)
+            sum_x = np.where(valid, t, sum_x)
+            nobs += valid
+            neg_ct += valid & np.signbit(value)
+            num_consecutive_same_value = np.where(
+                valid, np.where(value == prev_value, num_consecutive_same_value + 1, 1), num_consecutive_same_value
+            )
+            prev_value = np.where(valid, value, prev_value)
+            
+            result = sum_x / nobs
+            result = np.where(num_consecutive_same_value >= nobs, prev_value,
+                              np.where((neg_ct == 0) & (result < 0), 0.0,
+                                       np.where((neg_ct == nobs) & (result > 0), 0.0, result)))
+            output[i] = np.where(nobs >= window, result, np.nan)
+    
+    return output.reshape(values.shape)
+
+def ewm_mean(values: np.ndarray, span: int) -> np.ndarray:
+    """``ewm(span=span).mean()`` over the rows of a 1D or (time x symbol) array.
+    
+    The vectorized counterpart of ExponentialMean; matches pandas bit for bit.
+    """
+    panel = values.reshape(len(values), -1).astype(np.float64, copy=False)
+    if len(panel) == 0 or _narrow(panel):
+        return pd.DataFrame(panel).ewm(span=span).mean().to_numpy().reshape(values.shape)
+    
+    output = np.full(panel.shape, np.nan)
+    
+    old_wt_factor = 1.0 - 1.0 / (1.0 + (span - 1) / 2)
+    weighted = panel[0].copy()
+    old_wt = np.ones(panel.shape[1])
+    nobs = (weighted == weighted).astype(np.int64)
+    output[0] = np.where(nobs >= 1, weighted, np.nan)
+    
+    for i in range(1, len(panel)):
+        value = panel[i]
+        is_observation = value == value
+        nobs += is_observation
+        
+        has_weighted = weighted == weighted
+        old_wt = np.where(has_weighted, old_wt * old_wt_factor, old_wt)
+        blend = has_weighted & is_observation & (weighted != value)
+        blended = (old_wt * weighted + value) / (old_wt + 1.0)
+        weighted = np.where(blend, blended, np.where(~has_weighted & is_observation, value, weighted))
+        old_wt = np.where(blend, old_wt + 1.0, old_wt)
+        output[i] = np.where(nobs >= 1, weighted, np.nan)
+    
+    return output.reshape(values.shape)
+
+def window_mean(windows: np.ndarray) -> np.ndarray:
+    """Mean over the last axis, summed strictly oldest to newest.
+    
+    A fixed summation order gives identical results whether the windows
+    come one at a time from the live scan or stacked from a whole history.
+    """
+    total = windows[..., 0]
+    for k in range(1, windows.shape[-1]):
+        total = total + windows[..., k]
+    return total / windows.shape[-1]
+
+INDICATOR_TYPES = {'sma': RollingMean, 'ema': ExponentialMean}
+INDICATOR_FUNCTIONS = {'sma': rolling_mean, 'ema': ewm_mean}
+
+class IndicatorStore:
+    """Memoized indicators shared by every strategy and helper.
+    
+    Full series are keyed by symbol (a tuple of symbols for a close panel),
+    indicator and parameters, and remember the bars they were computed
+    over - shape, first and last timestamp and the first and last row,
+    since the open daily bar changes intraday. Asking again for the same
+    bars returns the cached arrays; a new or revised bar replaces the entry,
+    so each series is computed once per bar however many consumers ask.
+    Returned arrays are read-only because they are shared.
+    
+    Running (incremental) state lives here too: ``engine`` hands every
+    strategy with the same indicator specs the same ``IndicatorEngine``,
+    whose state is kept per symbol.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[Tuple, Tuple[Tuple, object]] = {}
+        self._engines: Dict[Tuple, 'IndicatorEngine'] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, symbol: str, data: pd.DataFrame, indicator: str, period: int, column: str = 'Close') -> np.ndarray:
+        values = data[column].to_numpy(dtype=np.float64)
+        return self.memoize((symbol, indicator, period, column), data.index, values,
+                            lambda: INDICATOR_FUNCTIONS[indicator](values, period))
+    
+    def series(self, symbol: str, data: pd.DataFrame, indicator: str, period: int, column: str = 'Close') -> pd.Series:
+        return pd.Series(self.get(symbol, data, indicator, period, column), index=data.index,
+                         name=f"{indicator.upper()}_{period}")
+    
+    def memoize(self, key: Tuple, index: pd.Index, values: np.ndarray, compute: Callable):
+        """``compute()`` (arrays derived from ``values`` on ``index``), cached under ``key``.
+        
+        ``key`` starts with the symbol or tuple of symbols ``values`` holds,
+        followed by whatever identifies the computation.
+        """
+        bars = _bars(index, values)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and _same_bars(entry[0], bars):
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        
+        result = compute()
+        for array in (result if isinstance(result, tuple) else (result,)):
+            array.flags.writeable = False
+        with self._lock:
+            self._entries[key] = (bars, result)
+        return result
+    
+    def engine(self, specs: Dict[str, Tuple[str, int]]) -> 'IndicatorEngine':
+        """The running-state engine for ``specs``, shared by everyone asking for the same ones"""
+        key = tuple(sorted(specs.items()))
+        with self._lock:
+            if key not in self._engines:
+                self._engines[key] = IndicatorEngine(specs)
+            return self._engines[key]
+    
+    def clear(self, symbol: Optional[str] = None):
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries = {
+                    key: entry for key, entry in self._entries.items()
+                    if key[0] != symbol and not (isinstance(key[0], tuple) and symbol in key[0])
+                }
+            for engine in self._engines.values():
+                engine.reset(symbol)
+    
+    def __getstate__(self):
+        # Copies sent to worker processes start empty
+        return {}
+    
+    def __setstate__(self, state):
+        self.__init__()
+
+def _bars(index: pd.Index, values: np.ndarray) -> Tuple:
+    if not len(values):
+        return (values.shape,)
+    return (values.shape, index[0], index[-1], values[0], values[-1])
+
+def _same_bars(a: Tuple, b: Tuple) -> bool:
+    return a[:3] == b[:3] and all(np.array_equal(x, y, equal_nan=True) for x, y in zip(a[3:], b[3:]))
+
+# pandas 3 always copies lazily on write; earlier versions need copy=False to share arrays
+COPY_ON_WRITE = int(pd.__version__.split('.')[0]) >= 3
+
+def with_columns(data: pd.DataFrame, columns: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """``data`` plus derived float64 columns, leaving ``data`` untouched.
+    
+    The base columns are not copied: the result shares their arrays, so
+    strategies can attach indicators to cached bars cheaply and safely.
+    """
+    derived = pd.DataFrame(
+        {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}, index=data.index
+    )
+    if COPY_ON_WRITE:
+        return pd.concat([data, derived], axis=1)
+    return pd.concat([data, derived], axis=1, copy=False)
+
+# Default store shared by all strategies in the process
+SHARED_INDICATOR_STORE = IndicatorStore()
+
+def _same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+class _SymbolState:
+    def __init__(self, specs: Dict[str, Tuple[str, int]]):
+        self.indicators = {name: INDICATOR_TYPES[kind](period) for name, (kind, period) in specs.items()}
+        self.last_timestamp: Optional[int] = None  # Wall-clock nanoseconds
+        self.last_close = math.nan
+        self.previous_close = math.nan
+        self.values: Dict[str, float] = {name: math.nan for name in specs}
+        self.previous: Dict[str, float] = dict(self.values)
+        self.can_revert = False
+    
+    def push(self, close: float):
+        self.previous = self.values
+        self.values = {name: indicator.update(close) for name, indicator in self.indicators.items()}
+        self.previous_close = self.last_close
+        self.last_close = close
+        self.can_revert = True
+    
+    def revert(self):
+        for indicator in self.indicators.values():
+            indicator.revert()
+        self.values = self.previous
+        self.last_close = self.previous_close
+        self.can_revert = False
+
+class IndicatorEngine:
+    """Per-symbol running indicator state, advanced one bar at a time.
+    
+    ``update`` is handed the latest bars on every scan and only feeds the
+    ones it has not seen yet, so a scan with one new bar costs O(1) per
+    indicator instead of a full ``rolling``/``ewm`` pass over the history.
+    A revised last bar (the still-open daily bar during market hours) is
+    handled by undoing it and re-applying the new close. If the bars no
+    longer line up with the state the symbol is rebuilt from scratch.
+    
+    specs map an output name to ``('sma', window)`` or ``('ema', span)``.
+    """
+    
+    def __init__(self, specs: Dict[str, Tuple[str, int]]):
+        self.specs = dict(specs)
+        self._states: Dict[str, _SymbolState] = {}
+    
+    def update(self, symbol: str, data: pd.DataFrame, column: str = 'Close') -> Dict[str, float]:
+        """Feed any new bars of ``data`` and return the latest indicator values"""
+        return self.update_arrays(symbol, wall_clock_ns(data.index), data[column].to_numpy(dtype=np.float64))
+    
+    def update_arrays(self, symbol: str, timestamps: np.ndarray, closes: np.ndarray) -> Dict[str, float]:
+        """``update`` on plain arrays: int64 nanosecond timestamps and float64 closes"""
+        state = self._states.get(symbol)
+        start = 0
+        
+        if state is not None and state.last_timestamp is not None:
+            position = int(np.searchsorted(timestamps, state.last_timestamp))
+            if position < len(timestamps) and timestamps[position] == state.last_timestamp:
+                start = position + 1
+                if not _same(closes[position], state.last_close):
+                    # Only the last bar may be revised; anything else means different data
+                    if state.can_revert and position > 0 and _same(closes[position - 1], state.previous_close):
+                        state.revert()
+                        start = position
+                    else:
+                        state = None
+            else:
+                state = None
+        
+        if state is None:
+            state = _SymbolState(self.specs)
+            self._states[symbol] = state
+            start = 0
+        
+        for close in closes[start:].tolist():
+            state.push(close)
+        if start < len(closes):
+            state.last_timestamp = int(timestamps[-1])
+        
+        return dict(state.values)
+    
+    def latest(self, symbol: str) -> Dict[str, float]:
+        return dict(self._states[symbol].values)
+    
+    def previous(self, symbol: str) -> Dict[str, float]:
+        """Indicator values as of the bar before the latest one"""
+        return dict(self._states[symbol].previous)
+    
+    def reset(self, symbol: Optional[str] = None):
+        if symbol is None:
+            self._states.clear()
+        else:
+            self._states.pop(symbol, None)
+    
+    def snapshot(self) -> Dict:
+        """JSON-serializable copy of every symbol's state"""
+        return {
+            symbol: {
+                'last_timestamp': pd.Timestamp(state.last_timestamp).isoformat() if state.last_timestamp is not None else None,
+                'last_close': state.last_close,
+                'previous_close': state.previous_close,
+                'values': state.values,
+                'previous': state.previous,
+                'can_revert': state.can_revert,
+                'indicators': {name: indicator.get_state() for name, indicator in state.indicators.items()}
+            }
+            for symbol, state in self._states.items()
+        }
+    
+    def restore(self, snapshot: Dict):
+        """Load state produced by ``snapshot`` (e.g. from the previous run).
+        
+        Symbols saved with different indicator specs are skipped and will be
+        rebuilt from scratch on their next update.
+        """
+        self._states = {}
+        for symbol, saved in snapshot.items():
+            if not self._same_specs(saved['indicators']):
+                continue
+            state = _SymbolState(self.specs)
+            state.indicators = {
+                name: INDICATOR_TYPES[indicator['kind']].from_state(indicator)
+                for name, indicator in saved['indicators'].items()
+            }
+            state.last_timestamp = int(wall_clock_ns(pd.DatetimeIndex([saved['last_timestamp']]))[0]) if saved['last_timestamp'] else None
+            state.last_close = float(saved['last_close'])
+            state.previous_close = float(saved['previous_close'])
+            state.values = {name: float(value) for name, value in saved['values'].items()}
+            state.previous = {name: float(value) for name, value in saved['previous'].items()}
+            state.can_revert = bool(saved.get('can_revert', False))
+            self._states[symbol] = state
+    
+    def _same_specs(self, indicators: Dict) -> bool:
+        saved = {name: (indicator['kind'], indicator['window'] if indicator['kind'] == 'sma' else indicator['span'])
+                 for name, indicator in indicators.items()}
+        return saved == {name: (kind, period) for name, (kind, period) in self.specs.items()}
@@ -1,14 +1,21 @@
 # strategies/the_system.py - Enhanced version with all missing elements
+import math
 import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from .base_strategy import BaseStrategy, Signal
+from data.events import EventCalendar, load_calendar
+from data.resample import period_closes, period_labels, period_starts, wall_clock_ns
+from .indicators import SHARED_INDICATOR_STORE, IndicatorStore, ewm_mean, rolling_mean, window_mean, with_columns
 
 class TheSystemStrategy(BaseStrategy):
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, indicator_store: Optional[IndicatorStore] = None):
         super().__init__("The System", config)
         
+        # Indicators shared with other strategies and helpers
+        self.indicator_store = indicator_store or SHARED_INDICATOR_STORE
+        
         # Moving average periods
         self.sma_10 = config.get('sma_10_period', 10)
         self.sma_50 = config.get('sma_50_period', 50)
@@ -16,6 +23,15 @@ class TheSystemStrategy(BaseStrategy):
         self.ema_9 = config.get('ema_9_period', 9)
         self.ema_21 = config.get('ema_21_period', 21)
         
+        # Running MA state per symbol, so each scan only processes new bars
+        self.indicator_engine = self.indicator_store.engine({
+            'SMA_10': ('sma', self.sma_10),
+            'SMA_50': ('sma', self.sma_50),
+            'SMA_200': ('sma', self.sma_200),
+            'EMA_9': ('ema', self.ema_9),
+            'EMA_21': ('ema', self.ema_21)
+        })
+        
         # Thresholds
         self.oversold_threshold = config.get('oversold_threshold', -3.0)
         self.overbought_threshold = config.get('overbought_threshold', 3.0)
@@ -24,25 +40,52 @@ class TheSystemStrategy(BaseStrategy):
         self.nasdaq_weight = config.get('nasdaq_confirmation_weight', 0.3)
         self.nasdaq_lookback = config.get('nasdaq_lookback_days', 5)
         
-        # Fed calendar (simplified - in production could use economic calendar API)
-        self.fed_blackout_dates = self._get_fed_calendar()
+        # FOMC decision dates from the economic calendar file
+        self.fed_warning_days = config.get('fed_warning_days', 2)
+        self.fed_calendar = self._get_fed_calendar(config)
         
         # Higher timeframe settings
         self.check_higher_timeframes = config.get('check_higher_timeframes', True)
+        self.higher_timeframe = config.get('higher_timeframe', '1wk')
+        self.htf_fast_period = config.get('htf_fast_period', 4)   # ~20 daily bars
+        self.htf_slow_period = config.get('htf_slow_period', 20)  # ~100 daily bars
         
+        # Universe mode: scan every listed symbol instead of SPY alone
+        self.universe = list(config.get('universe') or [])
+    
     def get_required_data(self) -> Dict:
+        symbols = ['SPY', 'QQQ']  # SPY for signals, QQQ for NASDAQ analysis
+        if self.universe:
+            symbols = list(dict.fromkeys(self.universe + ['QQQ']))
+        
         return {
-            'symbols': ['SPY', 'QQQ'],  # SPY for signals, QQQ for NASDAQ analysis
+            'symbols': symbols,
             'timeframe': self.config['timeframe'],
             'periods': max(self.sma_200, 100) + 20  # Ensure enough data for 200SMA
         }
     
-    def debug_analysis(self, spy_data, nasdaq_data):
+    @property
+    def task_name(self) -> str:
+        if not self.universe:
+            return self.name
+        return f"{self.name} [{self.universe[0]}..{self.universe[-1]}, {len(self.universe)} symbols]"
+    
+    def shard(self, shard_size: int) -> List['TheSystemStrategy']:
+        """Split a large universe into strategies over consecutive slices of it"""
+        if len(self.universe) <= shard_size:
+            return [self]
+        
+        return [
+            TheSystemStrategy(dict(self.config, universe=self.universe[start:start + shard_size]), self.indicator_store)
+            for start in range(0, len(self.universe), shard_size)
+        ]
+    
+    def debug_analysis(self, spy_data, nasdaq_data, market_state=None):
         """Debug function to see why no signals are generated"""
         
         # Calculate basic state
-        spy_data = self._calculate_all_moving_averages(spy_data)
-        market_state = self._analyze_current_market_state(spy_data, nasdaq_data)
+        if market_state is None:
+            market_state = self._analyze_current_market_state(spy_data, nasdaq_data)
         
         print("\nDEBUG - Market State Analysis:")
         print(f"  Current price: ${market_state['current_price']:.2f}")
@@ -64,14 +107,21 @@ class TheSystemStrategy(BaseStrategy):
         print(f"  Confidence modifier: {nasdaq_analysis['confidence_modifier']}")
         print(f"  Note: {nasdaq_analysis['note']}")
     
-    def analyze(self, data: Dict[str, pd.DataFrame]) -> List[Signal]:
-        """Enhanced analysis incorporating all System elements"""
+    def analyze(self, data: Dict[str, pd.DataFrame], as_of: Optional[datetime] = None) -> List[Signal]:
+        """Enhanced analysis incorporating all System elements.
+        
+        ``as_of`` replays the analysis as if run at that time (Fed warnings
+        and signal timestamps); it defaults to now.
+        """
+        if self.universe:
+            return self.analyze_universe(data, as_of)
+        
         spy_data = data.get('SPY')
         nasdaq_data = data.get('QQQ')  # Using QQQ as NASDAQ proxy
         
         if spy_data is None or spy_data.empty:
             return []
-            
+        
         # Check minimum data requirements - need at least 50 periods for basic analysis
         min_required = max(self.sma_50, 50)
         if len(spy_data) < min_required:
@@ -79,18 +129,17 @@ class TheSystemStrategy(BaseStrategy):
             return []
         
         # Check for Fed event (flag but don't block)
-        fed_warning = self._get_fed_warning()
+        fed_warning = self._get_fed_warning(as_of)
         
         signals = []
         
-        # Calculate all moving averages
-        spy_data = self._calculate_all_moving_averages(spy_data)
-        
-        # Get current market state
+        # Get current market state (moving averages are updated incrementally)
         market_state = self._analyze_current_market_state(spy_data, nasdaq_data)
+        market_state['symbol'] = 'SPY'
+        market_state['timestamp'] = as_of or datetime.now()
         
         ##FOR DEBUGGING PURPOSES##
-        self.debug_analysis(spy_data, nasdaq_data)
+        self.debug_analysis(spy_data, nasdaq_data, market_state)
         
         # Generate signals based on comprehensive analysis
         signals.extend(self._check_crossover_signals(spy_data, market_state, fed_warning))
@@ -99,36 +148,370 @@ class TheSystemStrategy(BaseStrategy):
         
         return signals
     
-    def _calculate_all_moving_averages(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Calculate all required moving averages"""
-        # Simple Moving Averages
-        data['SMA_10'] = data['Close'].rolling(window=self.sma_10).mean()
-        data['SMA_50'] = data['Close'].rolling(window=self.sma_50).mean()
+    def evaluate_history(self, spy_data: pd.DataFrame, nasdaq_data: Optional[pd.DataFrame] = None,
+                         symbol: str = 'SPY') -> pd.DataFrame:
+        """Evaluate every bar of the history in one vectorized pass.
+        
+        Row i holds the market state, signal conditions and confidences that
+        ``analyze()`` computes when handed the bars up to and including i
+        (QQQ as of that date). Rows before the minimum history have no
+        signals. Useful on its own for backtests and parameter research.
+        
+        Moving averages go through the indicator store under ``symbol``, so
+        strategies with different parameters but shared periods compute
+        each series once per history.
+        """
+        close = spy_data['Close'].to_numpy(dtype=np.float64)[:, None]
+        panel = self._evaluate_panel(close, spy_data.index, nasdaq_data, (symbol,))
+        
+        history = pd.DataFrame({name: values[:, 0] for name, values in panel.items()}, index=spy_data.index)
+        history['fed_days'] = self.fed_calendar.days_to_nearest(spy_data.index)
+        return history
+    
+    def _evaluate_panel(self, close: np.ndarray, index: pd.DatetimeIndex, nasdaq_data: Optional[pd.DataFrame] = None,
+                        symbols: Tuple[str, ...] = ('SPY',)) -> Dict[str, np.ndarray]:
+        """Vectorized core of the strategy over a (time x symbol) close panel.
+        
+        Every column is treated the way ``analyze()`` treats SPY, so a single
+        column reproduces the live scan exactly. A column may start later
+        than the panel (NaN before its first bar); its history length is
+        counted from there. Returns a dict of (time x symbol) arrays.
+        
+        ``symbols`` names the columns; moving averages are memoized in the
+        indicator store under them.
+        """
+        n = close.shape[0]
+        
+        # History length each row's analysis would see, per symbol
+        first_bar = np.argmax(~np.isnan(close), axis=0)
+        bars = np.arange(1, n + 1)[:, None] - first_bar[None, :]
+        
+        def shifted(values):
+            return np.concatenate((np.full((1, values.shape[1]), np.nan), values[:-1]))
+        
+        def memoized(key, compute):
+            return self.indicator_store.memoize((symbols,) + key, index, close, compute)
+        
+        sma_10, sma_50, sma_200 = (memoized(('sma', window), lambda: rolling_mean(close, window))
+                                   for window in (self.sma_10, self.sma_50, self.sma_200))
+        ema_9, ema_21 = (memoized(('ema', span), lambda: ewm_mean(close, span)) for span in (self.ema_9, self.ema_21))
+        prev_sma_10, prev_sma_50 = shifted(sma_10), shifted(sma_50)
+        
+        distance_50sma = ((close - sma_50) / sma_50) * 100
+        has_sma_200 = ~np.isnan(sma_200)
+        distance_200sma = ((close - sma_200) / sma_200) * 100
+        sma_bullish = sma_10 > sma_50
+        ema_bullish = ema_9 > ema_21
+        ema_bearish = ema_9 < ema_21
+        
+        # NASDAQ leadership over the last N bars of each series, QQQ taken as of each date
+        lookback = self.nasdaq_lookback
+        relative_strength = np.zeros(close.shape)
+        spy_return = np.full(close.shape, np.nan)
+        nasdaq_return = np.full(close.shape, np.nan)
+        nasdaq_known = np.zeros(close.shape, dtype=bool)
+        if nasdaq_data is not None and not nasdaq_data.empty:
+            nasdaq_close = nasdaq_data['Close'].to_numpy(dtype=np.float64)
+            available = nasdaq_data.index.searchsorted(index, side='right')
+            nasdaq_known = (available[:, None] >= lookback) & (bars >= lookback)
+            
+            rows, columns = np.nonzero(nasdaq_known)
+            spy_return[rows, columns] = (close[rows, columns] - close[rows - lookback + 1, columns]) / close[rows - lookback + 1, columns]
+            last = available[rows] - 1
+            nasdaq_return[rows, columns] = (nasdaq_close[last] - nasdaq_close[last - lookback + 1]) / nasdaq_close[last - lookback + 1]
+            relative_strength[rows, columns] = nasdaq_return[rows, columns] - spy_return[rows, columns]
+        
+        nasdaq_leading = nasdaq_known & (relative_strength > 0.005)
+        nasdaq_lagging = nasdaq_known & (relative_strength < -0.005)
+        confidence_modifier = np.where(nasdaq_leading, 0.2, np.where(nasdaq_lagging, -0.2, 0))
+        
+        # Higher timeframe context
+        long_ma_10, long_ma_50, htf_bars = memoized(
+            ('htf', self.higher_timeframe, self.htf_fast_period, self.htf_slow_period),
+            lambda: self._higher_timeframe_means(close, index, first_bar)
+        )
+        contexts = np.array(['insufficient_data', 'strong_bullish', 'bullish', 'strong_bearish', 'bearish', 'mixed'], dtype=object)
+        context_code = np.select(
+            [
+                htf_bars < self.htf_slow_period,
+                (close > long_ma_10) & (long_ma_10 > long_ma_50),
+                close > long_ma_50,
+                (close < long_ma_10) & (long_ma_10 < long_ma_50),
+                close < long_ma_50
+            ],
+            [0, 1, 2, 3, 4],
+            default=5
+        )
+        higher_tf = contexts[context_code]
+        htf_bullish = (context_code == 1) | (context_code == 2)
+        htf_bearish = (context_code == 3) | (context_code == 4)
+        
+        active = (bars >= max(self.sma_50, 50)) & ~np.isnan(close)
+        
+        # Golden / death cross
+        buy_cross = active & (prev_sma_10 <= prev_sma_50) & (sma_10 > sma_50) & (close > sma_50)
+        buy_confidence = 85 + confidence_modifier * 100
+        buy_confidence = buy_confidence + np.where(ema_bullish, 5, -10)
+        buy_confidence = buy_confidence + np.where(htf_bullish, 5, -10)
+        buy_confidence = buy_confidence - np.where(has_sma_200 & ~(close > sma_200), 15, 0)
+        
+        sell_cross = active & (prev_sma_10 >= prev_sma_50) & (sma_10 < sma_50)
+        sell_confidence = 85 - confidence_modifier * 100
+        sell_confidence = sell_confidence + np.where(ema_bearish, 5, -10)
+        
+        # Oversold bounce
+        bounce = active & (distance_50sma < self.oversold_threshold) & (close > sma_10)
+        bounce_confidence = 70 + np.where(has_sma_200 & (np.abs(distance_200sma) < 2), 10, 0)
+        bounce_confidence = bounce_confidence + np.where(nasdaq_leading, 10, 0)
+        bounce_confidence = bounce_confidence - np.where(htf_bearish, 20, 0)
+        
+        # Overbought profit taking
+        overbought = active & (distance_50sma > self.overbought_threshold) & sma_bullish
+        overbought_confidence = 60 + np.select(
+            [context_code == 1, (context_code == 5) | (context_code == 4)], [-15, 15], default=0
+        )
+        overbought_confidence = overbought_confidence + np.where(nasdaq_lagging, 10, 0)
+        overbought_confidence = overbought_confidence + np.where(has_sma_200 & (distance_200sma > 10), 10, 0)
+        
+        return {
+            'Close': close,
+            'SMA_10': sma_10,
+            'SMA_50': sma_50,
+            'SMA_200': sma_200,
+            'EMA_9': ema_9,
+            'EMA_21': ema_21,
+            'previous_sma_10': prev_sma_10,
+            'previous_sma_50': prev_sma_50,
+            'distance_50sma': distance_50sma,
+            'distance_200sma': np.where(has_sma_200, distance_200sma, np.nan),
+            'nasdaq_known': nasdaq_known,
+            'relative_strength': relative_strength,
+            'spy_return': spy_return,
+            'nasdaq_return': nasdaq_return,
+            'confidence_modifier': confidence_modifier,
+            'higher_tf_context': higher_tf,
+            'htf_fast_ma': long_ma_10,
+            'htf_slow_ma': long_ma_50,
+            'buy_cross': buy_cross,
+            'buy_cross_confidence': np.clip(buy_confidence, 0, 100),
+            'sell_cross': sell_cross,
+            'sell_cross_confidence': np.clip(sell_confidence, 0, 100),
+            'bounce': bounce,
+            'bounce_confidence': np.clip(bounce_confidence, 0, 100),
+            'overbought': overbought,
+            'overbought_confidence': np.clip(overbought_confidence, 0, 100)
+        }
+    
+    def analyze_history(self, data: Dict[str, pd.DataFrame]) -> List[Signal]:
+        """Signals ``analyze()`` would have emitted on each bar of the history.
+        
+        Conditions are evaluated for all bars at once by ``evaluate_history``;
+        only bars where something fires are turned into Signal objects, using
+        the same checks (and notes) as the live scan, timestamped at the bar.
+        """
+        spy_data = data.get('SPY')
+        if spy_data is None or spy_data.empty:
+            return []
+        
+        history = self.evaluate_history(spy_data, data.get('QQQ'))
+        fired = history[history[['buy_cross', 'sell_cross', 'bounce', 'overbought']].any(axis=1)]
+        
+        signals = []
+        for timestamp, row in fired.iterrows():
+            market_state = self._market_state_from_history(row)
+            market_state['symbol'] = 'SPY'
+            market_state['timestamp'] = timestamp.to_pydatetime()
+            fed_warning = self._fed_warning_text(row['fed_days'])
+            
+            signals.extend(self._check_crossover_signals(spy_data, market_state, fed_warning))
+            signals.extend(self._check_bounce_signals(spy_data, market_state, fed_warning))
+            signals.extend(self._check_profit_taking_signals(spy_data, market_state, fed_warning))
+        
+        return signals
+    
+    def analyze_universe(self, data: Dict[str, pd.DataFrame], as_of: Optional[datetime] = None) -> List[Signal]:
+        """Scan every universe symbol at its latest bar in one vectorized pass.
+        
+        Closes are aligned on date into a (time x symbol) panel and every
+        column goes through the same rules ``analyze()`` applies to SPY, with
+        QQQ as the NASDAQ reference. Symbols without a bar on the latest date
+        or with too little history are skipped.
+        """
+        symbols = [symbol for symbol in self.universe if data.get(symbol) is not None and not data[symbol].empty]
+        if not symbols:
+            return []
+        
+        index, close = self._close_panel([data[symbol] for symbol in symbols])
+        panel = self._evaluate_panel(close, index, data.get('QQQ'), tuple(symbols))
+        
+        fired = panel['buy_cross'][-1] | panel['sell_cross'][-1] | panel['bounce'][-1] | panel['overbought'][-1]
+        fed_warning = self._get_fed_warning(as_of)
+        
+        signals = []
+        for column in np.nonzero(fired)[0]:
+            market_state = self._market_state_from_history({name: values[-1, column] for name, values in panel.items()})
+            market_state['symbol'] = symbols[column]
+            market_state['timestamp'] = as_of or datetime.now()
+            
+            signals.extend(self._check_crossover_signals(data[symbols[column]], market_state, fed_warning))
+            signals.extend(self._check_bounce_signals(data[symbols[column]], market_state, fed_warning))
+            signals.extend(self._check_profit_taking_signals(data[symbols[column]], market_state, fed_warning))
+        
+        print(f"Universe scan: {len(symbols)} symbols, {int(fired.sum())} with signals")
+        return signals
+    
+    def _higher_timeframe_means(self, close: np.ndarray, index: pd.DatetimeIndex, first_bar: np.ndarray):
+        """Higher-timeframe fast/slow means as of every row of a close panel.
+        
+        Row i sees the completed higher-timeframe bars before it plus the
+        open one, whose close is close[i] - what resampling the bars up to
+        i gives. Also returns how many higher-timeframe bars each row sees.
+        """
+        labels = period_labels(index, self.higher_timeframe)
+        starts = period_starts(labels)
+        ends = np.concatenate((starts[1:], [len(labels)])) - 1
+        period = np.cumsum(np.isin(np.arange(len(labels)), starts)) - 1
+        
+        # Close of each completed period: the last close in it
+        htf_close = close[ends]
+        htf_bars = period[:, None] - period[first_bar][None, :] + 1
+        
+        def trailing_mean(length):
+            # Oldest completed period first, the open period (this row's close) last
+            windows = []
+            for lag in range(length - 1, 0, -1):
+                lagged = period - lag
+                windows.append(np.where((lagged >= 0)[:, None], htf_close[np.maximum(lagged, 0)], np.nan))
+            windows.append(close)
+            return window_mean(np.stack(windows, axis=-1))
+        
+        return trailing_mean(self.htf_fast_period), trailing_mean(self.htf_slow_period), htf_bars
+    
+    @staticmethod
+    def _close_panel(frames: List[pd.DataFrame]) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        """Align closes on date into a (time x symbol) array, NaN where a symbol has no bar"""
+        index = frames[0].index
+        if all(frame.index.equals(index) for frame in frames):
+            return index, np.column_stack([frame['Close'].to_numpy(dtype=np.float64) for frame in frames])
+        
+        for frame in frames[1:]:
+            index = index.union(frame.index)
+        close = np.full((len(index), len(frames)), np.nan)
+        for column, frame in enumerate(frames):
+            close[index.get_indexer(frame.index), column] = frame['Close'].to_numpy(dtype=np.float64)
+        return index, close
+    
+    def _market_state_from_history(self, row: Dict) -> Dict:
+        """Rebuild the ``_analyze_current_market_state`` dict from one evaluate_history row"""
+        current_price = row['Close']
+        sma_200 = None if pd.isna(row['SMA_200']) else row['SMA_200']
+        
+        if row['nasdaq_known']:
+            relative_strength = row['relative_strength']
+            if relative_strength > 0.005:
+                leadership, confidence_modifier = 'nasdaq_leading', 0.2
+            elif relative_strength < -0.005:
+                leadership, confidence_modifier = 'nasdaq_lagging', -0.2
+            else:
+                leadership, confidence_modifier = 'neutral', 0
+            
+            nasdaq_analysis = {
+                'relative_strength': relative_strength,
+                'leadership': leadership,
+                'confidence_modifier': confidence_modifier,
+                'spy_return': row['spy_return'],
+                'nasdaq_return': row['nasdaq_return'],
+                'note': f"NASDAQ {'leading' if relative_strength > 0 else 'lagging'} by {abs(relative_strength)*100:.1f}%"
+            }
+        else:
+            nasdaq_analysis = {
+                'relative_strength': 0,
+                'leadership': 'unknown',
+                'confidence_modifier': 0,
+                'note': 'No NASDAQ data available'
+            }
+        
+        context = row['higher_tf_context']
+        if context == 'insufficient_data':
+            higher_tf_context = {'context': context, 'note': 'Not enough data for higher TF analysis'}
+        else:
+            higher_tf_context = {
+                'context': context,
+                'timeframe': self.higher_timeframe,
+                'fast_ma': row['htf_fast_ma'],
+                'slow_ma': row['htf_slow_ma'],
+                'note': f"Higher TF: {context.replace('_', ' ').title()}"
+            }
+        
+        return {
+            'current_price': current_price,
+            'sma_10': row['SMA_10'],
+            'sma_50': row['SMA_50'],
+            'sma_200': sma_200,
+            'ema_9': row['EMA_9'],
+            'ema_21': row['EMA_21'],
+            'distance_50sma': row['distance_50sma'],
+            'distance_200sma': None if sma_200 is None else row['distance_200sma'],
+            'sma_trend': "bullish" if row['SMA_10'] > row['SMA_50'] else "bearish",
+            'ema_trend': "bullish" if row['EMA_9'] > row['EMA_21'] else "bearish",
+            'long_term_trend': ("bullish" if current_price > sma_200 else "bearish") if sma_200 is not None else "unknown (insufficient data)",
+            'nasdaq_analysis': nasdaq_analysis,
+            'higher_tf_context': higher_tf_context,
+            'previous_sma_10': row['previous_sma_10'],
+            'previous_sma_50': row['previous_sma_50']
+        }
+    
+    def _calculate_all_moving_averages(self, data: pd.DataFrame, symbol: str = 'SPY') -> pd.DataFrame:
+        """Calculate all required moving averages over the full history.
+        
+        Returns a new frame with the MA columns added; ``data`` itself (often
+        the fetcher's cached bars) is never modified. This is the reference
+        the incremental indicator engine is checked against; scans use
+        ``self.indicator_engine`` instead.
+        """
+        store = self.indicator_store
         
-        # Only calculate 200SMA if we have enough data
+        # 200SMA is all NaN (still float) until there is enough data
         if len(data) >= self.sma_200:
-            data['SMA_200'] = data['Close'].rolling(window=self.sma_200).mean()
             print(f"Calculated 200SMA with {len(data)} data points")
         else:
-            data['SMA_200'] = None
             print(f"Skipping 200SMA calculation - only {len(data)} data points available (need {self.sma_200})")
         
-        # Exponential Moving Averages
-        data['EMA_9'] = data['Close'].ewm(span=self.ema_9).mean()
-        data['EMA_21'] = data['Close'].ewm(span=self.ema_21).mean()
-        
-        return data
+        return with_columns(data, {
+            # Simple Moving Averages
+            'SMA_10': store.get(symbol, data, 'sma', self.sma_10),
+            'SMA_50': store.get(symbol, data, 'sma', self.sma_50),
+            'SMA_200': store.get(symbol, data, 'sma', self.sma_200),
+            # Exponential Moving Averages
+            'EMA_9': store.get(symbol, data, 'ema', self.ema_9),
+            'EMA_21': store.get(symbol, data, 'ema', self.ema_21)
+        })
+    
+    def _analyze_current_market_state(self, spy_data: pd.DataFrame, nasdaq_data: pd.DataFrame, symbol: str = 'SPY') -> Dict:
+        """Comprehensive market state analysis.
+        
+        Thin pandas adapter: the columns are pulled out as arrays once and
+        everything after that (``_market_state_from_arrays``) works on
+        plain NumPy, with no per-row pandas access.
+        """
+        nasdaq_close = None
+        if nasdaq_data is not None and not nasdaq_data.empty:
+            nasdaq_close = nasdaq_data['Close'].to_numpy(dtype=np.float64)
+        return self._market_state_from_arrays(
+            wall_clock_ns(spy_data.index), spy_data['Close'].to_numpy(dtype=np.float64), nasdaq_close, symbol
+        )
     
-    def _analyze_current_market_state(self, spy_data: pd.DataFrame, nasdaq_data: pd.DataFrame) -> Dict:
-        """Comprehensive market state analysis"""
-        current = spy_data.iloc[-1]
-        previous = spy_data.iloc[-2]
+    def _market_state_from_arrays(self, timestamps: np.ndarray, close: np.ndarray, nasdaq_close: Optional[np.ndarray],
+                                  symbol: str = 'SPY') -> Dict:
+        """Market state of ``symbol`` as of the last bar of int64 ns ``timestamps`` / float64 ``close``"""
+        current = self.indicator_engine.update_arrays(symbol, timestamps, close)
+        previous = self.indicator_engine.previous(symbol)
         
         # Basic price and MA data
-        current_price = current['Close']
+        current_price = float(close[-1])
         current_sma_10 = current['SMA_10']
         current_sma_50 = current['SMA_50']
-        current_sma_200 = current['SMA_200']
+        current_sma_200 = None if math.isnan(current['SMA_200']) else current['SMA_200']
         current_ema_9 = current['EMA_9']
         current_ema_21 = current['EMA_21']
         
@@ -136,7 +519,7 @@ class TheSystemStrategy(BaseStrategy):
         distance_50sma = ((current_price - current_sma_50) / current_sma_50) * 100
         
         # Only calculate 200SMA distance if we have 200SMA data
-        if current_sma_200 is not None and not pd.isna(current_sma_200):
+        if current_sma_200 is not None:
             distance_200sma = ((current_price - current_sma_200) / current_sma_200) * 100
             long_term_trend = "bullish" if current_price > current_sma_200 else "bearish"
         else:
@@ -148,10 +531,10 @@ class TheSystemStrategy(BaseStrategy):
         ema_trend = "bullish" if current_ema_9 > current_ema_21 else "bearish"
         
         # NASDAQ analysis
-        nasdaq_analysis = self._analyze_nasdaq_leadership(spy_data, nasdaq_data)
+        nasdaq_analysis = self._analyze_nasdaq_leadership(close, nasdaq_close)
         
-        # Higher timeframe context (simplified - using longer MAs as proxy)
-        higher_tf_context = self._analyze_higher_timeframe_context(spy_data)
+        # Higher timeframe context from resampled bars
+        higher_tf_context = self._analyze_higher_timeframe_context(timestamps, close)
         
         return {
             'current_price': current_price,
@@ -171,9 +554,9 @@ class TheSystemStrategy(BaseStrategy):
             'previous_sma_50': previous['SMA_50']
         }
     
-    def _analyze_nasdaq_leadership(self, spy_data: pd.DataFrame, nasdaq_data: pd.DataFrame) -> Dict:
-        """Analyze NASDAQ leadership vs SPY"""
-        if nasdaq_data is None or nasdaq_data.empty or len(nasdaq_data) < self.nasdaq_lookback:
+    def _analyze_nasdaq_leadership(self, spy_close: np.ndarray, nasdaq_close: Optional[np.ndarray]) -> Dict:
+        """Analyze NASDAQ leadership vs SPY from their close arrays"""
+        if nasdaq_close is None or len(nasdaq_close) < self.nasdaq_lookback:
             return {
                 'relative_strength': 0,
                 'leadership': 'unknown',
@@ -181,19 +564,14 @@ class TheSystemStrategy(BaseStrategy):
                 'note': 'No NASDAQ data available'
             }
         
-        # Calculate recent performance
-        spy_recent = spy_data['Close'].iloc[-self.nasdaq_lookback:]
-        nasdaq_recent = nasdaq_data['Close'].iloc[-self.nasdaq_lookback:]
-        
-        if len(spy_recent) != len(nasdaq_recent):
-            # Align data if different lengths
-            min_len = min(len(spy_recent), len(nasdaq_recent))
-            spy_recent = spy_recent.iloc[-min_len:]
-            nasdaq_recent = nasdaq_recent.iloc[-min_len:]
+        # Calculate recent performance (aligned on the shorter of the two)
+        length = min(self.nasdaq_lookback, len(spy_close), len(nasdaq_close))
+        spy_first, spy_last = float(spy_close[-length]), float(spy_close[-1])
+        nasdaq_first, nasdaq_last = float(nasdaq_close[-length]), float(nasdaq_close[-1])
         
         # Calculate relative performance over lookback period
-        spy_return = (spy_recent.iloc[-1] - spy_recent.iloc[0]) / spy_recent.iloc[0]
-        nasdaq_return = (nasdaq_recent.iloc[-1] - nasdaq_recent.iloc[0]) / nasdaq_recent.iloc[0]
+        spy_return = (spy_last - spy_first) / spy_first
+        nasdaq_return = (nasdaq_last - nasdaq_first) / nasdaq_first
         
         relative_strength = nasdaq_return - spy_return
         
@@ -217,18 +595,19 @@ class TheSystemStrategy(BaseStrategy):
             'note': f"NASDAQ {'leading' if relative_strength > 0 else 'lagging'} by {abs(relative_strength)*100:.1f}%"
         }
     
-    def _analyze_higher_timeframe_context(self, data: pd.DataFrame) -> Dict:
-        """Analyze higher timeframe context using longer period MAs"""
-        if len(data) < 100:
+    def _analyze_higher_timeframe_context(self, timestamps: np.ndarray, close: np.ndarray) -> Dict:
+        """Analyze higher timeframe context from resampled (weekly by default) bars.
+        
+        The last higher-timeframe bar is still open: its close is the latest
+        base close. Only the closes are resampled, straight from the arrays.
+        """
+        htf_close = period_closes(timestamps, close, self.higher_timeframe)
+        if len(htf_close) < self.htf_slow_period:
             return {'context': 'insufficient_data', 'note': 'Not enough data for higher TF analysis'}
         
-        # Use longer period MAs as proxy for higher timeframes
-        long_sma_10 = data['Close'].rolling(window=20).mean()  # ~1hr equivalent
-        long_sma_50 = data['Close'].rolling(window=100).mean()  # ~4hr equivalent
-        
-        current_price = data['Close'].iloc[-1]
-        current_long_10 = long_sma_10.iloc[-1]
-        current_long_50 = long_sma_50.iloc[-1]
+        current_price = float(close[-1])
+        current_long_10 = window_mean(htf_close[-self.htf_fast_period:])
+        current_long_50 = window_mean(htf_close[-self.htf_slow_period:])
         
         # Determine higher timeframe trend
         if current_price > current_long_10 > current_long_50:
@@ -244,14 +623,16 @@ class TheSystemStrategy(BaseStrategy):
         
         return {
             'context': context,
-            'long_ma_10': current_long_10,
-            'long_ma_50': current_long_50,
+            'timeframe': self.higher_timeframe,
+            'fast_ma': current_long_10,
+            'slow_ma': current_long_50,
             'note': f"Higher TF: {context.replace('_', ' ').title()}"
         }
     
     def _check_crossover_signals(self, data: pd.DataFrame, market_state: Dict, fed_warning: str) -> List[Signal]:
         """Check for SMA and EMA crossover signals with confirmations"""
         signals = []
+        symbol = market_state['symbol']
         
         # SMA Crossover Analysis
         prev_sma_10 = market_state['previous_sma_10']
@@ -310,16 +691,16 @@ class TheSystemStrategy(BaseStrategy):
             
             signals.append(Signal(
                 strategy_name=self.name,
-                symbol='SPY',
+                symbol=symbol,
                 signal_type='BUY_CROSS',
                 confidence=confidence,
-                timestamp=datetime.now(),
+                timestamp=market_state['timestamp'],
                 current_price=market_state['current_price'],
                 sma_10=current_sma_10,
                 sma_50=current_sma_50,
                 distance_from_50sma=market_state['distance_50sma'],
                 stop_loss=current_sma_50 * 0.99,
-                action="BUY SPY calls or UPRO shares",
+                action="BUY SPY calls or UPRO shares" if symbol == 'SPY' else f"BUY {symbol} shares or calls",
                 notes=notes
             ))
         
@@ -345,8 +726,10 @@ class TheSystemStrategy(BaseStrategy):
             distance = market_state['distance_50sma']
             if distance > -2:
                 action = "GO TO CASH (sell positions)"
-            else:
+            elif symbol == 'SPY':
                 action = "GO SHORT (SPY puts or SPXU shares)"
+            else:
+                action = f"GO SHORT ({symbol} puts)"
             
             confidence = max(min(confidence, 100), 0)
             
@@ -357,10 +740,10 @@ class TheSystemStrategy(BaseStrategy):
             
             signals.append(Signal(
                 strategy_name=self.name,
-                symbol='SPY',
+                symbol=symbol,
                 signal_type='SELL_CROSS',
                 confidence=confidence,
-                timestamp=datetime.now(),
+                timestamp=market_state['timestamp'],
                 current_price=market_state['current_price'],
                 sma_10=current_sma_10,
                 sma_50=current_sma_50,
@@ -374,6 +757,7 @@ class TheSystemStrategy(BaseStrategy):
     def _check_bounce_signals(self, data: pd.DataFrame, market_state: Dict, fed_warning: str) -> List[Signal]:
         """Check for oversold bounce opportunities"""
         signals = []
+        symbol = market_state['symbol']
         
         distance = market_state['distance_50sma']
         current_price = market_state['current_price']
@@ -418,16 +802,16 @@ class TheSystemStrategy(BaseStrategy):
             
             signals.append(Signal(
                 strategy_name=self.name,
-                symbol='SPY',
+                symbol=symbol,
                 signal_type='BOUNCE',
                 confidence=confidence,
-                timestamp=datetime.now(),
+                timestamp=market_state['timestamp'],
                 current_price=current_price,
                 sma_10=sma_10,
                 sma_50=market_state['sma_50'],
                 distance_from_50sma=distance,
                 stop_loss=sma_10 * 0.995,
-                action="SMALL POSITION: SPY calls (short-term bounce play)",
+                action=f"SMALL POSITION: {symbol} calls (short-term bounce play)",
                 notes=notes
             ))
         
@@ -436,6 +820,7 @@ class TheSystemStrategy(BaseStrategy):
     def _check_profit_taking_signals(self, data: pd.DataFrame, market_state: Dict, fed_warning: str) -> List[Signal]:
         """Check for overbought profit-taking opportunities"""
         signals = []
+        symbol = market_state['symbol']
         
         distance = market_state['distance_50sma']
         
@@ -482,10 +867,10 @@ class TheSystemStrategy(BaseStrategy):
             
             signals.append(Signal(
                 strategy_name=self.name,
-                symbol='SPY',
+                symbol=symbol,
                 signal_type='OVERBOUGHT',
                 confidence=confidence,
-                timestamp=datetime.now(),
+                timestamp=market_state['timestamp'],
                 current_price=market_state['current_price'],
                 sma_10=market_state['sma_10'],
                 sma_50=market_state['sma_50'],
@@ -496,40 +881,29 @@ class TheSystemStrategy(BaseStrategy):
         
         return signals
     
-    def _get_fed_warning(self) -> str:
+    def _get_fed_warning(self, as_of: Optional[datetime] = None) -> str:
         """Get Fed event warning if applicable"""
-        today = datetime.now().date()
-        
-        for blackout_date in self.fed_blackout_dates:
-            days_diff = (blackout_date - today).days
-            
-            if days_diff == 0:
-                return "FED MEETING TODAY - EXTREME VOLATILITY EXPECTED"
-            elif days_diff == 1:
-                return "FED MEETING TOMORROW - HIGH VOLATILITY LIKELY"
-            elif days_diff == -1:
-                return "FED MEETING YESTERDAY - VOLATILITY MAY CONTINUE"
-            elif abs(days_diff) <= 2:
-                return f"FED MEETING IN {abs(days_diff)} DAYS - CONSIDER VOLATILITY RISK"
-        
-        return ""
+        return self._fed_warning_text(self.fed_calendar.days_to_nearest(as_of or datetime.now())[0])
     
-    def _get_fed_calendar(self) -> List:
-        """Get Fed calendar dates (simplified version)"""
-        # In production, this could integrate with economic calendar APIs
-        # For now, using approximate 2025 FOMC meeting dates
-        from datetime import date
-        
-        return [
-            date(2025, 1, 29),  # FOMC Meeting
-            date(2025, 3, 19),  # FOMC Meeting
-            date(2025, 5, 1),   # FOMC Meeting
-            date(2025, 6, 18),  # FOMC Meeting
-            date(2025, 7, 30),  # FOMC Meeting
-            date(2025, 9, 17),  # FOMC Meeting (today's date for testing)
-            date(2025, 11, 6),  # FOMC Meeting
-            date(2025, 12, 17), # FOMC Meeting
-        ]
+    def _fed_warning_text(self, days: int) -> str:
+        """Warning for a bar ``days`` away from the nearest FOMC decision (negative = passed)"""
+        days = int(days)
+        if abs(days) > self.fed_warning_days:
+            return ""
+        
+        if days == 0:
+            return "FED MEETING TODAY - EXTREME VOLATILITY EXPECTED"
+        elif days == 1:
+            return "FED MEETING TOMORROW - HIGH VOLATILITY LIKELY"
+        elif days == -1:
+            return "FED MEETING YESTERDAY - VOLATILITY MAY CONTINUE"
+        return f"FED MEETING IN {abs(days)} DAYS - CONSIDER VOLATILITY RISK"
+    
+    def _get_fed_calendar(self, config: Dict) -> EventCalendar:
+        """FOMC dates from the configured calendar file (bundled one by default)"""
+        if not config.get('enable_fed_calendar', True):
+            return EventCalendar()
+        return load_calendar(config.get('event_calendar_path') or None).select('FOMC')
 
 # Enhanced configuration for the strategy
 class EnhancedStrategyConfig:
@@ -547,5 +921,11 @@ class EnhancedStrategyConfig:
         'nasdaq_confirmation_weight': 0.3,
         'nasdaq_lookback_days': 5,
         'check_higher_timeframes': True,
-        'enable_fed_calendar': True
+        'higher_timeframe': '1wk',  # '1wk' or '1mo' from daily bars, '1h' or '4h' from intraday
+        'htf_fast_period': 4,
+        'htf_slow_period': 20,
+        'enable_fed_calendar': True,
+        'fed_warning_days': 2,  # Flag signals this many days either side of an FOMC decision
+        'event_calendar_path': None,  # date,event,description CSV; None = data/calendars/economic_events.csv
+        'universe': []  # Symbols to scan instead of SPY alone
     }
\ No newline at end of file
@@ -0,0 +1,57 @@
+import contextlib
+import io
+from config.settings import StrategyConfig
+from data.synthetic import SyntheticMarketGenerator
+from strategies.the_system import EnhancedStrategyConfig, TheSystemStrategy
+
+CONFIDENCE_COLUMNS = {
+    'BUY_CROSS': 'buy_cross_confidence',
+    'SELL_CROSS': 'sell_cross_confidence',
+    'BOUNCE': 'bounce_confidence',
+    'OVERBOUGHT': 'overbought_confidence'
+}
+
+def replay_analyze(spy, qqq):
+    """Reference: call analyze() once per bar, as the live scan would have"""
+    strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM)
+    signals = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for end in range(1, len(spy) + 1):
+            as_of = spy.index[end - 1]
+            nasdaq = qqq.loc[:as_of] if qqq is not None else None
+            signals.extend(strategy.analyze({'SPY': spy.iloc[:end], 'QQQ': nasdaq}, as_of=as_of.to_pydatetime()))
+    return signals
+
+def test_history_matches_per_bar_analyze():
+    print("Testing analyze_history against per-bar analyze()...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=7, correlation=0.8, volatility=0.012).generate(400)
+    spy, qqq = data['SPY'], data['QQQ'].iloc[3:]  # QQQ starts later, aligned by date
+    
+    for nasdaq in (qqq, None):
+        strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM)
+        with contextlib.redirect_stdout(io.StringIO()):
+            history = strategy.analyze_history({'SPY': spy, 'QQQ': nasdaq})
+        expected = replay_analyze(spy, nasdaq)
+        
+        assert len(history) == len(expected) > 0
+        for got, want in zip(history, expected):
+            assert got.__dict__ == want.__dict__
+        
+        # The vectorized confidences agree with the emitted signals
+        evaluated = strategy.evaluate_history(spy, nasdaq)
+        for signal in history:
+            assert evaluated.loc[signal.timestamp, CONFIDENCE_COLUMNS[signal.signal_type]] == signal.confidence
+    
+    print(f"✓ {len(history)} signals identical to the per-bar replay")
+
+def test_short_history():
+    strategy = TheSystemStrategy(StrategyConfig.THE_SYSTEM)
+    spy = SyntheticMarketGenerator(['SPY']).generate(40)['SPY']
+    
+    assert strategy.analyze_history({'SPY': spy}) == []
+    assert not strategy.evaluate_history(spy)[['buy_cross', 'sell_cross', 'bounce', 'overbought']].any().any()
+
+if __name__ == "__main__":
+    test_history_matches_per_bar_analyze()
+    test_short_history()
@@ -0,0 +1,83 @@
+import time
+import numpy as np
+import pandas as pd
+from backtesting.backtester import StrategyBacktester, entry_exit_signals
+from config.settings import BacktestConfig
+from data.synthetic import SyntheticMarketGenerator
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+def bar_by_bar(bars: pd.DataFrame, entries, exits, config: BacktestConfig):
+    """Straightforward per-bar simulation the vectorized engine must agree with"""
+    o, h, l, c = (bars[column].to_numpy() for column in ('Open', 'High', 'Low', 'Close'))
+    slip, fee = config.slippage_pct, config.commission_pct
+    cash, position, pending = config.initial_capital, None, None
+    trades, equity = [], []
+    
+    def close_out(bar, price, reason):
+        nonlocal cash, position
+        cash = position[2] * price * (1 - slip) * (1 - fee)
+        trades.append((bars.index[position[0]], bars.index[bar], reason))
+        position = None
+    
+    for i in range(len(c)):
+        if position is None and pending == 'buy':
+            price = o[i] * (1 + slip)
+            position = (i, price, cash / (price * (1 + fee)))
+        elif position is not None and pending == 'sell':
+            close_out(i, o[i], 'signal')
+        
+        if position is not None:
+            stop, take = position[1] * (1 - config.stop_loss_pct), position[1] * (1 + config.take_profit_pct)
+            if l[i] <= stop:
+                close_out(i, stop if i == position[0] else min(o[i], stop), 'stop_loss')
+            elif h[i] >= take:
+                close_out(i, take if i == position[0] else max(o[i], take), 'take_profit')
+        
+        pending = 'buy' if position is None and entries[i] else 'sell' if position is not None and exits[i] else None
+        if position is not None and i == len(c) - 1:
+            close_out(i, c[i], 'end')
+        equity.append(position[2] * c[i] if position is not None else cash)
+    return trades, np.array(equity)
+
+def test_matches_bar_by_bar_simulation():
+    print("Testing vectorized backtest against a per-bar simulation...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=5).generate(1500)
+    strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM)
+    config = BacktestConfig(stop_loss_pct=0.04, take_profit_pct=0.06)
+    start, end = data['SPY'].index[300], data['SPY'].index[1400]
+    
+    results = StrategyBacktester(strategy, config=config).backtest(str(start.date()), str(end.date()), data)
+    trades = results['trades']
+    assert len(trades) > 10 and set(trades['exit_reason']) >= {'signal', 'stop_loss', 'take_profit'}
+    assert results['equity_curve'].index[0] == start and results['equity_curve'].index[-1] == end
+    
+    bars = data['SPY'].loc[start:end]
+    entries, exits = entry_exit_signals(strategy.evaluate_history(data['SPY'], data['QQQ']), strategy.config['min_confidence'])
+    window = slice(300, 1401)
+    expected_trades, expected_equity = bar_by_bar(bars, entries[window], exits[window], config)
+    
+    assert list(zip(trades['entry_time'], trades['exit_time'], trades['exit_reason'])) == expected_trades
+    assert trades['fed_days'].tolist() == strategy.fed_calendar.days_to_nearest(trades['entry_time']).tolist()
+    assert np.allclose(results['equity_curve'].to_numpy(), expected_equity, rtol=1e-12)
+    assert results['metrics']['total_trades'] == len(expected_trades)
+    print(f"✓ {len(trades)} trades, equity curve matches, total return {results['metrics']['total_return']:.1%}")
+
+def test_twenty_years_of_daily_bars():
+    print("Testing backtest speed on 20 years of daily bars...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=1).generate(5040)
+    backtester = StrategyBacktester(TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM))
+    start, end = data['SPY'].index[250], data['SPY'].index[-1]
+    
+    started = time.perf_counter()
+    results = backtester.backtest(str(start.date()), str(end.date()), data)
+    elapsed = time.perf_counter() - started
+    
+    assert len(results['equity_curve']) == 5040 - 250
+    assert elapsed < 1.0
+    print(f"✓ {len(results['trades'])} trades over {len(results['equity_curve'])} bars in {elapsed * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    test_matches_bar_by_bar_simulation()
+    test_twenty_years_of_daily_bars()
@@ -0,0 +1,202 @@
+import tempfile
+from pathlib import Path
+import pandas as pd
+import numpy as np
+from datetime import datetime, timedelta, timezone
+from config.settings import DataConfig
+from data.bar_cache import BarCache, merge_bars
+from data.market_data import MarketDataFetcher
+from data.providers.base import DataProvider
+from utils.market_hours import MARKET_TIMEZONE
+
+def create_daily_bars(end: str = '2025-10-16', periods: int = 30) -> pd.DataFrame:
+    """Create simple daily OHLCV bars ending on the given date"""
+    dates = pd.bdate_range(end=end, periods=periods)
+    closes = np.linspace(600, 660, periods)
+    
+    return pd.DataFrame({
+        'Open': closes - 1,
+        'High': closes + 2,
+        'Low': closes - 2,
+        'Close': closes,
+        'Volume': np.full(periods, 80000000, dtype=np.int64)
+    }, index=dates)
+
+def test_bar_cache_round_trip():
+    print("Testing bar cache round trip...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        cache = BarCache(root)
+        data = create_daily_bars()
+        
+        cache.store('SPY', '1d', data)
+        loaded = cache.load('SPY', '1d')
+        
+        pd.testing.assert_frame_equal(loaded, data, check_freq=False, check_index_type=False)
+        assert cache.load('QQQ', '1d') is None
+        print(f"✓ Stored and reloaded {len(loaded)} bars")
+
+def test_bar_cache_versions():
+    print("Testing bar cache versions...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        cache = BarCache(root)
+        for periods in (30, 31, 32):
+            cache.store('SPY', '1d', create_daily_bars(periods=periods))
+        
+        # The manifest points at the newest version; the one it replaced is kept for in-flight readers
+        meta = cache.load_meta('SPY', '1d')
+        versions = sorted(path.name for path in (Path(root) / '1d' / 'SPY').glob('v*'))
+        assert len(versions) == 2 and meta['version'] == versions[-1]
+        assert len(cache.load('SPY', '1d')) == 32
+        
+        # Columns that disagree with the manifest are a miss, not a mixed frame
+        np.save(Path(root) / '1d' / 'SPY' / meta['version'] / 'Close.npy', np.zeros(31))
+        assert cache.load('SPY', '1d') is None
+        print("✓ Stores swap in whole versions and mismatched columns are ignored")
+
+def test_bar_cache_staleness():
+    print("Testing bar cache staleness rules...")
+    
+    cache = BarCache('unused', ttl=timedelta(minutes=5))
+    
+    def at(day: str, clock: str) -> datetime:
+        naive = datetime.strptime(f"{day} {clock}", '%Y-%m-%d %H:%M')
+        return MARKET_TIMEZONE.localize(naive).astimezone(timezone.utc)
+    
+    # Thursday's bar fetched after the close
+    meta = {'last_bar': '2025-10-16T00:00:00', 'fetched_at': at('2025-10-16', '17:00').isoformat()}
+    
+    # Friday before the open - no new bar can exist yet
+    assert cache.is_fresh(meta, now=at('2025-10-17', '08:00'))
+    # Friday during the session - new bar is forming
+    assert not cache.is_fresh(meta, now=at('2025-10-17', '10:00'))
+    # Still inside the TTL during the session
+    meta_recent = dict(meta, fetched_at=at('2025-10-17', '09:58').isoformat())
+    assert cache.is_fresh(meta_recent, now=at('2025-10-17', '10:00'))
+    # Saturday after Friday's bar was fetched post-close
+    meta_friday = {'last_bar': '2025-10-17T00:00:00', 'fetched_at': at('2025-10-17', '16:30').isoformat()}
+    assert cache.is_fresh(meta_friday, now=at('2025-10-18', '12:00'))
+    # Partial Friday bar fetched intraday is stale once the session closes
+    meta_partial = dict(meta_friday, fetched_at=at('2025-10-17', '14:00').isoformat())
+    assert not cache.is_fresh(meta_partial, now=at('2025-10-18', '12:00'))
+    
+    print("✓ Staleness rules behave as expected")
+
+def test_merge_bars_prefers_recent():
+    print("Testing bar merge...")
+    
+    history = create_daily_bars(end='2025-10-16', periods=300)
+    recent = create_daily_bars(end='2025-10-20', periods=100)
+    recent['Close'] += 1.0
+    
+    merged = merge_bars(history, recent)
+    
+    assert merged.index.is_monotonic_increasing and merged.index.is_unique
+    assert len(merged) == 302  # Two new sessions: Friday 17th and Monday 20th
+    assert merged.loc['2025-10-16', 'Close'] == recent.loc['2025-10-16', 'Close']
+    assert merged.index[0] == history.index[0]
+    print(f"✓ Merged into {len(merged)} bars")
+
+class ScriptedProvider(DataProvider):
+    """Provider whose responses come from a dict keyed by outputsize"""
+    
+    def __init__(self, responses: dict):
+        super().__init__("Scripted")
+        self.responses = responses
+        self.calls = []
+    
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        self.calls.append(outputsize)
+        return self.responses[outputsize]
+
+def test_incremental_sync():
+    print("Testing incremental sync...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        responses = {
+            'full': create_daily_bars(end='2025-10-16', periods=1000),
+            'compact': create_daily_bars(end='2025-10-17', periods=100)
+        }
+        
+        # First sight backfills full history
+        provider = ScriptedProvider(responses)
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        data = fetcher._fetch_and_cache(['SPY'], '1d', 220)['SPY']
+        assert provider.calls == ['full'] and len(data) == 1000
+        
+        # Later runs only pull the compact window and append to history
+        provider = ScriptedProvider(responses)
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        data = fetcher._fetch_and_cache(['SPY'], '1d', 220)['SPY']
+        assert provider.calls == ['compact'] and len(data) == 1001
+        assert data.index[-1] == pd.Timestamp('2025-10-17')
+    
+    print("✓ Full backfill once, compact deltas afterwards")
+
+def test_longer_lookback_backfills():
+    print("Testing a lookback longer than the stored history...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        responses = {
+            'full': create_daily_bars(end='2025-10-16', periods=1000),
+            'compact': create_daily_bars(end='2025-10-16', periods=100)
+        }
+        provider = ScriptedProvider(responses)
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        fetcher.bar_cache.store('SPY', '1d', responses['compact'])
+        
+        assert len(fetcher.get_data('SPY', '1d', 50)) == 50 and provider.calls == []
+        assert len(fetcher.get_data('SPY', '1d', 300)) == 300 and provider.calls == ['full']
+    
+    print("✓ Short stored history is a miss for longer lookbacks")
+
+class CompactOnlyProvider(ScriptedProvider):
+    """Provider without full history whose compact window moves on a day per call"""
+    
+    def __init__(self):
+        super().__init__({'full': create_daily_bars(periods=0)})
+        self.end = pd.Timestamp('2025-10-16')
+    
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        if outputsize == 'full':
+            return super().fetch(symbol, timeframe, outputsize)
+        self.calls.append(outputsize)
+        self.end += pd.offsets.BDay()
+        return create_daily_bars(end=str(self.end.date()), periods=100)
+
+def test_short_history_without_full_backfill():
+    print("Testing a short history on a provider without full history...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        provider = CompactOnlyProvider()
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        data = fetcher._fetch_and_cache(['SPY'], '1d', 220)['SPY']
+        assert provider.calls == ['full', 'compact'] and len(data) == 100
+        
+        # The failed backfill is remembered across runs and the compact
+        # window keeps growing the stored history
+        for rows in (101, 102, 103):
+            provider.calls = []
+            fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+            data = fetcher._fetch_and_cache(['SPY'], '1d', 220)['SPY']
+            assert provider.calls == ['compact'] and len(data) == rows
+        
+        # Full history is asked for again once the retry interval has passed
+        stale = datetime.now(timezone.utc) - timedelta(days=2)
+        fetcher.bar_cache.record_backfill_failure('SPY', '1d', provider.name, stale)
+        provider.calls = []
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        data = fetcher._fetch_and_cache(['SPY'], '1d', 220)['SPY']
+        assert provider.calls == ['full', 'compact'] and len(data) == 104
+    
+    print("✓ Compact window merges onto short history, backfill retried daily")
+
+if __name__ == "__main__":
+    test_bar_cache_round_trip()
+    test_bar_cache_versions()
+    test_bar_cache_staleness()
+    test_merge_bars_prefers_recent()
+    test_incremental_sync()
+    test_longer_lookback_backfills()
+    test_short_history_without_full_backfill()
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from data.events import NO_EVENT, EventCalendar, load_calendar
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+def test_days_to_nearest_event():
+    print("Testing days to nearest event...")
+    
+    calendar = EventCalendar(['2025-03-19', '2025-01-29', '2025-03-12'], ['FOMC', 'FOMC', 'CPI'])
+    dates = pd.to_datetime(['2025-01-01', '2025-01-28', '2025-01-29', '2025-01-31', '2025-03-15', '2025-03-16', '2025-12-31'])
+    
+    assert calendar.days_to_nearest(dates).tolist() == [28, 1, 0, -2, -3, 3, -287]
+    assert calendar.select('FOMC').days_to_nearest(dates[4:6]).tolist() == [4, 3]
+    assert calendar.nearest(datetime(2025, 3, 13)) == (-1, 'CPI')
+    assert EventCalendar().days_to_nearest(dates).tolist() == [NO_EVENT] * len(dates)
+    print("✓ Signed distances, ties to the past event, event filtering")
+
+def test_vectorized_matches_scalar_lookup():
+    print("Testing vectorized lookup over a bar history...")
+    
+    calendar = load_calendar().select('FOMC')
+    assert len(calendar) > 0
+    
+    bars = pd.bdate_range('2015-01-01', '2026-12-31')
+    days = calendar.days_to_nearest(bars)
+    
+    for bar, value in zip(bars, days):
+        distances = (calendar.dates - np.datetime64(bar.date(), 'D')).astype(np.int64)
+        assert abs(value) == np.abs(distances).min()
+    print(f"✓ {len(bars)} bars against {len(calendar)} FOMC dates")
+
+def test_fed_warning_as_of():
+    print("Testing Fed warnings as of a date...")
+    
+    strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM)
+    
+    assert strategy._get_fed_warning(datetime(2026, 1, 28, 15, 30)).startswith("FED MEETING TODAY")
+    assert strategy._get_fed_warning(datetime(2026, 1, 27)).startswith("FED MEETING TOMORROW")
+    assert strategy._get_fed_warning(datetime(2026, 1, 30)).startswith("FED MEETING IN 2 DAYS")
+    assert strategy._get_fed_warning(datetime(2026, 2, 10)) == ""
+    
+    history = strategy.evaluate_history(pd.DataFrame({'Close': 100.0}, index=pd.bdate_range('2026-01-20', '2026-02-06')))
+    flagged = history.index[np.abs(history['fed_days']) <= strategy.fed_warning_days]
+    assert flagged.strftime('%m-%d').tolist() == ['01-26', '01-27', '01-28', '01-29', '01-30']
+    print("✓ Warnings per date and per bar")
+
+if __name__ == "__main__":
+    test_days_to_nearest_event()
+    test_vectorized_matches_scalar_lookup()
+    test_fed_warning_as_of()
@@ -0,0 +1,74 @@
+import requests
+from data.http import CircuitBreaker, CircuitOpenError, ProviderSession, ThrottledError
+
+class FakeResponse:
+    def __init__(self, status_code: int, content: bytes):
+        self.status_code = status_code
+        self.content = content
+        self.headers = {}
+
+class ScriptedSession:
+    """Stands in for requests.Session, replaying canned responses"""
+    
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+    
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+def make_session(responses, breaker=None) -> ProviderSession:
+    session = ProviderSession(
+        "Test",
+        is_throttled=lambda payload: "Note" in payload,
+        max_retries=2,
+        backoff_seconds=0,
+        breaker=breaker
+    )
+    session.session = ScriptedSession(responses)
+    return session
+
+def test_retries_then_succeeds():
+    print("Testing retry with backoff...")
+    
+    session = make_session([
+        requests.Timeout("timed out"),
+        FakeResponse(200, b'{"Note": "slow down"}'),
+        FakeResponse(200, b'{"ok": true}')
+    ])
+    
+    assert session.get_json("https://example.com", {}) == {"ok": True}
+    assert session.session.calls == 3
+    assert session.breaker.state == 'closed'
+    print("✓ Timeout and throttle note were retried")
+
+def test_circuit_breaker_opens():
+    print("Testing circuit breaker...")
+    
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    session = make_session([FakeResponse(429, b'')] * 3, breaker=breaker)
+    
+    try:
+        session.get_json("https://example.com", {})
+        assert False, "expected ThrottledError"
+    except ThrottledError:
+        pass
+    
+    assert breaker.state == 'open'
+    try:
+        session.get_json("https://example.com", {})
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+    
+    # Nothing reached the provider once the circuit opened
+    assert session.session.calls == 3
+    print("✓ Circuit opened after retries were exhausted")
+
+if __name__ == "__main__":
+    test_retries_then_succeeds()
+    test_circuit_breaker_opens()
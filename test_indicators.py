@@ -0,0 +1,170 @@
+import json
+import pickle
+import tempfile
+import numpy as np
+from config.settings import StrategyConfig
+from data.resample import wall_clock_ns
+from data.synthetic import generate_ohlcv
+from strategies.indicators import IndicatorEngine, IndicatorStore
+from strategies.the_system import TheSystemStrategy
+
+def reference_columns(data):
+    strategy = TheSystemStrategy(StrategyConfig.THE_SYSTEM)
+    return strategy._calculate_all_moving_averages(data.copy())
+
+def test_incremental_matches_pandas():
+    print("Testing incremental indicators against pandas...")
+    
+    data = generate_ohlcv('SPY', periods=600)
+    strategy = TheSystemStrategy(StrategyConfig.THE_SYSTEM)
+    engine = strategy.indicator_engine
+    
+    # Warm up on 300 bars, then one new bar per "scan"
+    engine.update('SPY', data.iloc[:300])
+    for end in range(301, len(data) + 1):
+        values = engine.update('SPY', data.iloc[:end])
+    
+    reference = reference_columns(data)
+    for name, value in values.items():
+        assert value == reference[name].iloc[-1], name  # Bit for bit
+        assert engine.previous('SPY')[name] == reference[name].iloc[-2], name
+    print(f"✓ {len(values)} indicators identical after {len(data) - 300} incremental bars")
+
+def test_revised_last_bar():
+    print("Testing a revised open bar...")
+    
+    data = generate_ohlcv('SPY', periods=300)
+    engine = IndicatorEngine({'SMA_10': ('sma', 10), 'EMA_9': ('ema', 9)})
+    engine.update('SPY', data)
+    
+    revised = data.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] += 1.5
+    values = engine.update('SPY', revised)
+    
+    assert values['SMA_10'] == revised['Close'].rolling(10).mean().iloc[-1]
+    assert values['EMA_9'] == revised['Close'].ewm(span=9).mean().iloc[-1]
+    print("✓ Open bar revision undone and re-applied")
+
+def test_snapshot_restore():
+    print("Testing snapshot/restore...")
+    
+    data = generate_ohlcv('QQQ', periods=400)
+    specs = {'SMA_200': ('sma', 200), 'EMA_21': ('ema', 21)}
+    
+    engine = IndicatorEngine(specs)
+    engine.update('QQQ', data.iloc[:-1])
+    snapshot = json.loads(json.dumps(engine.snapshot()))
+    
+    restored = IndicatorEngine(specs)
+    restored.restore(snapshot)
+    values = restored.update('QQQ', data)
+    
+    assert values['SMA_200'] == data['Close'].rolling(200).mean().iloc[-1]
+    assert values['EMA_21'] == data['Close'].ewm(span=21).mean().iloc[-1]
+    assert np.isnan(IndicatorEngine(specs).update('QQQ', data.iloc[:50])['SMA_200'])
+    
+    # The open bar can still be revised after a restart
+    resumed = IndicatorEngine(specs)
+    resumed.restore(json.loads(json.dumps(restored.snapshot())))
+    assert resumed._states['QQQ'].can_revert
+    revised = data.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] += 2.0
+    values = resumed.update('QQQ', revised)
+    assert values['SMA_200'] == revised['Close'].rolling(200).mean().iloc[-1]
+    assert values['EMA_21'] == revised['Close'].ewm(span=21).mean().iloc[-1]
+    
+    # State saved with other specs is dropped rather than misread
+    other = IndicatorEngine({'SMA_200': ('sma', 100), 'EMA_21': ('ema', 21)})
+    other.restore(snapshot)
+    assert not other._states
+    print("✓ State survives a JSON round trip")
+
+def test_state_file_round_trip():
+    print("Testing indicator state in the state file...")
+    
+    from main import StateManager
+    data = generate_ohlcv('SPY', periods=300)
+    strategy = TheSystemStrategy(StrategyConfig.THE_SYSTEM)
+    strategy.indicator_engine.update('SPY', data)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        manager = StateManager(f"{directory}/last_signal.json")
+        manager.save_current_state([], {strategy.name: strategy.indicator_engine.snapshot()})
+        saved = manager.load_last_state()
+    
+    assert saved['signal_type'] is None
+    resumed = TheSystemStrategy(StrategyConfig.THE_SYSTEM, indicator_store=IndicatorStore())
+    resumed.indicator_engine.restore(saved['indicators'][strategy.name])
+    assert resumed.indicator_engine.latest('SPY') == strategy.indicator_engine.latest('SPY')
+    print("✓ Indicators resume from the saved state")
+
+def test_unreadable_state_is_rebuilt():
+    print("Testing indicator state from an older or damaged state file...")
+    
+    from main import StateManager, TradingSignalSystem
+    data = generate_ohlcv('SPY', periods=300)
+    strategy = TheSystemStrategy(StrategyConfig.THE_SYSTEM, indicator_store=IndicatorStore())
+    strategy.indicator_engine.update('SPY', data)
+    snapshot = json.loads(json.dumps(strategy.indicator_engine.snapshot()))
+    del snapshot['SPY']['last_close']
+    
+    with tempfile.TemporaryDirectory() as directory:
+        manager = StateManager(f"{directory}/last_signal.json")
+        manager.save_current_state([], {strategy.name: snapshot})
+        
+        system = TradingSignalSystem.__new__(TradingSignalSystem)
+        system.state_manager = manager
+        system.strategies = [TheSystemStrategy(StrategyConfig.THE_SYSTEM, indicator_store=IndicatorStore())]
+        system._restore_indicators()
+    
+    engine = system.strategies[0].indicator_engine
+    assert not engine._states
+    assert engine.update('SPY', data) == strategy.indicator_engine.latest('SPY')
+    print("✓ Unreadable indicator state falls back to a rebuild")
+
+def test_shared_indicator_store():
+    print("Testing the shared indicator store...")
+    
+    data = generate_ohlcv('SPY', periods=300)
+    store = IndicatorStore()
+    first = TheSystemStrategy(StrategyConfig.THE_SYSTEM, indicator_store=store)
+    second = TheSystemStrategy(StrategyConfig.THE_SYSTEM, indicator_store=store)
+    
+    frame = first._calculate_all_moving_averages(data)
+    assert second._calculate_all_moving_averages(data).equals(frame)
+    assert (store.misses, store.hits) == (5, 5)  # Each MA computed once
+    
+    sma = store.get('SPY', data, 'sma', 20)
+    assert not sma.flags.writeable
+    assert np.array_equal(sma, data['Close'].rolling(20).mean().to_numpy(), equal_nan=True)
+    
+    # A revised last bar is a new series
+    revised = data.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] += 1.0
+    assert store.get('SPY', revised, 'sma', 20)[-1] != sma[-1]
+    
+    # Running state and history panels go through the same store, by symbol
+    assert first.indicator_engine is second.indicator_engine
+    first._market_state_from_arrays(wall_clock_ns(data.index), data['Close'].to_numpy(), None, 'IWM')
+    assert second.indicator_engine.latest('IWM')['SMA_10'] == frame['SMA_10'].iloc[-1]
+    
+    store.hits = store.misses = 0
+    history = first.evaluate_history(data, symbol='IWM')
+    assert second.evaluate_history(data, symbol='IWM').equals(history)
+    assert store.hits == store.misses == 6  # Five averages and the higher timeframe means
+    other = TheSystemStrategy(dict(StrategyConfig.THE_SYSTEM, sma_10_period=5), indicator_store=store)
+    other.evaluate_history(data, symbol='IWM')
+    assert (store.hits, store.misses) == (11, 7)  # Only the new period is computed
+    
+    store.clear('IWM')
+    assert 'IWM' not in first.indicator_engine._states
+    assert len(pickle.loads(pickle.dumps(store))._entries) == 0  # Workers start empty
+    print("✓ Each series computed once per bar")
+
+if __name__ == "__main__":
+    test_incremental_matches_pandas()
+    test_revised_last_bar()
+    test_snapshot_restore()
+    test_state_file_round_trip()
+    test_unreadable_state_is_rebuilt()
+    test_shared_indicator_store()
@@ -0,0 +1,84 @@
+import numpy as np
+from datetime import datetime, timedelta
+from config.settings import StrategyConfig
+from data.memory_cache import LRUBarCache, frame_nbytes
+from data.synthetic import generate_ohlcv
+from strategies.the_system import TheSystemStrategy
+
+def test_lru_eviction_within_budget():
+    print("Testing byte-bounded LRU eviction...")
+    
+    frames = {symbol: generate_ohlcv(symbol, periods=500) for symbol in ['SPY', 'QQQ', 'IWM']}
+    size = frame_nbytes(frames['SPY'])
+    cache = LRUBarCache(max_bytes=int(size * 2.5))
+    
+    spy = cache.put('SPY', frames['SPY'])
+    cache.put('QQQ', frames['QQQ'])
+    assert cache.get('SPY') is spy  # SPY is now the most recent
+    cache.put('IWM', frames['IWM'])
+    
+    assert 'QQQ' not in cache and 'SPY' in cache and 'IWM' in cache
+    assert cache.bytes <= cache.max_bytes
+    assert cache.get('QQQ') is None
+    
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions']) == (1, 1, 1)
+    print(f"✓ {stats}")
+
+def test_cold_entries_compacted_before_eviction():
+    print("Testing compaction of cold entries...")
+    
+    spy, qqq = generate_ohlcv('SPY', periods=500), generate_ohlcv('QQQ', periods=500)
+    cache = LRUBarCache(max_bytes=int(frame_nbytes(spy) * 1.8), compact_cold=True)
+    
+    cache.put('SPY', spy)
+    cache.put('QQQ', qqq)
+    
+    cold = cache.peek('SPY')
+    assert cold['Close'].dtype == np.float32 and cold['Volume'].dtype == np.int32
+    assert cache.peek('QQQ')['Close'].dtype == np.float64
+    assert np.allclose(cold['Close'], spy['Close'], rtol=1e-6)
+    assert cache.stats()['compactions'] == 1 and cache.stats()['evictions'] == 0
+    print("✓ Cold entry compacted, nothing evicted")
+
+def test_expired_entries_are_misses():
+    print("Testing max_age...")
+    
+    cache = LRUBarCache(max_bytes=10 * 1024 * 1024)
+    stored_at = datetime(2025, 10, 16, 12, 0)
+    cache.put('SPY', generate_ohlcv('SPY'), stored_at)
+    
+    assert cache.get('SPY', max_age=timedelta(minutes=5), now=stored_at + timedelta(minutes=1)) is not None
+    assert cache.get('SPY', max_age=timedelta(minutes=5), now=stored_at + timedelta(minutes=6)) is None
+    assert cache.peek('SPY') is not None  # Kept so a refresh can merge into it
+    print("✓ Expired entry reported as a miss")
+
+def test_cached_bars_are_never_mutated():
+    print("Testing that analysis leaves cached bars untouched...")
+    
+    cache = LRUBarCache(max_bytes=10 * 1024 * 1024)
+    cache.put('SPY', generate_ohlcv('SPY', periods=150))
+    cached = cache.peek('SPY')
+    before = cached.copy()
+    
+    lookback = cached.iloc[-120:]
+    with_mas = TheSystemStrategy(StrategyConfig.THE_SYSTEM)._calculate_all_moving_averages(lookback)
+    
+    # Indicators are a separate float layer over the same base arrays
+    assert list(cached.columns) == list(before.columns)
+    assert with_mas['SMA_200'].dtype == np.float64 and with_mas['SMA_200'].isna().all()
+    assert np.shares_memory(with_mas['Close'].to_numpy(), cached['Close'].to_numpy())
+    
+    # In-place writes either raise (read-only arrays) or copy first (copy-on-write)
+    try:
+        with_mas.iloc[-1, with_mas.columns.get_loc('Close')] = 0.0
+    except ValueError:
+        pass
+    assert cached.equals(before)
+    print("✓ Cached bars unchanged")
+
+if __name__ == "__main__":
+    test_lru_eviction_within_budget()
+    test_cold_entries_compacted_before_eviction()
+    test_expired_entries_are_misses()
+    test_cached_bars_are_never_mutated()
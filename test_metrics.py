@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from backtesting import metrics
+
+def random_curves(periods: int = 1000, variants: int = 50, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, (periods, variants)), axis=0))
+
+def longest_underwater(equity) -> int:
+    longest = current = 0
+    peak = -np.inf
+    for value in equity:
+        if value >= peak:
+            peak, current = value, 0
+        else:
+            current += 1
+            longest = max(longest, current)
+    return longest
+
+def test_matrix_matches_single_curves():
+    print("Testing metrics over a matrix of equity curves...")
+    
+    equity = random_curves()
+    returns = pd.DataFrame(equity).pct_change().iloc[1:]
+    result = metrics.summary(equity)
+    
+    assert all(np.shape(values) == (50,) for values in result.values())
+    for column in (0, 17, 49):
+        single = metrics.summary(equity[:, column])
+        assert all(np.isclose(result[name][column], value) for name, value in single.items())
+    
+    assert np.allclose(result['volatility'], returns.std() * np.sqrt(252))
+    assert np.allclose(result['sharpe_ratio'], returns.mean() / returns.std() * np.sqrt(252))
+    assert np.allclose(result['max_drawdown'], (equity / np.maximum.accumulate(equity) - 1).min(axis=0))
+    assert all(result['max_drawdown_duration'][column] == longest_underwater(equity[:, column]) for column in range(10))
+    print(f"✓ {equity.shape[1]} curves in one call, matching per-curve and pandas results")
+
+def test_trade_metrics():
+    print("Testing trade metrics...")
+    
+    trades = np.array([[0.02, np.nan], [-0.01, 0.03], [0.04, np.nan], [np.nan, 0.01]])
+    assert np.allclose(metrics.win_rate(trades), [2 / 3, 1.0])
+    assert np.allclose(metrics.profit_factor(trades), [6.0, np.inf])
+    assert metrics.exposure(np.array([True, False, True, True])) == 0.75
+    print("✓ Win rate, profit factor and exposure ignore padding")
+
+def test_rolling_metrics():
+    print("Testing rolling metrics...")
+    
+    equity = random_curves(periods=600, variants=5, seed=1)
+    returns = pd.DataFrame(equity).pct_change()
+    window = 63
+    
+    volatility = metrics.rolling_volatility(equity, window)
+    assert np.allclose(volatility, returns.rolling(window).std() * np.sqrt(252), equal_nan=True, rtol=1e-7)
+    
+    sharpe = metrics.rolling_sharpe_ratio(equity, window)
+    expected = returns.rolling(window).mean() / returns.rolling(window).std() * np.sqrt(252)
+    assert np.allclose(sharpe, expected, equal_nan=True, rtol=1e-6)
+    
+    drawdown = metrics.rolling_max_drawdown(equity, window)
+    duration = metrics.rolling_max_drawdown_duration(equity, window)
+    assert np.isnan(drawdown[:window]).all()
+    for row in (window, 300, len(equity) - 1):
+        assert np.allclose(drawdown[row], metrics.max_drawdown(equity[row - window:row + 1]))
+        assert np.array_equal(duration[row], metrics.max_drawdown_duration(equity[row - window:row + 1]))
+    
+    trade_returns = np.where(np.random.default_rng(2).random(equity.shape) < 0.1, returns.fillna(0).to_numpy(), np.nan)
+    win_rate = metrics.rolling_win_rate(trade_returns, 50)
+    assert np.allclose(win_rate[400], metrics.win_rate(trade_returns[351:401]), equal_nan=True)
+    print(f"✓ Rolling metrics over {window}-bar windows match full-window recomputation")
+
+if __name__ == "__main__":
+    test_matrix_matches_single_curves()
+    test_trade_metrics()
+    test_rolling_metrics()
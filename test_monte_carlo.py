@@ -0,0 +1,61 @@
+import time
+import numpy as np
+from backtesting.backtester import StrategyBacktester
+from backtesting.monte_carlo import bootstrap, percentiles, resample_indices
+from config.settings import BacktestConfig
+from data.synthetic import SyntheticMarketGenerator
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+def test_paths_match_compounded_trades():
+    print("Testing bootstrapped paths against compounded equity...")
+    
+    returns = np.random.default_rng(0).normal(0.004, 0.03, 80)
+    for block_size in (1, 4):
+        results = bootstrap(returns, paths=300, block_size=block_size, seed=7, max_elements=1000)
+        rng = np.random.default_rng(7)
+        indices = np.concatenate([resample_indices(rng, 80, 12, block_size) for _ in range(25)], axis=1)  # 1000 // 80 paths per chunk
+        
+        for path in range(300):
+            equity = np.concatenate(([1.0], np.cumprod(1 + returns[indices[:, path]])))
+            assert np.isclose(results['total_return'][path], equity[-1] - 1)
+            assert np.isclose(results['max_drawdown'][path], (equity / np.maximum.accumulate(equity) - 1).min())
+        
+        if block_size > 1:
+            assert (np.diff(indices[:4], axis=0) % 80 == 1).all()  # First block of every path
+    print("✓ IID and block paths match their compounded trade sequences")
+
+def test_hundred_thousand_paths():
+    print("Testing 100k bootstrapped paths...")
+    
+    returns = np.random.default_rng(1).normal(0.005, 0.03, 150)
+    started = time.perf_counter()
+    table = percentiles(bootstrap(returns, seed=0))
+    elapsed = time.perf_counter() - started
+    
+    assert table['total_return'].is_monotonic_increasing and table['max_drawdown'].is_monotonic_increasing
+    assert np.isclose(table.loc[50, 'total_return'], np.prod(1 + returns) - 1, rtol=0.5)
+    assert (table['max_drawdown'] <= 0).all()
+    assert elapsed < 2.0
+    print(f"✓ 100000 paths of {len(returns)} trades in {elapsed * 1000:.0f} ms")
+
+def test_runs_after_backtest():
+    print("Testing Monte Carlo percentiles in backtest results...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=5).generate(1500)
+    start, end = (str(data['SPY'].index[row].date()) for row in (300, 1400))
+    strategy = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM)
+    
+    # The default config bootstraps every backtest
+    results = StrategyBacktester(strategy).backtest(start, end, data)
+    table = results['monte_carlo']
+    assert list(table.columns) == ['total_return', 'max_drawdown'] and 50 in table.index
+    assert table.loc[1, 'total_return'] < results['metrics']['total_return'] < table.loc[99, 'total_return']
+    
+    disabled = StrategyBacktester(strategy, config=BacktestConfig(monte_carlo_paths=0)).backtest(start, end, data)
+    assert disabled['monte_carlo'].empty
+    print(f"✓ Median bootstrapped return {table.loc[50, 'total_return']:.1%}, 5th percentile drawdown {table.loc[5, 'max_drawdown']:.1%}")
+
+if __name__ == "__main__":
+    test_paths_match_compounded_trades()
+    test_hundred_thousand_paths()
+    test_runs_after_backtest()
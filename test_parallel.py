@@ -0,0 +1,80 @@
+import time
+from datetime import datetime
+from typing import Dict, List
+from strategies.base_strategy import BaseStrategy, Signal
+from strategies.the_system import EnhancedStrategyConfig, TheSystemStrategy
+from utils.parallel import StrategyPool
+
+class SleepyStrategy(BaseStrategy):
+    """Emits one signal after sleeping, or raises"""
+    
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        super().__init__(name, {})
+        self.delay = delay
+        self.fail = fail
+    
+    def get_required_data(self) -> Dict:
+        return {}
+    
+    def analyze(self, data) -> List[Signal]:
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("bad data")
+        return [Signal(self.name, 'SPY', 'BUY_CROSS', 80, datetime(2025, 10, 16), 660.0, 650.0, 640.0, 1.5)]
+
+def test_pool_merges_in_order_with_timeouts():
+    print("Testing the strategy process pool...")
+    
+    tasks = [
+        SleepyStrategy('slow', 0.6),
+        SleepyStrategy('fast', 0.0),
+        SleepyStrategy('stuck', 30),
+        SleepyStrategy('broken', 0.0, fail=True)
+    ]
+    
+    start = time.perf_counter()
+    with StrategyPool(max_workers=4, task_timeout=2) as pool:
+        for task in tasks:
+            pool.submit(task, {})
+        results = pool.results()
+    elapsed = time.perf_counter() - start
+    
+    # Submission order, not completion order; failures are None
+    assert [task.name for task, _ in results] == ['slow', 'fast', 'stuck', 'broken']
+    assert [signals[0].strategy_name if signals else None for _, signals in results] == ['slow', 'fast', None, None]
+    assert elapsed < 10  # The stuck task didn't hold up the scan
+    print(f"✓ 4 tasks merged deterministically in {elapsed:.1f}s")
+
+def test_timeout_counts_from_task_start():
+    print("Testing timeouts of queued tasks...")
+    
+    # One worker: the second task waits 0.7s in the queue, then runs 0.7s of its own 1s budget
+    with StrategyPool(max_workers=1, task_timeout=1) as pool:
+        for name in ('first', 'second'):
+            pool.submit(SleepyStrategy(name, 0.7), {})
+        results = pool.results()
+    assert [signals[0].strategy_name for _, signals in results] == ['first', 'second']
+    
+    # A stuck task holding the only worker doesn't leave the queued ones waiting forever
+    start = time.perf_counter()
+    with StrategyPool(max_workers=1, task_timeout=0.5) as pool:
+        for task in (SleepyStrategy('stuck', 30), SleepyStrategy('queued', 0.0)):
+            pool.submit(task, {})
+        results = pool.results()
+    assert [signals for _, signals in results] == [None, None] and time.perf_counter() - start < 5
+    print("✓ Queued tasks get their full timeout")
+
+def test_universe_sharding():
+    strategy = TheSystemStrategy(dict(EnhancedStrategyConfig.THE_SYSTEM, universe=[f"SYM{i}" for i in range(250)]))
+    shards = strategy.shard(100)
+    
+    assert [len(shard.universe) for shard in shards] == [100, 100, 50]
+    assert sum((shard.universe for shard in shards), []) == strategy.universe
+    assert [shard.task_name for shard in shards][-1] == "The System [SYM200..SYM249, 50 symbols]"
+    assert shards[0].name == "The System"  # Signals keep the strategy name
+    assert TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM).shard(100)[0].universe == []
+
+if __name__ == "__main__":
+    test_pool_merges_in_order_with_timeouts()
+    test_timeout_counts_from_task_start()
+    test_universe_sharding()
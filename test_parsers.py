@@ -0,0 +1,24 @@
+import numpy as np
+from data.parsers import loads_json, parse_time_series
+
+def test_parse_time_series():
+    print("Testing Alpha Vantage time series parsing...")
+    
+    content = b'''{"Time Series (Daily)": {
+        "2025-10-16": {"1. open": "662.1", "2. high": "665.0", "3. low": "658.2", "4. close": "660.0", "5. volume": "81234567"},
+        "2025-10-15": {"1. open": "655.0", "2. high": "661.3", "3. low": "654.1", "4. close": "659.5", "5. volume": "79000000"}
+    }}'''
+    
+    df = parse_time_series(loads_json(content)["Time Series (Daily)"])
+    
+    assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert df.index.is_monotonic_increasing
+    assert str(df.index[-1].date()) == '2025-10-16'
+    assert df['Close'].tolist() == [659.5, 660.0]
+    assert df['Volume'].dtype == np.int64
+    assert parse_time_series({}).empty
+    
+    print(f"✓ Parsed {len(df)} rows")
+
+if __name__ == "__main__":
+    test_parse_time_series()
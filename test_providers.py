@@ -0,0 +1,76 @@
+import tempfile
+import pandas as pd
+from config.settings import DataConfig
+from data.market_data import MarketDataFetcher
+from data.providers.base import DataProvider
+from data.providers.local import LocalDirectoryProvider
+from data.synthetic import generate_ohlcv
+
+class BatchProvider(DataProvider):
+    """Batch-capable provider that only knows some symbols"""
+    
+    supports_batch = True
+    
+    def __init__(self, known):
+        super().__init__("Batch")
+        self.known = known
+        self.batches = []
+    
+    def fetch(self, symbol, timeframe='1d', outputsize='compact'):
+        return self.fetch_many([symbol], timeframe, outputsize).get(symbol, pd.DataFrame())
+    
+    def fetch_many(self, symbols, timeframe='1d', outputsize='compact'):
+        self.batches.append(list(symbols))
+        return {symbol: generate_ohlcv(symbol, periods=300) for symbol in symbols if symbol in self.known}
+
+def test_batched_fetch_with_fallback():
+    print("Testing batched provider chain...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        # The fallback provider reads CSV files from a directory
+        generate_ohlcv('DIA', periods=300).to_csv(f"{root}/DIA.csv")
+        
+        batch = BatchProvider(known={'SPY', 'QQQ', 'IWM'})
+        local = LocalDirectoryProvider(root)
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_enabled=False), providers=[batch, local])
+        
+        data = fetcher.get_data(['SPY', 'QQQ', 'IWM', 'DIA'], '1d', 220)
+        
+        # One request for the whole universe, a compact retry for what it missed, then the fallback
+        assert batch.batches == [['SPY', 'QQQ', 'IWM', 'DIA'], ['DIA']]
+        assert list(data.keys()) == ['SPY', 'QQQ', 'IWM', 'DIA']
+        assert len(data['DIA']) == 220  # Sliced to the requested lookback
+    
+    print("✓ One batched request plus local fallback")
+
+class CompactOnlyProvider(BatchProvider):
+    """Batch provider on an API plan without full history"""
+    
+    def fetch_many(self, symbols, timeframe='1d', outputsize='compact'):
+        self.batches.append((outputsize, list(symbols)))
+        return {} if outputsize == 'full' else {symbol: generate_ohlcv(symbol, periods=100) for symbol in symbols}
+
+def test_batched_backfill_falls_back_to_compact():
+    print("Testing batched backfill without full history...")
+    
+    with tempfile.TemporaryDirectory() as root:
+        provider = CompactOnlyProvider(known=set())
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        
+        data = fetcher.get_data(['SPY', 'QQQ'], '1d', 50)
+        
+        assert provider.batches == [('full', ['SPY', 'QQQ']), ('compact', ['SPY', 'QQQ'])]
+        assert all(len(data[symbol]) == 50 for symbol in ('SPY', 'QQQ'))
+        
+        # The short stored history is kept and full history isn't asked for again
+        provider.batches = []
+        fetcher = MarketDataFetcher(DataConfig(disk_cache_dir=root), providers=[provider])
+        data = fetcher._fetch_and_cache(['SPY', 'QQQ'], '1d', 200)
+        assert provider.batches == [('compact', ['SPY', 'QQQ'])]
+        assert all(len(data[symbol]) == 100 for symbol in ('SPY', 'QQQ'))
+    
+    print("✓ New symbols fall back to the compact window in one batch")
+
+if __name__ == "__main__":
+    test_batched_fetch_with_fallback()
+    test_batched_backfill_falls_back_to_compact()
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from data.resample import period_closes, period_labels, period_starts, resample_bars, wall_clock_ns
+from data.synthetic import generate_ohlcv
+
+def test_weekly_bars():
+    print("Testing weekly resampling...")
+    
+    daily = generate_ohlcv('SPY', periods=300)
+    weekly = resample_bars(daily, '1wk')
+    
+    groups = daily.groupby(daily.index.to_period('W-FRI'))
+    assert weekly['Open'].tolist() == groups['Open'].first().tolist()
+    assert weekly['High'].tolist() == groups['High'].max().tolist()
+    assert weekly['Low'].tolist() == groups['Low'].min().tolist()
+    assert weekly['Close'].tolist() == groups['Close'].last().tolist()
+    assert weekly['Volume'].tolist() == groups['Volume'].sum().tolist()
+    assert weekly.index[-1] == daily.index[-1]  # Open week is as of the latest bar
+    
+    monthly = resample_bars(daily, '1mo')
+    assert len(monthly) == daily.index.to_period('M').nunique()
+    print(f"✓ {len(daily)} daily bars -> {len(weekly)} weekly, {len(monthly)} monthly")
+
+def test_intraday_buckets():
+    index = pd.date_range('2025-10-16 09:30', periods=26, freq='15min')
+    bars = pd.DataFrame({'Open': 1.0, 'High': np.arange(26.0), 'Low': 0.0, 'Close': np.arange(26.0), 'Volume': 10}, index=index)
+    
+    four_hour = resample_bars(bars, '4h')
+    assert four_hour['Volume'].sum() == 260
+    assert four_hour['Close'].iloc[-1] == 25.0
+
+def test_array_labels_match_pandas_periods():
+    print("Testing period labels computed on raw timestamps...")
+    
+    days = pd.date_range('1995-01-01', '2030-12-31', freq='D')
+    for timeframe, freq in (('1wk', 'W-FRI'), ('1mo', 'M')):
+        assert np.array_equal(period_starts(period_labels(days, timeframe)), period_starts(days.to_period(freq).asi8))
+    
+    minutes = pd.date_range('2025-03-01', periods=5000, freq='7min', tz='US/Eastern')
+    for timeframe in ('1h', '4h'):
+        expected = minutes.tz_localize(None).floor(timeframe).asi8
+        assert np.array_equal(period_starts(period_labels(minutes, timeframe)), period_starts(expected))
+    
+    daily = generate_ohlcv('SPY', periods=300)
+    closes = period_closes(wall_clock_ns(daily.index), daily['Close'].to_numpy(), '1wk')
+    assert np.array_equal(closes, resample_bars(daily, '1wk')['Close'].to_numpy())
+    print("✓ Weekly, monthly and intraday boundaries match pandas")
+
+if __name__ == "__main__":
+    test_weekly_bars()
+    test_intraday_buckets()
+    test_array_labels_match_pandas_periods()
@@ -0,0 +1,137 @@
+import tempfile
+import numpy as np
+import pandas as pd
+from backtesting.backtester import StrategyBacktester
+from backtesting.result_store import ResultStore
+from backtesting.sweep import METRIC_COLUMNS
+from config.settings import BacktestConfig
+from data.synthetic import SyntheticMarketGenerator
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+def run_backtest(data, fast: int) -> dict:
+    strategy = TheSystemStrategy({**EnhancedStrategyConfig.THE_SYSTEM, 'sma_10_period': fast})
+    return StrategyBacktester(strategy, config=BacktestConfig(monte_carlo_paths=2000)).backtest(str(data['SPY'].index[300].date()), str(data['SPY'].index[-1].date()), data)
+
+def test_backtests_round_trip():
+    print("Testing backtest results through the result store...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=5).generate(1200)
+    runs = [({'sma_10_period': fast, 'start': 300}, run_backtest(data, fast)) for fast in (5, 10, 20)]
+    path = tempfile.mkdtemp()
+    
+    store = ResultStore(path)
+    store.append(runs[:2])
+    second = store.append(runs[2:])
+    
+    reopened = ResultStore(path)
+    assert len(reopened) == 3
+    found = reopened.find(sma_10_period=20)
+    assert list(found['part']) == [second] and np.isclose(found['total_return'][0], runs[2][1]['metrics']['total_return'])
+    
+    for params, results in runs:
+        stored = reopened.get(params)
+        assert np.array_equal(stored['equity_curve'].to_numpy(), results['equity_curve'].to_numpy())
+        assert (stored['equity_curve'].index == results['equity_curve'].index).all()
+        assert (stored['trades']['entry_time'] == results['trades']['entry_time']).all()
+        assert list(stored['trades']['exit_reason']) == list(results['trades']['exit_reason'])
+        assert stored['metrics']['total_trades'] == results['metrics']['total_trades']
+        assert isinstance(stored['metrics']['total_trades'], int)
+        pd.testing.assert_frame_equal(stored['monte_carlo'], results['monte_carlo'])
+    
+    assert reopened.get({'sma_10_period': 8, 'start': 300}) is None
+    print(f"✓ {len(reopened)} backtests stored in 2 parts, reopened and queried by parameters")
+
+def test_timezones_and_cache():
+    print("Testing timezone-aware results and cached reruns...")
+    
+    index = pd.date_range('2024-01-02 16:00', periods=5, freq='D', tz='US/Eastern')
+    results = {
+        'equity_curve': pd.Series([100.0, 101, 99, 102, 103], index=index, name='equity'),
+        'trades': pd.DataFrame({'entry_time': index[[0, 2]], 'exit_time': index[[1, 4]], 'return': [0.01, 0.04]}),
+        'metrics': {'total_return': 0.03}
+    }
+    store = ResultStore(tempfile.mkdtemp())
+    calls = []
+    
+    def run():
+        calls.append(1)
+        return results
+    
+    store.cached({'run': 'tz'}, run)
+    stored = store.cached({'run': 'tz'}, run)
+    assert len(calls) == 1
+    assert (stored['equity_curve'].index == index).all() and str(stored['equity_curve'].index.tz) == 'US/Eastern'
+    assert (stored['trades']['exit_time'] == results['trades']['exit_time']).all()
+    print("✓ Timestamps keep their timezone and the second run is read back")
+
+def test_concurrent_writers():
+    print("Testing two stores appending to one directory...")
+    
+    path = tempfile.mkdtemp()
+    first, second = ResultStore(path), ResultStore(path)
+    assert len(first) == 0
+    
+    names = [store.append([({'run': run}, {'metrics': {'total_trades': run, 'total_return': 0.1 * run}})])
+             for run, store in enumerate([first, second, first, second])]
+    assert len(set(names)) == 4 and names == sorted(names)
+    assert len(first) == len(second) == 4  # Each sees the other's parts
+    assert first.get({'run': 3})['metrics']['total_trades'] == 3
+    print("✓ Unique part names, every part visible to every store")
+
+def test_cache_hit_matches_miss():
+    print("Testing cached results are the same on a hit and a miss...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=5).generate(800)
+    store = ResultStore(tempfile.mkdtemp())
+    miss = store.cached({'sma_10_period': 10}, lambda: run_backtest(data, 10))
+    hit = store.cached({'sma_10_period': 10}, lambda: run_backtest(data, 10))
+    
+    assert set(miss) == set(hit) == {'trades', 'equity_curve', 'metrics', 'monte_carlo'}
+    assert miss['metrics'] == hit['metrics'] and type(hit['metrics']['total_signals']) is int
+    pd.testing.assert_frame_equal(miss['trades'], hit['trades'])
+    pd.testing.assert_frame_equal(miss['monte_carlo'], hit['monte_carlo'])
+    pd.testing.assert_series_equal(miss['equity_curve'], hit['equity_curve'])
+    print("✓ Same keys, values and dtypes")
+
+def test_strategy_config_as_params():
+    print("Testing a full strategy config as the cache key...")
+    
+    params = dict(EnhancedStrategyConfig.THE_SYSTEM, start='2024-01-02')  # Has universe=[] and event_calendar_path=None
+    store = ResultStore(tempfile.mkdtemp())
+    calls = []
+    
+    def run():
+        calls.append(1)
+        return {'metrics': {'total_trades': 4, 'total_return': 0.05}}
+    
+    first = store.cached(params, run)
+    second = store.cached(params, run)
+    assert len(calls) == 1 and len(store.parts()) == 1
+    assert first['metrics'] == second['metrics']
+    assert len(store.find(universe=[], event_calendar_path=None)) == 1
+    assert store.find(universe=['SPY']).empty
+    print("✓ List and None parameters stored as text and matched on the next run")
+
+def test_sweep_results():
+    print("Testing sweep results in the result store...")
+    
+    rng = np.random.default_rng(0)
+    results = pd.DataFrame({'sma_10_period': rng.choice([5, 10, 20], 5000), 'min_confidence': rng.choice([50, 60, 70], 5000)})
+    for column in METRIC_COLUMNS:
+        results[column] = rng.random(5000)
+    
+    store = ResultStore(tempfile.mkdtemp())
+    store.append_sweep(results, METRIC_COLUMNS)
+    found = store.find(sma_10_period=10, min_confidence=60)
+    expected = results[(results['sma_10_period'] == 10) & (results['min_confidence'] == 60)]
+    assert np.array_equal(found['row'], expected.index) and np.allclose(found['hit_rate'], expected['hit_rate'])
+    assert store.load(found['part'][0], int(found['row'][0]))['trades'].empty
+    print(f"✓ {len(found)} of {len(results)} sweep rows selected from the mapped parameter columns")
+
+if __name__ == "__main__":
+    test_backtests_round_trip()
+    test_timezones_and_cache()
+    test_concurrent_writers()
+    test_cache_hit_matches_miss()
+    test_strategy_config_as_params()
+    test_sweep_results()
@@ -0,0 +1,77 @@
+import asyncio
+import threading
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import DataConfig
+from data.market_data import MarketDataFetcher
+from data.providers.base import DataProvider
+
+class SlowProvider(DataProvider):
+    """Provider with a slow network call that counts requests"""
+    
+    def __init__(self):
+        super().__init__("Slow")
+        self.calls = 0
+        self._lock = threading.Lock()
+    
+    def fetch(self, symbol: str, timeframe: str = '1d', outputsize: str = 'compact') -> pd.DataFrame:
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.2)
+        dates = pd.bdate_range(end='2025-10-16', periods=250)
+        return pd.DataFrame({'Open': 1.0, 'High': 1.0, 'Low': 1.0, 'Close': 1.0, 'Volume': 1}, index=dates)
+
+def test_concurrent_requests_share_one_fetch():
+    print("Testing single-flight fetching from threads...")
+    
+    provider = SlowProvider()
+    fetcher = MarketDataFetcher(DataConfig(disk_cache_enabled=False), providers=[provider])
+    
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: fetcher.get_data('SPY', '1d', 220), range(8)))
+    
+    assert provider.calls == 1
+    # Every caller gets a view over the same cached arrays
+    assert all(np.shares_memory(result['Close'].values, results[0]['Close'].values) for result in results)
+    print("✓ 8 concurrent callers, 1 network request")
+
+def test_async_callers_share_one_fetch():
+    print("Testing single-flight fetching from asyncio...")
+    
+    provider = SlowProvider()
+    fetcher = MarketDataFetcher(DataConfig(disk_cache_enabled=False), providers=[provider])
+    
+    async def scan():
+        return await asyncio.gather(*[fetcher.get_data_async(['SPY', 'QQQ'], '1d', 220) for _ in range(5)])
+    
+    results = asyncio.run(scan())
+    
+    assert provider.calls == 2  # One per symbol
+    assert all(list(result.keys()) == ['SPY', 'QQQ'] for result in results)
+    print("✓ 5 concurrent scans, 2 network requests")
+
+def test_lookbacks_slice_one_cached_history():
+    print("Testing lookbacks served from one cached history...")
+    
+    provider = SlowProvider()
+    fetcher = MarketDataFetcher(DataConfig(disk_cache_enabled=False), providers=[provider])
+    
+    short = fetcher.get_data('SPY', '1d', 120)
+    long = fetcher.get_data('SPY', '1d', 220)
+    
+    assert provider.calls == 1
+    assert len(short) == 120 and len(long) == 220
+    assert short.index[-1] == long.index[-1]
+    assert np.shares_memory(short['Close'].values, long['Close'].values)
+    
+    # Adding columns to a slice leaves the cached history untouched
+    long = long.assign(SMA_20=long['Close'].rolling(20).mean())
+    assert 'SMA_20' not in fetcher.get_data('SPY', '1d', 220).columns
+    print("✓ 120 and 220 bar lookbacks, 1 network request")
+
+if __name__ == "__main__":
+    test_concurrent_requests_share_one_fetch()
+    test_async_callers_share_one_fetch()
+    test_lookbacks_slice_one_cached_history()
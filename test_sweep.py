@@ -0,0 +1,64 @@
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from backtesting.sweep import ParameterSweep, parameter_grid, random_samples, read_results, score_history, write_results
+from data.synthetic import SyntheticMarketGenerator
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+def test_grid_and_random_samples():
+    print("Testing parameter grids and random samples...")
+    
+    grid = parameter_grid({'sma_10_period': [10, 50], 'sma_50_period': [50, 100], 'min_confidence': [60, 70]})
+    assert len(grid) == 6  # sma_10 50 / sma_50 50 is skipped
+    
+    samples = random_samples({'oversold_threshold': (-6.0, -1.0), 'nasdaq_lookback_days': (3, 10), 'ema_9_period': [5, 9]}, 50, seed=1)
+    assert len(samples) == 50
+    assert all(-6.0 <= sample['oversold_threshold'] <= -1.0 for sample in samples)
+    assert all(isinstance(sample['nasdaq_lookback_days'], int) for sample in samples)
+    assert samples == random_samples({'oversold_threshold': (-6.0, -1.0), 'nasdaq_lookback_days': (3, 10), 'ema_9_period': [5, 9]}, 50, seed=1)
+    print(f"✓ {len(grid)} grid points, {len(samples)} reproducible samples")
+
+def test_sweep_matches_individual_runs():
+    print("Testing sweep scores against one-off evaluations...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=3).generate(600)
+    configs = parameter_grid({'sma_10_period': [8, 10], 'sma_50_period': [40, 50], 'overbought_threshold': [2.0, 3.0]})
+    
+    serial = ParameterSweep(data, horizon=5).run(configs)
+    parallel = ParameterSweep(data, horizon=5, max_workers=2, chunk_size=3).run(configs)
+    pd.testing.assert_frame_equal(serial, parallel)
+    
+    close = data['SPY']['Close'].to_numpy()
+    forward_returns = np.append(close[5:] / close[:-5] - 1, [np.nan] * 5)
+    for row, config in zip(serial.to_dict('records'), configs):
+        strategy = TheSystemStrategy({**EnhancedStrategyConfig.THE_SYSTEM, **config})
+        expected = score_history(strategy.evaluate_history(data['SPY'], data['QQQ']), forward_returns, strategy.config['min_confidence'])
+        assert all(row[name] == value or (np.isnan(row[name]) and np.isnan(value)) for name, value in expected.items())
+    print(f"✓ {len(configs)} configurations, serial == parallel == individual")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_results(serial, os.path.join(directory, 'sweep'))
+        pd.testing.assert_frame_equal(read_results(path), serial)
+    print("✓ Results round-trip through the columnar file")
+
+def test_text_parameters_and_horizon():
+    print("Testing text parameters and the forward horizon...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=3).generate(400)
+    results = ParameterSweep(data, horizon=1).run(parameter_grid({'higher_timeframe': ['1wk', '1mo'], 'min_confidence': [50, 70]}))
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_results(results, os.path.join(directory, 'sweep'))
+        pd.testing.assert_frame_equal(read_results(path), results)
+    
+    try:
+        ParameterSweep(data, horizon=0)
+        assert False, "horizon 0 accepted"
+    except ValueError:
+        pass
+    print("✓ Text columns saved without pickling, horizon below 1 rejected")
+
+if __name__ == "__main__":
+    test_grid_and_random_samples()
+    test_sweep_matches_individual_runs()
+    test_text_parameters_and_horizon()
@@ -0,0 +1,58 @@
+import contextlib
+import io
+import time
+import numpy as np
+import pandas as pd
+from data.synthetic import SyntheticMarketGenerator
+from strategies.indicators import ewm_mean, rolling_mean
+from strategies.the_system import EnhancedStrategyConfig, TheSystemStrategy
+
+def test_panel_kernels_match_pandas():
+    print("Testing panel moving averages against pandas...")
+    
+    rng = np.random.default_rng(2)
+    panel = np.cumsum(rng.normal(0, 1, (250, 300)), axis=0) + 100
+    panel[:80, 3] = np.nan            # Listed later
+    panel[120:150, 5] = panel[120, 5]  # Flat run
+    panel[rng.integers(0, 250, 40), rng.integers(0, 300, 40)] = np.nan
+    frame = pd.DataFrame(panel)
+    
+    for window in (10, 50, 200):
+        assert np.array_equal(rolling_mean(panel, window), frame.rolling(window).mean().to_numpy(), equal_nan=True)
+    for span in (9, 21):
+        assert np.array_equal(ewm_mean(panel, span), frame.ewm(span=span).mean().to_numpy(), equal_nan=True)
+    print("✓ Identical to pandas column by column")
+
+def test_universe_scan():
+    print("Testing universe scan...")
+    
+    symbols = ['SPY', 'QQQ'] + [f"SYM{i:03d}" for i in range(500)]
+    data = SyntheticMarketGenerator(symbols, seed=3, volatility=0.02).generate(220)
+    data['SYM007'] = data['SYM007'].iloc[60:]  # Shorter history than the rest
+    
+    strategy = TheSystemStrategy(dict(EnhancedStrategyConfig.THE_SYSTEM, universe=symbols))
+    assert strategy.get_required_data()['symbols'] == symbols
+    
+    as_of = data['SPY'].index[-1].to_pydatetime()
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        signals = strategy.analyze(data, as_of=as_of)
+        elapsed = time.perf_counter() - start
+    
+    assert signals and len({signal.symbol for signal in signals}) > 1
+    
+    # Each column gets exactly what the single-symbol scan would give it
+    for symbol in ['SPY', 'SYM007'] + [signal.symbol for signal in signals[:5]]:
+        single = TheSystemStrategy(EnhancedStrategyConfig.THE_SYSTEM)
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = single.analyze({'SPY': data[symbol], 'QQQ': data['QQQ']}, as_of=as_of)
+        got = [signal for signal in signals if signal.symbol == symbol]
+        
+        assert [(s.signal_type, s.confidence, s.notes, s.sma_10, s.sma_50) for s in got] == \
+               [(s.signal_type, s.confidence, s.notes, s.sma_10, s.sma_50) for s in expected]
+    
+    print(f"✓ {len(symbols)} symbols scanned in {elapsed * 1000:.0f}ms, {len(signals)} signals")
+
+if __name__ == "__main__":
+    test_panel_kernels_match_pandas()
+    test_universe_scan()
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+from backtesting.backtester import StrategyBacktester
+from backtesting.walk_forward import WalkForwardAnalysis, walk_forward_windows
+from data.synthetic import SyntheticMarketGenerator
+from strategies.the_system import TheSystemStrategy, EnhancedStrategyConfig
+
+CONFIGS = [
+    {'sma_10_period': 10, 'sma_50_period': 50, 'min_confidence': 60},
+    {'sma_10_period': 5, 'sma_50_period': 30, 'min_confidence': 50},
+    {'sma_10_period': 20, 'sma_50_period': 100, 'min_confidence': 70}
+]
+
+def test_windows():
+    print("Testing walk-forward windows...")
+    
+    rolling = walk_forward_windows(1000, 300, 200, start=100)
+    assert rolling == [(100, 400, 400, 600), (300, 600, 600, 800), (500, 800, 800, 1000)]
+    anchored = walk_forward_windows(1050, 300, 200, start=100, anchored=True)
+    assert [window[0] for window in anchored] == [100] * 4 and anchored[-1][2:] == (1000, 1050)
+    assert walk_forward_windows(300, 300, 50) == []
+    print("✓ Rolling and anchored windows tile the history")
+
+def test_matches_backtester_per_window():
+    print("Testing walk-forward against per-window backtests...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=3).generate(1400)
+    results = WalkForwardAnalysis(data, CONFIGS, train_bars=400, test_bars=200, warmup_bars=200).run()
+    windows = results['windows']
+    assert len(windows) == 4
+    
+    capital = 10000
+    for _, window in windows.iterrows():
+        scores = []
+        for config in CONFIGS:
+            backtester = StrategyBacktester(TheSystemStrategy({**EnhancedStrategyConfig.THE_SYSTEM, **config}))
+            train = backtester.backtest(str(window['train_start'].date()), str(window['train_end'].date()), data)
+            scores.append(train['metrics']['sharpe_ratio'])
+        best = CONFIGS[int(np.nanargmax(scores))]
+        assert all(window[name] == value for name, value in best.items())
+        assert np.isclose(window['train_score'], np.nanmax(scores))
+        
+        backtester = StrategyBacktester(TheSystemStrategy({**EnhancedStrategyConfig.THE_SYSTEM, **best}))
+        test = backtester.backtest(str(window['test_start'].date()), str(window['test_end'].date()), data)
+        stitched = results['equity_curve'].loc[window['test_start']:window['test_end']]
+        assert np.allclose(stitched.to_numpy(), test['equity_curve'].to_numpy() * capital / 10000, rtol=1e-12)
+        capital = stitched.iloc[-1]
+    
+    assert results['equity_curve'].index[0] == windows['test_start'].iloc[0]
+    assert results['equity_curve'].index[-1] == data['SPY'].index[-1]
+    assert np.isclose(results['metrics']['total_return'], capital / 10000 - 1)
+    print(f"✓ {len(windows)} windows pick the best train config and chain its test equity")
+
+def test_objectives():
+    print("Testing walk-forward objectives...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=3).generate(1000)
+    for objective, pick in (('win_rate', np.nanargmax), ('max_drawdown_duration', np.nanargmin)):
+        windows = WalkForwardAnalysis(data, CONFIGS, train_bars=400, test_bars=200, objective=objective).run()['windows']
+        for _, window in windows.iterrows():
+            scores = []
+            for config in CONFIGS:
+                backtester = StrategyBacktester(TheSystemStrategy({**EnhancedStrategyConfig.THE_SYSTEM, **config}))
+                train = backtester.backtest(str(window['train_start'].date()), str(window['train_end'].date()), data)
+                scores.append(train['metrics'][objective])
+            best = CONFIGS[int(pick(scores))]
+            assert all(window[name] == value for name, value in best.items()), objective
+    
+    try:
+        WalkForwardAnalysis(data, CONFIGS, objective='sharpe')
+        assert False, "unknown objective accepted"
+    except ValueError:
+        pass
+    print("✓ Trade metrics available, lower-is-better objectives minimized")
+
+def test_pool_matches_serial():
+    print("Testing walk-forward across a process pool...")
+    
+    data = SyntheticMarketGenerator(['SPY', 'QQQ'], seed=4).generate(1200)
+    serial = WalkForwardAnalysis(data, CONFIGS, train_bars=300, test_bars=150, anchored=True).run()
+    pooled = WalkForwardAnalysis(data, CONFIGS, train_bars=300, test_bars=150, anchored=True, max_workers=2).run()
+    pd.testing.assert_frame_equal(serial['windows'], pooled['windows'])
+    pd.testing.assert_series_equal(serial['equity_curve'], pooled['equity_curve'])
+    print(f"✓ Same {len(pooled['windows'])} windows with 2 workers")
+
+if __name__ == "__main__":
+    test_windows()
+    test_matches_backtester_per_window()
+    test_objectives()
+    test_pool_matches_serial()
@@ -1,18 +1,50 @@
 import pytz
-from datetime import datetime, time
+from datetime import datetime, date, time, timedelta
+from typing import Optional
 
-def is_market_hours() -> bool:
+MARKET_TIMEZONE = pytz.timezone('US/Eastern')
+MARKET_OPEN = time(9, 30)
+MARKET_CLOSE = time(16, 0)
+
+def is_market_hours(now: Optional[datetime] = None) -> bool:
     """Check if US stock market is currently open"""
-    et = pytz.timezone('US/Eastern')
-    now = datetime.now(et)
+    now = _to_market_time(now)
     
     # Check if weekend
     if now.weekday() >= 5:  # Saturday = 5, Sunday = 6
         return False
     
     # Market hours: 9:30 AM - 4:00 PM ET
-    market_open = time(9, 30)
-    market_close = time(16, 0)
     current_time = now.time()
     
-    return market_open <= current_time <= market_close
\ No newline at end of file
+    return MARKET_OPEN <= current_time <= MARKET_CLOSE
+
+def latest_session_date(now: Optional[datetime] = None) -> date:
+    """Date of the most recent trading session that has already opened.
+    
+    This is the newest date a daily bar can exist for. Exchange holidays are
+    not modelled, so on a holiday the holiday itself is returned.
+    """
+    now = _to_market_time(now)
+    session = now.date()
+    
+    # Before the open today's bar does not exist yet
+    if now.weekday() < 5 and now.time() < MARKET_OPEN:
+        session -= timedelta(days=1)
+    
+    # Walk back over weekends
+    while session.weekday() >= 5:
+        session -= timedelta(days=1)
+    
+    return session
+
+def session_close(session: date) -> datetime:
+    """Timezone-aware closing time of the given session"""
+    return MARKET_TIMEZONE.localize(datetime.combine(session, MARKET_CLOSE))
+
+def _to_market_time(now: Optional[datetime]) -> datetime:
+    if now is None:
+        return datetime.now(MARKET_TIMEZONE)
+    if now.tzinfo is None:
+        now = now.astimezone()  # Naive datetimes are local time
+    return now.astimezone(MARKET_TIMEZONE)
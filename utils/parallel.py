@@ -0,0 +1,121 @@
+import multiprocessing
+import queue
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+from strategies.base_strategy import BaseStrategy, Signal
+
+# Per-process state for ``map_with_state`` tasks, set once per worker so
+# large inputs (bars, signals) aren't re-sent with every task
+WORKER_STATE: Dict = {}
+
+def _set_worker_state(state: Dict):
+    WORKER_STATE.clear()
+    WORKER_STATE.update(state)
+
+def map_with_state(func: Callable, items: Sequence, state: Dict, max_workers: int) -> List:
+    """``[func(item) for item in items]`` with ``state`` as ``WORKER_STATE``.
+    
+    Runs across a process pool of ``max_workers`` that receives ``state``
+    once per worker, or in this process when ``max_workers`` is 1.
+    """
+    if max_workers <= 1:
+        _set_worker_state(state)
+        return [func(item) for item in items]
+    with multiprocessing.Pool(max_workers, initializer=_set_worker_state, initargs=(state,)) as pool:
+        return pool.map(func, items)
+
+# How often to check whether a queued task has started
+POLL_SECONDS = 0.05
+
+# Worker-side queue of (task id, wall-clock start time), set by the pool initializer
+_STARTED = None
+
+def _init_worker(started):
+    global _STARTED
+    _STARTED = started
+
+def analyze_task(task_id: int, strategy: BaseStrategy, market_data: Dict[str, pd.DataFrame]) -> List[Signal]:
+    """Worker entry point: analyze one strategy (or shard) in a child process"""
+    _STARTED.put((task_id, time.time()))
+    return strategy.analyze(market_data)
+
+class StrategyPool:
+    """Runs strategy analyses across a process pool.
+    
+    Tasks are submitted as soon as their data is fetched, so fetching the
+    next strategy's data overlaps with analysis of the previous ones.
+    Each task has its own timeout counted from when a worker starts it,
+    so tasks queued behind others get their full time; a task that times
+    out or fails is reported and skipped, and results always come back in
+    submission order regardless of which finished first. Workers still
+    running a timed-out task are terminated on exit.
+    """
+    
+    def __init__(self, max_workers: int, task_timeout: float):
+        self.max_workers = max_workers
+        self.task_timeout = task_timeout
+        self._pool = None
+        self._started_queue = None
+        self._started: Dict[int, float] = {}
+        self._tasks = []
+        self._timed_out = []  # Results of tasks that ran out of time, possibly still holding a worker
+    
+    def __enter__(self) -> 'StrategyPool':
+        self._started_queue = multiprocessing.Queue()
+        self._pool = multiprocessing.Pool(processes=self.max_workers, initializer=_init_worker,
+                                          initargs=(self._started_queue,))
+        return self
+    
+    def __exit__(self, exc_type, exc, traceback):
+        if self._timed_out or exc_type is not None:
+            self._pool.terminate()
+        else:
+            self._pool.close()
+        self._pool.join()
+    
+    def submit(self, strategy: BaseStrategy, market_data: Dict[str, pd.DataFrame]):
+        task_id = len(self._tasks)
+        self._tasks.append((task_id, strategy, self._pool.apply_async(analyze_task, (task_id, strategy, market_data))))
+    
+    def results(self) -> List[Tuple[BaseStrategy, Optional[List[Signal]]]]:
+        """(strategy, signals) per task in submission order; signals is None on failure"""
+        results = []
+        for task_id, strategy, result in self._tasks:
+            signals = None
+            if not self._wait(task_id, result):
+                if task_id in self._started:
+                    print(f"✗ {strategy.task_name} timed out after {self.task_timeout}s - skipped")
+                else:
+                    print(f"✗ {strategy.task_name} never started: every worker is held by a timed-out task - skipped")
+                self._timed_out.append(result)
+            else:
+                try:
+                    signals = result.get()
+                except Exception as e:
+                    print(f"Error running {strategy.task_name}: {e}")
+            results.append((strategy, signals))
+        
+        self._tasks = []
+        return results
+    
+    def _wait(self, task_id: int, result) -> bool:
+        """Wait for a task until ``task_timeout`` after it started; False if it ran out of time"""
+        while not result.ready():
+            self._collect_starts()
+            started = self._started.get(task_id)
+            if started is not None:
+                result.wait(max(0.0, started + self.task_timeout - time.time()))
+                return result.ready()
+            if sum(not stuck.ready() for stuck in self._timed_out) >= self.max_workers:
+                return False
+            result.wait(POLL_SECONDS)
+        return True
+    
+    def _collect_starts(self):
+        while True:
+            try:
+                task_id, started = self._started_queue.get_nowait()
+            except queue.Empty:
+                return
+            self._started[task_id] = started